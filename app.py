@@ -2,13 +2,21 @@
 Deep Research System - Gradio Deploy
 """
 
+import logging
 import os
+from research_system.core.metrics import start_metrics_server
 from research_system.interface.web_interface import ResearchWebInterface
 
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+# Expose Prometheus metrics when a port is configured
+if os.environ.get("METRICS_PORT"):
+    start_metrics_server(int(os.environ["METRICS_PORT"]))
+
 # Create and launch the interface
 interface = ResearchWebInterface()
 interface.interface.launch(
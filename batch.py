@@ -0,0 +1,8 @@
+"""
+Headless batch entry point for the Deep Research System
+"""
+
+from research_system.interface.batch_runner import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Admission Check - Drives the web interface's admission control offline
+
+Usage:
+    python -m benchmarks.admission_check --time-scale 0.05
+
+With a single research slot and stub models, one session holds the slot
+while another queues a query and then submits a second one. The check fails
+unless the second query is turned away for the session's quota, the waiting
+query keeps its place and completes, and a third session's query is turned
+away once the queue is full. It then floods the admission controller from
+one session and fails if that session is admitted ahead of sessions that
+arrived later.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import types
+
+from agents import set_tracing_disabled
+
+from research_system.core.admission import QUEUE_FULL, SESSION_QUOTA, AdmissionController
+from research_system.core.metrics import ADMISSION_REJECTED
+from research_system.interface.web_interface import ResearchWebInterface
+
+from .replay_regression import isolated_orchestrator
+from .stub_models import StubProfiles, install_stub_models
+
+
+async def collect(ui: ResearchWebInterface, session_id: str, query: str) -> list[str]:
+    """Submit a query as a browser session and return the first status line of every update."""
+    request = types.SimpleNamespace(session_hash=session_id)
+    return [
+        update[0].splitlines()[0]
+        async for update in ui._execute_research(query, mode="standard", request=request)
+    ]
+
+
+async def check_quotas(args: argparse.Namespace) -> list[str]:
+    """Reach the session quota and the queue bound through the web interface."""
+    ui = ResearchWebInterface()
+    ui.orchestrator = isolated_orchestrator()
+    install_stub_models(ui.orchestrator, StubProfiles().scaled(args.time_scale), args.seed)
+    ui.admission = AdmissionController(max_running=1, max_queued=2)
+
+    holder = asyncio.create_task(collect(ui, "holder", "What holds the only research slot?"))
+    await asyncio.sleep(0.01)
+    waiting = asyncio.create_task(collect(ui, "session", "What waits for the research slot?"))
+    await asyncio.sleep(0.01)
+    session_rejections = ADMISSION_REJECTED.value(reason=SESSION_QUOTA)
+    second = await collect(ui, "session", "What replaces the waiting query?")
+    queued_behind = asyncio.create_task(collect(ui, "other", "What queues behind the waiting query?"))
+    await asyncio.sleep(0.01)
+    queue_rejections = ADMISSION_REJECTED.value(reason=QUEUE_FULL)
+    third = await collect(ui, "late", "What finds the queue full?")
+    results = await asyncio.gather(holder, waiting, queued_behind)
+
+    failures = []
+    if ADMISSION_REJECTED.value(reason=SESSION_QUOTA) != session_rejections + 1 or not second[-1].startswith("❌"):
+        failures.append(f"second query of a waiting session was not rejected: {second}")
+    if ADMISSION_REJECTED.value(reason=QUEUE_FULL) != queue_rejections + 1 or not third[-1].startswith("❌"):
+        failures.append(f"query beyond the queue bound was not rejected: {third}")
+    for name, statuses in zip(("holding", "waiting", "queued"), results):
+        if not statuses or not statuses[-1].startswith("✅"):
+            failures.append(f"{name} query did not complete: {statuses[-3:]}")
+    if not any("position" in status for status in results[1]):
+        failures.append("waiting query never showed its queue position")
+    if ui.admission.running or ui.admission.queued:
+        failures.append(f"{ui.admission.running} running and {ui.admission.queued} queued requests left behind")
+    print(f"session quota rejection: {second[-1]}")
+    print(f"queue full rejection: {third[-1]}")
+    return failures
+
+
+def check_fairness(sessions: int, burst: int) -> list[str]:
+    """Flood one session's requests into the controller and check later sessions are interleaved."""
+    controller = AdmissionController(max_running=1, max_queued=burst + sessions, session_queued=burst)
+    tickets = [controller.enqueue("greedy") for _ in range(burst)]
+    tickets += [controller.enqueue(f"session-{index}") for index in range(sessions)]
+    order = []
+    while controller.running:
+        ticket = next(ticket for ticket in tickets if ticket.admitted and not ticket.released)
+        order.append(ticket.session_id)
+        ticket.release()
+
+    # Each later session is admitted once the greedy session has had at most one more turn
+    greedy_before = [order[:position].count("greedy") for position, name in enumerate(order) if name != "greedy"]
+    print(f"admission order: {' '.join(name.split('-')[-1][:1] if name != 'greedy' else 'G' for name in order)}")
+    if len(order) != len(tickets):
+        return [f"admitted {len(order)} of {len(tickets)} requests"]
+    if max(greedy_before, default=0) > 2:
+        return [f"a later session waited behind {max(greedy_before)} requests of the greedy session"]
+    return []
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Check admission quotas, queue bounds and fairness")
+    parser.add_argument("--time-scale", type=float, default=0.05, help="Multiplier for stub model latencies")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sessions", type=int, default=4, help="Sessions arriving after the greedy one")
+    parser.add_argument("--burst", type=int, default=8, help="Requests queued by the greedy session")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.ERROR)
+    set_tracing_disabled(True)
+
+    failures = asyncio.run(check_quotas(args)) + check_fairness(args.sessions, args.burst)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Compression Benchmark - Micro-benchmark of sentence-level findings deduplication
+
+Usage:
+    python -m benchmarks.compression_benchmark --findings 7 --sentences 30 --budget-ms 100
+
+Synthetic search summaries share a pool of facts, each restated with
+different sources and small wording changes, the way summaries of related
+queries do. The check fails when compressing them exceeds the time budget,
+when no repeated sentence is removed, or when a sentence that contradicts an
+earlier one, by a negation, an opposite word or another figure, is removed.
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from research_system.core.compression import FindingsCompressor
+
+
+WORDS = (
+    "quantum research analysis market growth model data evidence policy trend system "
+    "adoption result method finding impact risk signal network cost study"
+).split()
+FILLERS = ("Notably,", "According to recent reports,", "Overall,", "In addition,")
+# Sentence pairs that differ in a single word but make opposite claims
+CONTRADICTIONS = (
+    ("The drug is safe for children under five years old.", "The drug is not safe for children under five years old."),
+    ("The drug is not safe for children under five years old.", "The drug is safe for children under five years old."),
+    ("The drug isn't approved for use in the European Union.", "The drug is approved for use in the European Union."),
+    ("Prices rose sharply in the third quarter across most of Europe.", "Prices fell sharply in the third quarter across most of Europe."),
+    ("Adoption grew 12% in the third quarter across Europe.", "Adoption grew 40% in the third quarter across Europe."),
+)
+
+
+def synthetic_findings(count: int, sentences: int, overlap: float = 0.4, seed: int = 0) -> list[str]:
+    """
+    Build search summaries that restate a shared pool of facts.
+
+    Args:
+        count: Number of summaries
+        sentences: Sentences per summary
+        overlap: Fraction of each summary's sentences drawn from the shared pool
+        seed: Seed for the generated content
+
+    Returns:
+        Markdown summaries with prose, bullet lists and cited sources
+    """
+    rng = random.Random(seed)
+    facts = [
+        f"{' '.join(rng.choice(WORDS) for _ in range(14))} rose {rng.randint(2, 90)}% in {rng.randint(2019, 2025)}"
+        for _ in range(sentences)
+    ]
+    findings = []
+    for index in range(count):
+        lines = []
+        for position in range(sentences):
+            if rng.random() < overlap:
+                sentence = f"{rng.choice(FILLERS)} {rng.choice(facts)}"
+            else:
+                sentence = f"{' '.join(rng.choice(WORDS) for _ in range(18)).capitalize()} in study {index}-{position}"
+            sentence += f" (https://source{rng.randint(0, 50)}.example.com/{index}/{position})."
+            lines.append(f"- {sentence}" if position % 5 == 4 else sentence)
+        findings.append("\n".join(lines))
+    return findings
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark sentence-level findings compression")
+    parser.add_argument("--findings", type=int, default=7, help="Search summaries per run")
+    parser.add_argument("--sentences", type=int, default=30, help="Sentences per summary")
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="Time budget for one run's findings")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    findings = synthetic_findings(args.findings, args.sentences, seed=args.seed)
+    compressor = FindingsCompressor()
+    best = float("inf")
+    for _ in range(args.repeats):
+        started = time.perf_counter()
+        _, stats = compressor.compress(findings)
+        best = min(best, time.perf_counter() - started)
+    elapsed_ms = best * 1000
+
+    words = sum(len(finding.split()) for finding in findings)
+    print(f"{len(findings)} findings, {words} words: {elapsed_ms:.1f} ms (budget {args.budget_ms} ms)")
+    print(f"{stats.describe()}, {stats.sources_merged} sources merged")
+
+    failures = []
+    if elapsed_ms > args.budget_ms:
+        failures.append(f"compression took {elapsed_ms:.1f} ms (budget {args.budget_ms} ms)")
+    if not stats.duplicates:
+        failures.append("no repeated sentences were removed")
+    for first, second in CONTRADICTIONS:
+        _, pair_stats = compressor.compress([first, second])
+        if pair_stats.duplicates:
+            failures.append(f"{second!r} was removed as a repeat of {first!r}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Format Benchmark - Micro-benchmark of the local markdown normalizer on large reports
+
+Usage:
+    python -m benchmarks.format_benchmark --words 50000 --budget-ms 500
+
+Synthetic reports with headings, lists, tables, code blocks and repeated
+citations are normalized at the requested size and at twice that size. The
+check fails when the requested size exceeds its time budget or when doubling
+the input more than triples the time, which would mean formatting is no
+longer linear in the report length.
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from research_system.core.markdown_normalizer import MarkdownNormalizer
+
+
+WORDS = (
+    "quantum research analysis market growth model data evidence policy trend system "
+    "adoption result method finding impact risk signal network cost study"
+).split()
+
+
+def synthetic_report(word_count: int, seed: int = 0) -> str:
+    """
+    Build a messy markdown report of roughly the given number of words.
+
+    Args:
+        word_count: Approximate number of words in the report
+        seed: Seed for the generated content
+
+    Returns:
+        Markdown with skipped heading levels, mixed list markers, loose tables
+        and repeated URLs in several spellings
+    """
+    rng = random.Random(seed)
+    urls = [f"https://source{index}.example.com/article/{index}" for index in range(200)]
+    lines = ["Research Report", "===============", ""]
+    words = 0
+    section = 0
+    while words < word_count:
+        section += 1
+        lines.append(f"{'#' * rng.choice((2, 3, 4))} Section {section}: {' '.join(rng.sample(WORDS, 3))}")
+        for _ in range(rng.randint(2, 4)):
+            sentence = " ".join(rng.choice(WORDS) for _ in range(60))
+            url = rng.choice(urls)
+            # Same source spelled with an uppercase host and a trailing slash
+            variant = url.replace("source", "SOURCE").replace(".example.com", ".EXAMPLE.COM") + "/"
+            cited = f"[{rng.choice(WORDS)}]({url})" if rng.random() < 0.5 else variant
+            lines.append(f"{sentence} {cited}.")
+            words += 61
+        for index in range(rng.randint(2, 5)):
+            marker = rng.choice(("*", "+", "-", f"{index + 1})"))
+            lines.append(f"{marker} {' '.join(rng.choice(WORDS) for _ in range(8))} {rng.choice(urls)}")
+            words += 9
+        lines.append("")
+        if section % 5 == 0:
+            lines.extend(["|metric|value|source|", "|-|-:|:-:|"])
+            for _ in range(4):
+                lines.append(f"|{rng.choice(WORDS)}|{rng.randint(1, 999)}|{rng.choice(urls)}|")
+                words += 3
+            lines.append("")
+        if section % 7 == 0:
+            lines.extend(["```python", f"print('{rng.choice(urls)}')", "```", ""])
+    lines.extend(["## Sources", *(f"- {url}" for url in urls[:50])])
+    return "\n".join(lines)
+
+
+def time_normalize(markdown: str, repeats: int) -> float:
+    """Best-of-repeats wall time in milliseconds to normalize a report."""
+    normalizer = MarkdownNormalizer()
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        normalizer.normalize(markdown)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the local markdown normalizer")
+    parser.add_argument("--words", type=int, default=50_000, help="Approximate report size in words")
+    parser.add_argument("--budget-ms", type=float, default=500.0, help="Time budget at the requested size")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    report = synthetic_report(args.words, args.seed)
+    double_report = synthetic_report(args.words * 2, args.seed)
+    elapsed_ms = time_normalize(report, args.repeats)
+    double_ms = time_normalize(double_report, args.repeats)
+    ratio = double_ms / elapsed_ms if elapsed_ms else 0.0
+
+    print(f"{len(report.split())} words ({len(report) / 1024:.0f} KiB): {elapsed_ms:.1f} ms (budget {args.budget_ms} ms)")
+    print(f"{len(double_report.split())} words: {double_ms:.1f} ms ({ratio:.2f}x for 2x input)")
+    print(f"throughput: {len(report.split()) / (elapsed_ms / 1000):,.0f} words/s")
+
+    failures = []
+    if elapsed_ms > args.budget_ms:
+        failures.append(f"normalizing took {elapsed_ms:.1f} ms (budget {args.budget_ms} ms)")
+    if ratio > 3.0:
+        failures.append(f"doubling the report multiplied formatting time by {ratio:.2f}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""
+Load Test - Drives ResearchOrchestrator offline at increasing concurrency
+
+Usage:
+    python -m benchmarks.load_test --concurrency 1,2,4,8 --runs 16 --time-scale 0.05 --output bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+
+from agents import set_tracing_disabled
+
+from research_system.core.findings_index import FindingsIndex
+from research_system.core.research_events import EventKind
+from research_system.core.report_store import ReportStore
+from research_system.core.research_orchestrator import ResearchOrchestrator
+from research_system.core.run_store import RunStore
+from research_system.core.search_cache import SearchCache
+
+from .stub_models import StubProfiles, install_stub_models
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+PHASES = ("planning", "searching", "reporting", "formatting")
+
+
+@dataclass
+class RunTiming:
+    """Timings of one research run, in seconds."""
+    total: float = 0.0
+    time_to_first_report_token: float | None = None
+    phases: dict[str, float] = field(default_factory=dict)
+    failed: bool = False
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop lag by checking how late a periodic timer fires.
+    High lag means orchestrator code is blocking the loop.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - expected))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    """Return p50/p95/p99 and max of a list of durations."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    def pick(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+    return {
+        "p50": round(statistics.median(ordered), 4),
+        "p95": round(pick(0.95), 4),
+        "p99": round(pick(0.99), 4),
+        "max": round(ordered[-1], 4),
+    }
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process in megabytes."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+async def timed_run(orchestrator: ResearchOrchestrator, query: str) -> RunTiming:
+    """Run one research query and derive phase timings from its events."""
+    timing = RunTiming()
+    phase_starts: dict[str, float] = {}
+    started = time.perf_counter()
+
+    try:
+        async for event in orchestrator.stream_research(query):
+            now = time.perf_counter() - started
+            if event.phase is not None:
+                phase_starts.setdefault(event.phase, now)
+            if event.kind == EventKind.REPORT_DELTA and timing.time_to_first_report_token is None:
+                timing.time_to_first_report_token = now
+    except Exception as e:
+        print(f"Benchmark run failed for '{query}': {e}")
+        timing.failed = True
+
+    timing.total = time.perf_counter() - started
+    ordered = [(phase, phase_starts[phase]) for phase in PHASES if phase in phase_starts]
+    for index, (phase, start) in enumerate(ordered):
+        end = ordered[index + 1][1] if index + 1 < len(ordered) else timing.total
+        timing.phases[phase] = end - start
+    return timing
+
+
+async def run_level(concurrency: int, runs: int, profiles: StubProfiles, seed: int) -> dict:
+    """
+    Drive the orchestrator with a fixed number of concurrent research runs.
+
+    Args:
+        concurrency: Number of research runs in flight at once
+        runs: Total research runs at this level
+        profiles: Stub model behaviour
+        seed: Seed for the stub models
+
+    Returns:
+        Summary statistics for this concurrency level
+    """
+    orchestrator = ResearchOrchestrator(
+        search_cache=SearchCache(":memory:", bypass=True),
+        run_store=RunStore(":memory:"),
+        findings_index=FindingsIndex(":memory:", bypass=True),
+        report_store=ReportStore(":memory:"),
+        coalesce_requests=False,
+        shared_agents=False,
+    )
+    install_stub_models(orchestrator, profiles, seed)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    monitor = LoopLagMonitor()
+
+    async def one(index: int) -> RunTiming:
+        async with semaphore:
+            return await timed_run(orchestrator, f"Benchmark research question {index}")
+
+    monitor.start()
+    started = time.perf_counter()
+    timings = await asyncio.gather(*(one(index) for index in range(runs)))
+    elapsed = time.perf_counter() - started
+    await monitor.stop()
+
+    succeeded = [timing for timing in timings if not timing.failed]
+    return {
+        "concurrency": concurrency,
+        "runs": runs,
+        "failed_runs": runs - len(succeeded),
+        "elapsed_seconds": round(elapsed, 4),
+        "throughput_runs_per_second": round(len(succeeded) / elapsed, 4) if elapsed else 0.0,
+        "total_latency": percentiles([timing.total for timing in succeeded]),
+        "time_to_first_report_token": percentiles(
+            [timing.time_to_first_report_token for timing in succeeded if timing.time_to_first_report_token]
+        ),
+        "phases": {
+            phase: percentiles([timing.phases[phase] for timing in succeeded if phase in timing.phases])
+            for phase in PHASES
+        },
+        "event_loop_lag": percentiles(monitor.samples),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict:
+    profiles = StubProfiles().scaled(args.time_scale)
+    for profile in (profiles.planner, profiles.researcher, profiles.summarizer, profiles.writer):
+        profile.failure_rate = args.failure_rate
+
+    levels = []
+    for concurrency in args.concurrency:
+        print(f"Running {args.runs} research runs at concurrency {concurrency}...")
+        level = await run_level(concurrency, args.runs, profiles, args.seed)
+        print(
+            f"  throughput {level['throughput_runs_per_second']} runs/s, "
+            f"p95 total {level['total_latency'].get('p95')}s, "
+            f"p99 loop lag {level['event_loop_lag'].get('p99')}s"
+        )
+        levels.append(level)
+
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "time_scale": args.time_scale,
+        "failure_rate": args.failure_rate,
+        "seed": args.seed,
+        "profiles": asdict(profiles),
+        "levels": levels,
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline load test for the research orchestrator")
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(level) for level in value.split(",")],
+        default=[1, 2, 4, 8],
+        help="Comma-separated concurrency levels to test",
+    )
+    parser.add_argument("--runs", type=int, default=16, help="Research runs per concurrency level")
+    parser.add_argument("--time-scale", type=float, default=0.05, help="Multiplier for stub model latencies")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Probability of an injected model failure")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for stub latencies and outputs")
+    parser.add_argument("--output", default="bench_output.json", help="Where to write the JSON results")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the load test and save the results."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    set_tracing_disabled(True)
+    results = asyncio.run(run_benchmark(args))
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(results, handle, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
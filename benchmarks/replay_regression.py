@@ -0,0 +1,187 @@
+"""
+Replay Regression - Records research sessions and replays them offline against a baseline
+
+Usage:
+    python -m benchmarks.replay_regression record --query "..." --output session.jsonl.gz [--stub]
+    python -m benchmarks.replay_regression check sessions/*.jsonl.gz --baseline replay_baseline.json
+    python -m benchmarks.replay_regression check sessions/*.jsonl.gz --baseline replay_baseline.json --update-baseline
+
+Recording runs the orchestrator against the OpenAI API, or against stub
+models with --stub, and captures every agent call. Checking replays each
+recording through a fresh orchestrator without any network access and
+compares the run's latency, agent call counts and prompt tokens with the
+baseline, or, without a baseline entry, its latency and call counts with the
+recording itself. The check fails on any difference in call counts or on
+latency or prompt tokens beyond their tolerances.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+from agents import set_tracing_disabled
+
+from research_system.core.findings_index import FindingsIndex
+from research_system.core.report_store import ReportStore
+from research_system.core.research_orchestrator import ResearchOrchestrator
+from research_system.core.run_store import RunStore
+from research_system.core.search_cache import SearchCache
+from research_system.core.session_recording import RecordedSession, SessionRecorder, SessionReplay
+
+from .stub_models import StubProfiles, install_stub_models
+
+
+def isolated_orchestrator(**options) -> ResearchOrchestrator:
+    """An orchestrator whose every agent call reaches the model, with nothing persisted between runs."""
+    return ResearchOrchestrator(
+        search_cache=SearchCache(":memory:", bypass=True),
+        run_store=RunStore(":memory:"),
+        findings_index=FindingsIndex(":memory:", bypass=True),
+        report_store=ReportStore(":memory:"),
+        coalesce_requests=False,
+        shared_agents=False,
+        **options,
+    )
+
+
+async def record(args: argparse.Namespace) -> None:
+    """Run one research session and save its agent calls."""
+    recorder = SessionRecorder(args.query, {"budget": args.budget, "stub": args.stub})
+    orchestrator = isolated_orchestrator(recorder=recorder)
+    if args.stub:
+        install_stub_models(orchestrator, StubProfiles().scaled(args.time_scale), args.seed)
+    async for _ in orchestrator.execute_research(args.query, budget=args.budget):
+        pass
+    session = recorder.save(args.output)
+    print(f"Recorded {len(session.calls)} agent calls over {session.duration:.2f}s to {args.output}")
+
+
+async def replay(path: str, time_scale: float) -> dict:
+    """
+    Replay a recorded session through a fresh orchestrator.
+
+    Returns:
+        The replayed run's latency in recorded seconds, agent call counts and
+        estimated prompt tokens, alongside the recording's own figures
+    """
+    session = RecordedSession.load(path)
+    session_replay = SessionReplay(session, time_scale)
+    orchestrator = isolated_orchestrator(replay=session_replay)
+    started = time.perf_counter()
+    async for _ in orchestrator.execute_research(session.query, budget=session.metadata.get("budget")):
+        pass
+    elapsed = time.perf_counter() - started
+
+    recorded_calls: dict[str, int] = {}
+    for call in session.calls:
+        recorded_calls[call.agent] = recorded_calls.get(call.agent, 0) + 1
+    stats = session_replay.stats
+    return {
+        "latency_seconds": round(elapsed / time_scale, 4) if time_scale else None,
+        "calls": dict(sorted(stats.calls.items())),
+        "prompt_tokens": dict(sorted(stats.prompt_tokens.items())),
+        "total_prompt_tokens": stats.total_prompt_tokens,
+        "inexact_matches": stats.inexact_matches,
+        "recorded": {
+            "latency_seconds": round(session.duration, 4),
+            "calls": dict(sorted(recorded_calls.items())),
+        },
+    }
+
+
+def compare(result: dict, expected: dict, args: argparse.Namespace) -> list[str]:
+    """Return the regressions of a replayed run against its expected figures."""
+    failures = []
+    if result["calls"] != expected["calls"]:
+        failures.append(f"agent calls {result['calls']} != expected {expected['calls']}")
+    latency, expected_latency = result["latency_seconds"], expected["latency_seconds"]
+    if latency is not None and latency > expected_latency * (1 + args.latency_tolerance) + args.latency_slack:
+        failures.append(f"latency {latency:.3f}s exceeds expected {expected_latency:.3f}s")
+    expected_tokens = expected.get("total_prompt_tokens")
+    if expected_tokens is not None and result["total_prompt_tokens"] > expected_tokens * (1 + args.token_tolerance):
+        failures.append(f"prompt tokens {result['total_prompt_tokens']} exceed expected {expected_tokens}")
+    return failures
+
+
+async def check(args: argparse.Namespace) -> int:
+    """Replay every recording and compare it with the baseline."""
+    baseline = {}
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+
+    results = {}
+    regressions = 0
+    for path in args.recordings:
+        name = os.path.basename(path)
+        result = results[name] = await replay(path, args.time_scale)
+        expected = baseline.get(name, result["recorded"])
+        failures = [] if args.update_baseline else compare(result, expected, args)
+        print(
+            f"{name}: {sum(result['calls'].values())} calls, {result['total_prompt_tokens']} prompt tokens, "
+            + (f"latency {result['latency_seconds']}s" if result["latency_seconds"] is not None else "latency not measured")
+            + f" (expected {expected['latency_seconds']}s)"
+        )
+        if result["inexact_matches"]:
+            print(f"  {result['inexact_matches']} calls replayed with a changed prompt")
+        for failure in failures:
+            print(f"  FAIL: {failure}")
+        regressions += bool(failures)
+
+    if args.update_baseline:
+        if not args.baseline:
+            print("--update-baseline needs --baseline")
+            return 2
+        for name, result in results.items():
+            recorded = result.pop("recorded")
+            if result["latency_seconds"] is None:
+                result["latency_seconds"] = recorded["latency_seconds"]
+            baseline[name] = result
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump(baseline, handle, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+    return 1 if regressions else 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Record research sessions and replay them as a regression check")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="Record the agent calls of one research run")
+    record_parser.add_argument("--query", required=True, help="The research question")
+    record_parser.add_argument("--output", required=True, help="Where to write the .jsonl.gz recording")
+    record_parser.add_argument("--budget", default=None, help="Budget preset for the run, e.g. fast or deep")
+    record_parser.add_argument("--stub", action="store_true", help="Record stub models instead of the OpenAI API")
+    record_parser.add_argument("--time-scale", type=float, default=0.05, help="Multiplier for stub model latencies")
+    record_parser.add_argument("--seed", type=int, default=0, help="Seed for stub latencies and outputs")
+
+    check_parser = commands.add_parser("check", help="Replay recordings and compare them with a baseline")
+    check_parser.add_argument("recordings", nargs="+", help="Recorded sessions to replay")
+    check_parser.add_argument("--baseline", default=None, help="JSON file of expected figures per recording")
+    check_parser.add_argument("--update-baseline", action="store_true", help="Write the replayed figures as the baseline")
+    check_parser.add_argument(
+        "--time-scale", type=float, default=1.0,
+        help="Multiplier for recorded latencies; 1 preserves them, 0 replays without waiting",
+    )
+    check_parser.add_argument("--latency-tolerance", type=float, default=0.25, help="Allowed relative latency increase")
+    check_parser.add_argument("--latency-slack", type=float, default=0.05, help="Allowed absolute latency increase, in seconds")
+    check_parser.add_argument("--token-tolerance", type=float, default=0.05, help="Allowed relative prompt token increase")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    set_tracing_disabled(True)
+    if args.command == "record":
+        asyncio.run(record(args))
+        return 0
+    return asyncio.run(check(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Startup Budget - Regression check for cold-start import and construction time
+
+Usage:
+    python -m benchmarks.startup_budget [--import-budget-ms 50] [--construct-budget-ms 600]
+
+Each measurement runs in a fresh interpreter and the best of several repeats
+is compared against its budget. The check also fails if importing the package
+or constructing ResearchOrchestrator loads the agents SDK, gradio or dotenv.
+Exits with status 1 when any budget is exceeded.
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+
+
+FORBIDDEN_MODULES = ("agents", "gradio", "dotenv")
+
+CONSTRUCT_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+from research_system import ResearchOrchestrator
+from research_system.core.findings_index import FindingsIndex
+from research_system.core.report_store import ReportStore
+from research_system.core.run_store import RunStore
+from research_system.core.search_cache import SearchCache
+ResearchOrchestrator(
+    search_cache=SearchCache(":memory:"),
+    run_store=RunStore(":memory:"),
+    findings_index=FindingsIndex(":memory:"),
+    report_store=ReportStore(":memory:"),
+)
+elapsed = time.perf_counter() - started
+loaded = [name for name in {forbidden!r} if name in sys.modules]
+print(json.dumps({{"seconds": elapsed, "loaded": loaded}}))
+"""
+
+
+def measure_import_ms() -> float:
+    """Cumulative import time of research_system reported by -X importtime."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import research_system"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in completed.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+\s+\|\s+(\d+)\s+\|\s+research_system$", line)
+        if match:
+            return int(match.group(1)) / 1000
+    raise RuntimeError("research_system not found in -X importtime output")
+
+
+def measure_construct() -> tuple[float, list[str]]:
+    """Seconds to import the package and construct a ResearchOrchestrator, plus heavy modules loaded."""
+    completed = subprocess.run(
+        [sys.executable, "-c", CONSTRUCT_SCRIPT.format(forbidden=FORBIDDEN_MODULES)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    return result["seconds"] * 1000, result["loaded"]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Check cold-start time budgets")
+    parser.add_argument("--import-budget-ms", type=float, default=50.0)
+    parser.add_argument("--construct-budget-ms", type=float, default=600.0)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    import_ms = min(measure_import_ms() for _ in range(args.repeats))
+    construct_runs = [measure_construct() for _ in range(args.repeats)]
+    construct_ms = min(elapsed for elapsed, _ in construct_runs)
+    loaded = sorted({name for _, names in construct_runs for name in names})
+
+    failures = []
+    if import_ms > args.import_budget_ms:
+        failures.append(f"import research_system took {import_ms:.1f} ms (budget {args.import_budget_ms} ms)")
+    if construct_ms > args.construct_budget_ms:
+        failures.append(
+            f"constructing ResearchOrchestrator took {construct_ms:.1f} ms (budget {args.construct_budget_ms} ms)"
+        )
+    if loaded:
+        failures.append(f"startup loaded heavy modules: {', '.join(loaded)}")
+
+    print(f"import research_system: {import_ms:.1f} ms (budget {args.import_budget_ms} ms)")
+    print(f"construct ResearchOrchestrator: {construct_ms:.1f} ms (budget {args.construct_budget_ms} ms)")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
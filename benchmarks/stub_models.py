@@ -0,0 +1,267 @@
+"""
+Stub Models - Local fake models that stand in for the OpenAI API in benchmarks
+"""
+
+import asyncio
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+
+from agents import Model, ModelResponse, ModelSettings, ModelTracing, Usage
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseOutputMessage,
+    ResponseOutputText,
+    ResponseTextDeltaEvent,
+    ResponseUsage,
+)
+from openai.types.responses.response_usage import InputTokensDetails, OutputTokensDetails
+
+from research_system.core.research_orchestrator import ResearchOrchestrator
+from research_system.core.synthesis import estimate_tokens
+
+
+VOCABULARY = (
+    "adoption battery biology climate compiler consensus economics energy fusion genome "
+    "governance hardware inflation logistics materials medicine network optics policy "
+    "quantum regulation robotics satellite security semiconductor storage supply telescope "
+    "transport vaccine"
+).split()
+
+
+@dataclass
+class StubProfile:
+    """
+    Behaviour of one fake model.
+
+    Attributes:
+        median_latency: Median seconds per call
+        latency_sigma: Log-normal spread of the latency distribution
+        failure_rate: Probability that a call raises an error
+        output_words: Range of words produced per call
+        items: Range of search queries produced by a planner
+        stream_chunks: Number of deltas a streamed call is split into
+    """
+    median_latency: float = 1.0
+    latency_sigma: float = 0.4
+    failure_rate: float = 0.0
+    output_words: tuple[int, int] = (150, 300)
+    items: tuple[int, int] = (3, 7)
+    stream_chunks: int = 40
+
+    def sample_latency(self, rng: random.Random) -> float:
+        return self.median_latency * rng.lognormvariate(0.0, self.latency_sigma)
+
+
+@dataclass
+class StubProfiles:
+    """Fake model behaviour for every agent of the orchestrator."""
+    planner: StubProfile = field(default_factory=lambda: StubProfile(median_latency=2.0, output_words=(8, 14)))
+    researcher: StubProfile = field(default_factory=lambda: StubProfile(median_latency=6.0, latency_sigma=0.6))
+    summarizer: StubProfile = field(default_factory=lambda: StubProfile(median_latency=4.0))
+    writer: StubProfile = field(default_factory=lambda: StubProfile(
+        median_latency=20.0, latency_sigma=0.3, output_words=(1200, 1800), stream_chunks=400
+    ))
+
+    def scaled(self, factor: float) -> "StubProfiles":
+        """Return profiles with every latency multiplied by factor."""
+        def scale(profile: StubProfile) -> StubProfile:
+            return StubProfile(
+                median_latency=profile.median_latency * factor,
+                latency_sigma=profile.latency_sigma,
+                failure_rate=profile.failure_rate,
+                output_words=profile.output_words,
+                items=profile.items,
+                stream_chunks=profile.stream_chunks,
+            )
+        return StubProfiles(
+            planner=scale(self.planner),
+            researcher=scale(self.researcher),
+            summarizer=scale(self.summarizer),
+            writer=scale(self.writer),
+        )
+
+
+class StubModelError(RuntimeError):
+    """Injected failure raised by a stub model."""
+
+
+class StubModel(Model):
+    """
+    Fake model that produces plausible output for one agent without the network.
+    Structured outputs are generated from the agent's output schema name, so
+    the real Runner, output validation and orchestrator code all run unchanged.
+    """
+
+    def __init__(self, profile: StubProfile, seed: int | None = None):
+        self.profile = profile
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    async def get_response(
+        self,
+        system_instructions,
+        input,
+        model_settings: ModelSettings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing: ModelTracing,
+        *,
+        previous_response_id=None,
+    ) -> ModelResponse:
+        text, usage = self._prepare(system_instructions, input, output_schema)
+        await asyncio.sleep(self.profile.sample_latency(self.rng))
+        self._maybe_fail()
+        return ModelResponse(output=[self._message(text)], usage=usage, response_id=None)
+
+    async def stream_response(
+        self,
+        system_instructions,
+        input,
+        model_settings: ModelSettings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing: ModelTracing,
+        *,
+        previous_response_id=None,
+    ) -> AsyncIterator:
+        text, usage = self._prepare(system_instructions, input, output_schema)
+        latency = self.profile.sample_latency(self.rng)
+        chunk_count = max(1, self.profile.stream_chunks)
+        chunk_size = max(1, len(text) // chunk_count)
+        item_id = f"msg_{uuid.uuid4().hex}"
+
+        for sequence, start in enumerate(range(0, len(text), chunk_size)):
+            await asyncio.sleep(latency / chunk_count)
+            if sequence == chunk_count // 2:
+                self._maybe_fail()
+            yield ResponseTextDeltaEvent.model_construct(
+                type="response.output_text.delta",
+                item_id=item_id,
+                output_index=0,
+                content_index=0,
+                delta=text[start:start + chunk_size],
+                sequence_number=sequence,
+            )
+
+        response = Response.model_construct(
+            id=f"resp_{uuid.uuid4().hex}",
+            created_at=time.time(),
+            model="stub",
+            object="response",
+            output=[self._message(text, item_id)],
+            parallel_tool_calls=False,
+            tool_choice="auto",
+            tools=[],
+            usage=ResponseUsage(
+                input_tokens=usage.input_tokens,
+                input_tokens_details=InputTokensDetails(cached_tokens=0),
+                output_tokens=usage.output_tokens,
+                output_tokens_details=OutputTokensDetails(reasoning_tokens=0),
+                total_tokens=usage.total_tokens,
+            ),
+        )
+        yield ResponseCompletedEvent.model_construct(
+            type="response.completed", response=response, sequence_number=chunk_count + 1
+        )
+
+    def _prepare(self, system_instructions, input, output_schema) -> tuple[str, Usage]:
+        self.calls += 1
+        schema_name = output_schema.name() if output_schema is not None else ""
+        if schema_name == "SearchStrategy":
+            text = self._search_strategy()
+        elif schema_name == "ResearchReport":
+            text = self._research_report()
+        else:
+            text = self._words()
+
+        prompt = f"{system_instructions or ''}{input if isinstance(input, str) else json.dumps(input)}"
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = estimate_tokens(text)
+        usage = Usage(
+            requests=1,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=input_tokens + output_tokens,
+        )
+        return text, usage
+
+    def _maybe_fail(self) -> None:
+        if self.rng.random() < self.profile.failure_rate:
+            raise StubModelError("Injected stub model failure")
+
+    def _words(self) -> str:
+        count = self.rng.randint(*self.profile.output_words)
+        return " ".join(self.rng.choice(VOCABULARY) for _ in range(count)) + "."
+
+    def _search_strategy(self) -> str:
+        topics = self.rng.sample(VOCABULARY, self.rng.randint(*self.profile.items))
+        return json.dumps({
+            "search_queries": [
+                {"query": f"{topic} {self._words()}", "rationale": self._words()}
+                for topic in topics
+            ]
+        })
+
+    def _research_report(self) -> str:
+        return json.dumps({
+            "executive_summary": self._words(),
+            "markdown_content": f"# Benchmark Report\n\n{self._words()}",
+            "future_research_directions": [self._words() for _ in range(3)],
+        })
+
+    @staticmethod
+    def _message(text: str, item_id: str | None = None) -> ResponseOutputMessage:
+        return ResponseOutputMessage(
+            id=item_id or f"msg_{uuid.uuid4().hex}",
+            type="message",
+            role="assistant",
+            status="completed",
+            content=[ResponseOutputText(type="output_text", text=text, annotations=[])],
+        )
+
+
+def install_stub_models(
+    orchestrator: ResearchOrchestrator, profiles: StubProfiles, seed: int | None = None
+) -> dict[str, StubModel]:
+    """
+    Replace the model of every agent of an orchestrator with a stub model.
+    Variants cloned for a budget plan's models keep the stub model too, so
+    budgeted runs stay offline as well.
+
+    Args:
+        orchestrator: The orchestrator to patch
+        profiles: Behaviour of each fake model
+        seed: Seed for reproducible latencies and outputs
+
+    Returns:
+        The installed stub models keyed by role
+    """
+    rng = random.Random(seed)
+    models = {
+        "planner": StubModel(profiles.planner, rng.random()),
+        "researcher": StubModel(profiles.researcher, rng.random()),
+        "summarizer": StubModel(profiles.summarizer, rng.random()),
+        "writer": StubModel(profiles.writer, rng.random()),
+    }
+    orchestrator.search_planner.agent.model = models["planner"]
+    orchestrator.web_researcher.agent.model = models["researcher"]
+    orchestrator.findings_summarizer.agent.model = models["summarizer"]
+    orchestrator.report_writer.agent.model = models["writer"]
+
+    agent_for = orchestrator._agent_for
+
+    def stubbed_agent_for(research_agent, role, plan):
+        agent = agent_for(research_agent, role, plan)
+        if isinstance(research_agent.agent.model, StubModel):
+            agent.model = research_agent.agent.model
+        return agent
+
+    orchestrator._agent_for = stubbed_agent_for
+    return models
@@ -1,12 +1,11 @@
 """
 Deep Research System - A multi-agent research platform
+
+Submodules are imported lazily on first attribute access, so importing the
+package stays cheap and never pulls in the agents SDK or the web UI.
 """
 
-from .core.research_orchestrator import ResearchOrchestrator
-from .agents.search_planner import SearchPlanner
-from .agents.web_researcher import WebResearcher
-from .agents.report_writer import ReportWriter
-from .agents.notification_sender import ReportFormatter
+import importlib
 
 __version__ = "1.0.0"
 __all__ = [
@@ -14,5 +13,28 @@ __all__ = [
     "SearchPlanner", 
     "WebResearcher",
     "ReportWriter",
-    "ReportFormatter"
+    "ReportFormatter",
+    "FindingsSummarizer"
 ]
+
+_LAZY_EXPORTS = {
+    "ResearchOrchestrator": ".core.research_orchestrator",
+    "SearchPlanner": ".agents.search_planner",
+    "WebResearcher": ".agents.web_researcher",
+    "ReportWriter": ".agents.report_writer",
+    "ReportFormatter": ".agents.notification_sender",
+    "FindingsSummarizer": ".agents.findings_summarizer",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
@@ -3,23 +3,39 @@ Base Agent Class - Common functionality for all research agents
 """
 
 from abc import ABC, abstractmethod
-from agents import Agent
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from agents import Agent
 
 
 class BaseAgent(ABC):
     """
     Abstract base class for all research agents.
     Provides common functionality and interface.
+    The underlying agent is created on first use, so constructing a research
+    agent does not import the agents SDK.
     """
 
     def __init__(self):
-        self.agent: Agent = None
+        self._agent: "Agent | None" = None
+
+    @property
+    def agent(self) -> "Agent":
+        """The configured agent, created on first access."""
+        if self._agent is None:
+            self._agent = self._create_agent()
+        return self._agent
+
+    @agent.setter
+    def agent(self, agent: "Agent") -> None:
+        self._agent = agent
 
     @abstractmethod
-    def _create_agent(self) -> Agent:
+    def _create_agent(self) -> "Agent":
         """Create and configure the specific agent implementation."""
         pass
 
-    def get_agent(self) -> Agent:
+    def get_agent(self) -> "Agent":
         """Get the configured agent instance."""
         return self.agent
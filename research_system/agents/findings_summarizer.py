@@ -0,0 +1,41 @@
+"""
+Findings Summarizer Agent - Condenses batches of research findings for synthesis
+"""
+
+from typing import TYPE_CHECKING
+
+from .base_agent import BaseAgent
+
+if TYPE_CHECKING:
+    from agents import Agent
+
+
+class FindingsSummarizer(BaseAgent):
+    """
+    Agent responsible for condensing a batch of web research findings.
+    Produces compact intermediate summaries that the report writer combines.
+    """
+
+    def _create_agent(self) -> "Agent":
+        """Create the findings summarization agent."""
+        from agents import Agent
+
+        instructions = """
+        You are a research analyst preparing notes for a senior report writer.
+        You receive a research question and a batch of findings from web searches.
+        
+        Your task is to:
+        1. Merge the findings into one dense, factual summary (under 400 words)
+        2. Keep every distinct fact, statistic, date and named entity
+        3. Remove repetition between findings
+        4. Preserve source names and URLs next to the claims they support
+        5. Note disagreements between sources rather than resolving them
+        
+        Do not add information that is not present in the findings.
+        """
+        
+        return Agent(
+            name="Research Findings Summarizer",
+            instructions=instructions,
+            model="gpt-4o-mini",
+        )
@@ -2,23 +2,30 @@
 Report Formatter - Formats research reports for display
 """
 
-from agents import Agent
+from typing import TYPE_CHECKING
 
+from ..core.markdown_normalizer import MarkdownNormalizer
 from .base_agent import BaseAgent
 
+if TYPE_CHECKING:
+    from agents import Agent
+
 
 class ReportFormatter(BaseAgent):
     """
-    Agent responsible for formatting research reports for display.
-    Focuses on creating well-structured, readable content.
+    Formats research reports for display with a deterministic local normalizer.
+    The formatting agent is only built when LLM formatting is opted into.
     """
 
-    def __init__(self):
+    def __init__(self, use_llm: bool = False, normalizer: MarkdownNormalizer | None = None):
         super().__init__()
-        self.agent = self._create_agent()
+        self.use_llm = use_llm
+        self.normalizer = normalizer if normalizer is not None else MarkdownNormalizer()
 
-    def _create_agent(self) -> Agent:
+    def _create_agent(self) -> "Agent":
         """Create the report formatting agent."""
+        from agents import Agent
+
         instructions = """
         You are a professional content formatter specializing in research reports. 
         Your task is to ensure research reports are well-structured, readable, and 
@@ -54,8 +61,7 @@ class ReportFormatter(BaseAgent):
             report_content: The markdown report content
             
         Returns:
-            Formatted report content
+            Report with a consistent heading hierarchy, list and table syntax,
+            a table of contents and numbered references
         """
-        # For now, just return the markdown content as-is
-        # In the future, this could add additional formatting or validation
-        return report_content
+        return self.normalizer.normalize(report_content)
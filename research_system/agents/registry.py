@@ -0,0 +1,39 @@
+"""
+Agent Registry - Process-wide instances of the research agents
+"""
+
+import threading
+from typing import TypeVar
+
+from .base_agent import BaseAgent
+
+
+AgentT = TypeVar("AgentT", bound=BaseAgent)
+
+_agents: dict[tuple, BaseAgent] = {}
+_lock = threading.Lock()
+
+
+def shared_agent(agent_class: type[AgentT], **options) -> AgentT:
+    """
+    Return the process-wide instance of a research agent, creating it on first use.
+
+    Args:
+        agent_class: The research agent class
+        **options: Constructor arguments; each distinct set gets its own instance
+
+    Returns:
+        The shared research agent
+    """
+    key = (agent_class, tuple(sorted(options.items())))
+    with _lock:
+        agent = _agents.get(key)
+        if agent is None:
+            agent = _agents[key] = agent_class(**options)
+        return agent
+
+
+def clear_agent_registry() -> None:
+    """Forget every shared agent, e.g. after changing agent configuration."""
+    with _lock:
+        _agents.clear()
@@ -2,11 +2,15 @@
 Report Writer Agent - Generates comprehensive research reports
 """
 
+from typing import TYPE_CHECKING
+
 from pydantic import BaseModel, Field
-from agents import Agent
 
 from .base_agent import BaseAgent
 
+if TYPE_CHECKING:
+    from agents import Agent
+
 
 class ResearchReport(BaseModel):
     """Comprehensive research report with multiple components."""
@@ -27,12 +31,10 @@ class ReportWriter(BaseAgent):
     Synthesizes research data into well-structured, detailed reports.
     """
 
-    def __init__(self):
-        super().__init__()
-        self.agent = self._create_agent()
-
-    def _create_agent(self) -> Agent:
+    def _create_agent(self) -> "Agent":
         """Create the report writing agent."""
+        from agents import Agent
+
         instructions = """
         You are a senior research analyst and report writer with expertise in creating 
         comprehensive, well-structured research reports.
@@ -2,11 +2,15 @@
 Search Planner Agent - Creates optimized search strategies for research queries
 """
 
+from typing import TYPE_CHECKING
+
 from pydantic import BaseModel, Field
-from agents import Agent
 
 from .base_agent import BaseAgent
 
+if TYPE_CHECKING:
+    from agents import Agent
+
 
 class SearchQuery(BaseModel):
     """Represents a single search query with its rationale."""
@@ -29,12 +33,10 @@ class SearchPlanner(BaseAgent):
     Analyzes research queries and generates optimal search terms.
     """
 
-    def __init__(self):
-        super().__init__()
-        self.agent = self._create_agent()
-
-    def _create_agent(self) -> Agent:
+    def _create_agent(self) -> "Agent":
         """Create the search planning agent."""
+        from agents import Agent
+
         instructions = """
         You are an expert research strategist. Given a research query, you create a comprehensive 
         search strategy to gather the most relevant and diverse information.
@@ -49,6 +51,10 @@ class SearchPlanner(BaseAgent):
         Each search query should be specific enough to yield relevant results but broad enough 
         to capture important information. Consider synonyms, related terms, and different 
         formulations of the same concept.
+        
+        When the input describes earlier research and the searches it already performed, 
+        treat that ground as covered: plan only searches that fill the gaps the follow-up 
+        question opens, using the suggested directions where they are relevant.
         """
         
         return Agent(
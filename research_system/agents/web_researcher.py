@@ -2,10 +2,13 @@
 Web Researcher Agent - Performs web searches and summarizes findings
 """
 
-from agents import Agent, WebSearchTool, ModelSettings
+from typing import TYPE_CHECKING
 
 from .base_agent import BaseAgent
 
+if TYPE_CHECKING:
+    from agents import Agent
+
 
 class WebResearcher(BaseAgent):
     """
@@ -13,12 +16,10 @@ class WebResearcher(BaseAgent):
     Focuses on extracting key information from search results.
     """
 
-    def __init__(self):
-        super().__init__()
-        self.agent = self._create_agent()
-
-    def _create_agent(self) -> Agent:
+    def _create_agent(self) -> "Agent":
         """Create the web research agent."""
+        from agents import Agent, WebSearchTool, ModelSettings
+
         instructions = """
         You are a skilled research analyst specializing in web search and information synthesis.
         
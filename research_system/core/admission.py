@@ -0,0 +1,203 @@
+"""
+Admission Control - Global concurrency cap, per-session quotas and fair queueing of research runs
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from typing import AsyncIterator
+
+from .metrics import ADMISSION_QUEUE_DEPTH, ADMISSION_REJECTED, ADMISSION_RUNNING, ADMISSION_WAIT
+
+
+logger = logging.getLogger(__name__)
+
+# Why a request was turned away, as recorded in the research_admission_rejected_total metric
+QUEUE_FULL = "queue_full"
+SESSION_QUOTA = "session_quota"
+
+
+class AdmissionRejected(RuntimeError):
+    """A research request was turned away because the queue or its session's quota is full."""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+class AdmissionTicket:
+    """
+    A research request's place in the admission queue.
+    Release it when the run ends, whether or not it was admitted.
+    """
+
+    def __init__(self, controller: "AdmissionController", session_id: str, start_tag: float, sequence: int):
+        self.controller = controller
+        self.session_id = session_id
+        # Virtual start time under fair queueing; lower tags are admitted first
+        self.start_tag = start_tag
+        self.sequence = sequence
+        self.enqueued_at = time.monotonic()
+        self.admitted = False
+        self.released = False
+
+    @property
+    def order(self) -> tuple[float, int]:
+        return self.start_tag, self.sequence
+
+    async def positions(self) -> AsyncIterator[tuple[int, int]]:
+        """
+        Wait for admission, reporting the ticket's place in the queue.
+
+        Yields:
+            Tuples of (1-based position, number of queued requests) whenever
+            they change, until the ticket is admitted
+        """
+        last = None
+        while not self.admitted:
+            changed = self.controller._changed
+            current = self.controller.position(self)
+            if current != last:
+                last = current
+                yield current
+                continue
+            await changed.wait()
+
+    def release(self) -> None:
+        """Give up the ticket's running slot or its place in the queue."""
+        self.controller._release(self)
+
+
+class AdmissionController:
+    """
+    Admits research runs under a global concurrency cap and per-session quotas.
+    Requests beyond the cap wait in a bounded queue. The queue is served by
+    start-time fair queueing: each request is tagged with its session's
+    virtual start time, advanced by the request's cost divided by its weight,
+    so a session that queues many or expensive runs cannot starve the others.
+    Requests of one session are admitted in arrival order, and requests with
+    equal tags in global FIFO order.
+    """
+
+    def __init__(
+        self,
+        max_running: int = 8,
+        max_queued: int = 32,
+        session_running: int = 1,
+        session_queued: int = 1,
+    ):
+        self.max_running = max_running
+        self.max_queued = max_queued
+        self.session_running = session_running
+        self.session_queued = session_queued
+        self._queue: list[AdmissionTicket] = []
+        self._running: dict[str, int] = {}
+        self._queued: dict[str, int] = {}
+        # Virtual finish time of each session's latest request
+        self._finish_tags: dict[str, float] = {}
+        self._virtual_time = 0.0
+        self._sequence = itertools.count()
+        self._changed = asyncio.Event()
+
+    @property
+    def running(self) -> int:
+        return sum(self._running.values())
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    def enqueue(self, session_id: str, cost: float = 1.0, weight: float = 1.0) -> AdmissionTicket:
+        """
+        Queue a research request, admitting it at once if a slot is free.
+
+        Args:
+            session_id: The user session making the request
+            cost: Relative cost of the run, e.g. higher for deep research
+            weight: Share of capacity the session is entitled to relative to others
+
+        Returns:
+            The request's ticket
+
+        Raises:
+            AdmissionRejected: If the session already has its quota of queued
+                requests or the queue is full
+        """
+        if self._queued.get(session_id, 0) >= self.session_queued:
+            waiting = f"{self.session_queued} research request{'s' if self.session_queued != 1 else ''}"
+            self._reject(SESSION_QUOTA, f"This session already has {waiting} waiting")
+        if len(self._queue) >= self.max_queued:
+            self._reject(QUEUE_FULL, f"The research queue is full ({self.max_queued} requests waiting)")
+
+        start_tag = max(self._virtual_time, self._finish_tags.get(session_id, 0.0))
+        self._finish_tags[session_id] = start_tag + cost / weight
+        ticket = AdmissionTicket(self, session_id, start_tag, next(self._sequence))
+        self._queue.append(ticket)
+        self._queued[session_id] = self._queued.get(session_id, 0) + 1
+        self._dispatch()
+        return ticket
+
+    def position(self, ticket: AdmissionTicket) -> tuple[int, int]:
+        """Return a queued ticket's 1-based position and the number of queued requests."""
+        ahead = sum(1 for other in self._queue if other.order < ticket.order)
+        return ahead + 1, len(self._queue)
+
+    def _reject(self, reason: str, message: str) -> None:
+        ADMISSION_REJECTED.inc(reason=reason)
+        logger.warning("Rejected research request: %s", message)
+        raise AdmissionRejected(reason, message)
+
+    def _dispatch(self) -> None:
+        """Admit queued requests in tag order while slots are free, skipping sessions at their quota."""
+        self._queue.sort(key=lambda ticket: ticket.order)
+        while self.running < self.max_running:
+            ticket = next(
+                (
+                    ticket for ticket in self._queue
+                    if self._running.get(ticket.session_id, 0) < self.session_running
+                ),
+                None,
+            )
+            if ticket is None:
+                break
+            self._queue.remove(ticket)
+            self._count(self._queued, ticket.session_id, -1)
+            self._count(self._running, ticket.session_id, 1)
+            ticket.admitted = True
+            self._virtual_time = max(self._virtual_time, ticket.start_tag)
+            ADMISSION_WAIT.observe(time.monotonic() - ticket.enqueued_at, outcome="admitted")
+        self._forget_idle_sessions()
+        self._notify()
+
+    def _forget_idle_sessions(self) -> None:
+        """Drop the tags of idle sessions that no longer affect the order; all of them once the queue is empty."""
+        horizon = self._virtual_time if self._queue else float("inf")
+        self._finish_tags = {
+            session_id: tag for session_id, tag in self._finish_tags.items()
+            if tag > horizon or session_id in self._running or session_id in self._queued
+        }
+
+    def _release(self, ticket: AdmissionTicket) -> None:
+        if ticket.released:
+            return
+        ticket.released = True
+        if ticket.admitted:
+            self._count(self._running, ticket.session_id, -1)
+        else:
+            self._queue.remove(ticket)
+            self._count(self._queued, ticket.session_id, -1)
+            ADMISSION_WAIT.observe(time.monotonic() - ticket.enqueued_at, outcome="abandoned")
+        self._dispatch()
+
+    @staticmethod
+    def _count(counts: dict[str, int], session_id: str, change: int) -> None:
+        counts[session_id] = counts.get(session_id, 0) + change
+        if counts[session_id] <= 0:
+            del counts[session_id]
+
+    def _notify(self) -> None:
+        ADMISSION_RUNNING.set(self.running)
+        ADMISSION_QUEUE_DEPTH.set(len(self._queue))
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
@@ -0,0 +1,244 @@
+"""
+Research Budget - Latency and cost budgets that choose fan-out width, search context and models
+"""
+
+import itertools
+import logging
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING
+
+from .metrics import estimate_cost
+from .search_fanout import FanOutPolicy, LatencyTracker
+
+if TYPE_CHECKING:
+    from agents import Agent
+
+
+logger = logging.getLogger(__name__)
+
+# Agent roles whose model a plan chooses
+ROLES = ("planning", "searching", "summarizing", "reporting", "formatting")
+
+MODEL_TIERS = {
+    "economy": {
+        "planning": "gpt-4.1-nano",
+        # The web search tool is not available on nano models
+        "searching": "gpt-4o-mini",
+        "summarizing": "gpt-4.1-nano",
+        "reporting": "gpt-4.1-nano",
+        "formatting": "gpt-4.1-nano",
+    },
+    "standard": {role: "gpt-4o-mini" for role in ROLES},
+    "premium": {
+        "planning": "gpt-4.1-mini",
+        "searching": "gpt-4.1-mini",
+        "summarizing": "gpt-4.1-mini",
+        "reporting": "gpt-4.1",
+        "formatting": "gpt-4.1-mini",
+    },
+}
+TIER_DEPTH = {"economy": 1.0, "standard": 1.5, "premium": 2.0}
+CONTEXT_DEPTH = {"low": 1.0, "medium": 1.25, "high": 1.5}
+SEARCH_COUNTS = range(3, 8)
+
+# Phase latencies assumed until enough runs have been observed, in seconds
+PRIOR_SECONDS = {
+    "planning": {"gpt-4.1-nano": 2.0, "gpt-4o-mini": 3.0, "gpt-4.1-mini": 4.0},
+    "searching": {"gpt-4o-mini": 5.0, "gpt-4.1-mini": 6.0},
+    "reporting": {"gpt-4.1-nano": 9.0, "gpt-4o-mini": 20.0, "gpt-4.1": 30.0},
+    "formatting": {"gpt-4.1-nano": 6.0, "gpt-4o-mini": 12.0, "gpt-4.1-mini": 14.0},
+}
+CONTEXT_LATENCY_FACTOR = {"low": 1.0, "medium": 1.4, "high": 2.0}
+# Typical (input, output) tokens of one call; report input grows with each search
+PHASE_TOKENS = {"planning": (800, 400), "searching": (2500, 450), "reporting": (600, 2500), "formatting": (3000, 2500)}
+REPORT_TOKENS_PER_SEARCH = 500
+# USD per web search tool call by search context size
+WEB_SEARCH_PRICES = {"low": 0.025, "medium": 0.0275, "high": 0.03}
+
+
+@dataclass(frozen=True)
+class ResearchBudget:
+    """
+    Limits a research run should stay within.
+
+    Attributes:
+        latency_seconds: Target end-to-end duration, or None for no limit
+        cost_usd: Target estimated spend, or None for no limit
+    """
+    latency_seconds: float | None = None
+    cost_usd: float | None = None
+
+
+BUDGET_PRESETS = {
+    "fast": ResearchBudget(latency_seconds=20.0),
+    "deep": ResearchBudget(latency_seconds=300.0, cost_usd=1.0),
+}
+
+
+def resolve_budget(budget: "ResearchBudget | str | None") -> ResearchBudget | None:
+    """
+    Turn a preset name into its budget.
+
+    Raises:
+        ValueError: If the preset name is unknown
+    """
+    if not isinstance(budget, str):
+        return budget
+    if budget not in BUDGET_PRESETS:
+        raise ValueError(f"Unknown research budget {budget!r}; choose one of {', '.join(BUDGET_PRESETS)}")
+    return BUDGET_PRESETS[budget]
+
+
+def agent_variant(agent: "Agent") -> str:
+    """Identify an agent's model and web search context size for latency statistics."""
+    variant = str(agent.model)
+    for tool in agent.tools:
+        context = getattr(tool, "search_context_size", None)
+        if context is not None:
+            variant += f"/{context}"
+    return variant
+
+
+@dataclass
+class ExecutionPlan:
+    """Fan-out width, search context and per-role models chosen for one run."""
+    tier: str
+    max_searches: int
+    search_context_size: str
+    models: dict[str, str] = field(default_factory=dict)
+    estimated_seconds: float = 0.0
+    estimated_cost_usd: float = 0.0
+    # Seconds the search phase may take so the rest of the run fits the budget
+    search_deadline: float | None = None
+    within_budget: bool = True
+
+    def fanout_policy(self, policy: FanOutPolicy) -> FanOutPolicy:
+        """Tighten a fan-out policy's phase deadline to the plan's search deadline."""
+        if self.search_deadline is None:
+            return policy
+        deadline = self.search_deadline
+        if policy.phase_deadline is not None:
+            deadline = min(deadline, policy.phase_deadline)
+        return replace(policy, phase_deadline=deadline)
+
+    def describe(self) -> str:
+        """Summarize the plan in one line."""
+        summary = (
+            f"{self.max_searches} searches, {self.search_context_size} search context, {self.tier} models "
+            f"(est. {self.estimated_seconds:.0f}s, ${self.estimated_cost_usd:.3f})"
+        )
+        return summary if self.within_budget else summary + ", budget cannot be met"
+
+
+class PhaseStats:
+    """
+    Rolling latency samples of recent runs per phase and agent variant.
+    Search samples are per web search call; other phases are whole-phase durations.
+    """
+
+    def __init__(self, window: int = 50, min_samples: int = 5):
+        self.window = window
+        self.min_samples = min_samples
+        self._trackers: dict[tuple[str, str], LatencyTracker] = {}
+
+    def record(self, phase: str, variant: str, seconds: float) -> None:
+        """Record one observed duration."""
+        tracker = self._trackers.get((phase, variant))
+        if tracker is None:
+            tracker = self._trackers[(phase, variant)] = LatencyTracker(self.window)
+        tracker.record(seconds)
+
+    def percentile(self, phase: str, variant: str, fraction: float) -> float | None:
+        """
+        Return an observed latency percentile.
+
+        Returns:
+            Latency in seconds, or None until min_samples durations were recorded
+        """
+        tracker = self._trackers.get((phase, variant))
+        if tracker is None or len(tracker) < self.min_samples:
+            return None
+        return tracker.percentile(fraction)
+
+
+class BudgetPlanner:
+    """
+    Chooses the deepest execution plan whose estimated latency and cost fit a budget.
+    Estimates use observed phase latencies once enough runs were recorded and
+    conservative priors before that.
+    """
+
+    def __init__(self, stats: PhaseStats, latency_percentile: float = 0.75):
+        self.stats = stats
+        self.latency_percentile = latency_percentile
+
+    def plan(self, budget: ResearchBudget, llm_formatting: bool = False) -> ExecutionPlan:
+        """
+        Pick the number of searches, search context size and model tier for a run.
+
+        Args:
+            budget: Latency and cost limits of the run
+            llm_formatting: Whether the formatter agent runs after the report
+
+        Returns:
+            The deepest plan within budget, or the fastest plan when none fits
+        """
+        candidates = [
+            self._estimate(tier, searches, context, budget, llm_formatting)
+            for tier, searches, context in itertools.product(MODEL_TIERS, SEARCH_COUNTS, CONTEXT_DEPTH)
+        ]
+        feasible = [candidate for candidate in candidates if candidate.within_budget]
+        if feasible:
+            return max(
+                feasible,
+                key=lambda plan: (
+                    plan.max_searches * CONTEXT_DEPTH[plan.search_context_size] * TIER_DEPTH[plan.tier],
+                    -plan.estimated_seconds,
+                ),
+            )
+        fallback = min(candidates, key=lambda plan: (plan.estimated_seconds, plan.estimated_cost_usd))
+        logger.warning("No research plan fits %s; using the fastest plan", budget)
+        return fallback
+
+    def _estimate(
+        self, tier: str, searches: int, context: str, budget: ResearchBudget, llm_formatting: bool
+    ) -> ExecutionPlan:
+        models = MODEL_TIERS[tier]
+        planning = self._phase_seconds("planning", models["planning"])
+        searching = self._search_seconds(models["searching"], context, searches)
+        reporting = self._phase_seconds("reporting", models["reporting"])
+        formatting = self._phase_seconds("formatting", models["formatting"]) if llm_formatting else 0.0
+
+        cost = estimate_cost(models["planning"], *PHASE_TOKENS["planning"])
+        cost += searches * (estimate_cost(models["searching"], *PHASE_TOKENS["searching"]) + WEB_SEARCH_PRICES[context])
+        report_input, report_output = PHASE_TOKENS["reporting"]
+        cost += estimate_cost(models["reporting"], report_input + searches * REPORT_TOKENS_PER_SEARCH, report_output)
+        if llm_formatting:
+            cost += estimate_cost(models["formatting"], *PHASE_TOKENS["formatting"])
+
+        seconds = planning + searching + reporting + formatting
+        search_deadline = None
+        if budget.latency_seconds is not None:
+            search_deadline = max(searching, budget.latency_seconds - planning - reporting - formatting)
+        within_budget = (budget.latency_seconds is None or seconds <= budget.latency_seconds) and (
+            budget.cost_usd is None or cost <= budget.cost_usd
+        )
+        return ExecutionPlan(
+            tier, searches, context, dict(models), seconds, cost, search_deadline, within_budget
+        )
+
+    def _phase_seconds(self, phase: str, model: str) -> float:
+        observed = self.stats.percentile(phase, model, self.latency_percentile)
+        if observed is not None:
+            return observed
+        priors = PRIOR_SECONDS[phase]
+        return priors.get(model, max(priors.values()))
+
+    def _search_seconds(self, model: str, context: str, searches: int) -> float:
+        """Estimate the slowest of several concurrent searches."""
+        # The slowest of n parallel calls sits around the n/(n+1) percentile of single calls
+        observed = self.stats.percentile("searching", f"{model}/{context}", searches / (searches + 1))
+        if observed is not None:
+            return observed
+        single = PRIOR_SECONDS["searching"].get(model, max(PRIOR_SECONDS["searching"].values()))
+        return single * CONTEXT_LATENCY_FACTOR[context] * (1 + 0.1 * (searches - 1))
@@ -0,0 +1,355 @@
+"""
+Call Control - Adaptive concurrency, jittered retries and a circuit breaker for agent calls
+"""
+
+import asyncio
+import contextlib
+import itertools
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncGenerator, AsyncIterator, Awaitable, Callable, TypeVar
+
+from .metrics import AGENT_CALL_RETRIES, AGENT_CALLS_REJECTED, AGENT_CIRCUIT_STATE, AGENT_CONCURRENCY_LIMIT
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Error classes returned by classify_error
+RATE_LIMIT = "rate_limit"
+TIMEOUT = "timeout"
+SERVER_ERROR = "server_error"
+CONNECTION_ERROR = "connection_error"
+# Failures that mean the upstream is overloaded, so concurrency should shrink
+OVERLOAD_ERRORS = (RATE_LIMIT, TIMEOUT)
+
+
+class CircuitOpenError(RuntimeError):
+    """Agent calls are failing fast while the upstream API recovers."""
+
+
+def classify_error(error: BaseException) -> str | None:
+    """
+    Classify an agent call failure by its upstream cause.
+
+    Returns:
+        RATE_LIMIT, TIMEOUT, SERVER_ERROR or CONNECTION_ERROR, or None for
+        errors of the request itself, which are neither retried nor counted
+        against the upstream
+    """
+    status = getattr(error, "status_code", None)
+    if status == 429:
+        return RATE_LIMIT
+    if status is not None and status >= 500:
+        return SERVER_ERROR
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+        return TIMEOUT
+    # openai's APITimeoutError subclasses APIConnectionError, so check it first
+    names = {cls.__name__ for cls in type(error).__mro__}
+    if "APITimeoutError" in names:
+        return TIMEOUT
+    if "APIConnectionError" in names:
+        return CONNECTION_ERROR
+    return None
+
+
+def retry_after(error: BaseException) -> float | None:
+    """Seconds the API asked to wait before retrying, from a Retry-After header."""
+    response = getattr(error, "response", None)
+    value = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retries of agent calls that failed for upstream reasons.
+
+    Attributes:
+        attempts: Total attempts per call, including the first
+        base_delay: Backoff cap in seconds before the first retry
+        max_delay: Upper bound of any backoff, including Retry-After hints
+    """
+    attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int, error: BaseException) -> float:
+        """Full-jitter exponential backoff after the given failed attempt, honouring Retry-After."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        hinted = retry_after(error)
+        if hinted is not None:
+            delay = max(delay, min(hinted, self.max_delay))
+        return delay
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that adapts with additive increase, multiplicative decrease.
+    Every successful call raises the limit by 1/limit, i.e. by about one per
+    round of calls; an overload error cuts it by the backoff factor, at most
+    once per round so a burst of 429s from the same calls cuts it only once.
+    """
+
+    def __init__(self, maximum: int = 64, minimum: int = 1, backoff: float = 0.5):
+        self.maximum = maximum
+        self.minimum = minimum
+        self.backoff = backoff
+        self.limit = float(maximum)
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._last_decrease = float("-inf")
+        AGENT_CONCURRENCY_LIMIT.set(int(self.limit))
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncGenerator[float, None]:
+        """
+        Hold one slot of the limit while a call runs.
+
+        Yields:
+            Monotonic time the slot was acquired, to pass to decrease()
+        """
+        await self._acquire()
+        try:
+            yield time.monotonic()
+        finally:
+            self.in_flight -= 1
+            self._wake()
+
+    async def _acquire(self) -> None:
+        if not self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before the cancellation
+            if waiter.done() and not waiter.cancelled():
+                self.in_flight -= 1
+                self._wake()
+            raise
+
+    def _wake(self) -> None:
+        """Hand free slots to waiting calls in arrival order."""
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def increase(self) -> None:
+        """Grow the limit after a successful call."""
+        self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+        AGENT_CONCURRENCY_LIMIT.set(int(self.limit))
+        self._wake()
+
+    def decrease(self, started: float) -> None:
+        """
+        Cut the limit after an overload error.
+
+        Args:
+            started: When the failed call acquired its slot; calls started
+                before the last cut were already in flight and do not cut again
+        """
+        if started < self._last_decrease:
+            return
+        self.limit = max(float(self.minimum), self.limit * self.backoff)
+        self._last_decrease = time.monotonic()
+        AGENT_CONCURRENCY_LIMIT.set(int(self.limit))
+        logger.warning("Agent call limit cut to %d after an overload error", int(self.limit))
+
+
+class CircuitBreaker:
+    """
+    Fails agent calls fast while the upstream API keeps failing.
+    Opens after a run of consecutive upstream failures, rejects calls until
+    the reset timeout passes, then lets a single probe call through: its
+    success closes the circuit and its failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._publish()
+
+    def check(self) -> bool:
+        """
+        Admit a call or fail fast.
+
+        Returns:
+            Whether the call is the half-open probe, to pass to release()
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a probe in flight
+        """
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                AGENT_CALLS_REJECTED.inc()
+                raise CircuitOpenError(f"OpenAI API unhealthy after {self.failures} consecutive failures")
+            self.state = self.HALF_OPEN
+            self._publish()
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                AGENT_CALLS_REJECTED.inc()
+                raise CircuitOpenError("OpenAI API unhealthy; waiting for a probe call")
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info("Circuit closed: the OpenAI API is answering again")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+        self._publish()
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning("Circuit opened after %d consecutive upstream failures", self.failures)
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._publish()
+
+    def release(self, probe: bool) -> None:
+        """Let another probe through if the probe call ended without a verdict, e.g. cancelled."""
+        if probe:
+            self._probing = False
+
+    def _publish(self) -> None:
+        for state in (self.CLOSED, self.OPEN, self.HALF_OPEN):
+            AGENT_CIRCUIT_STATE.set(1 if state == self.state else 0, state=state)
+
+
+class AgentCallController:
+    """
+    Runs agent calls under an adaptive concurrency limit, retry policy and circuit breaker.
+    Upstream failures are retried with jittered backoff; rate limits and
+    timeouts also shrink the concurrency limit, which grows back as calls
+    succeed. Rate limits only trip the breaker once the limit is at its
+    minimum. While the breaker is open, calls raise CircuitOpenError at once.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 64,
+        min_concurrency: int = 1,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self.limiter = AdaptiveLimiter(max_concurrency, min_concurrency)
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+
+    async def call(self, operation: Callable[[], Awaitable[T]], name: str = "agent") -> T:
+        """
+        Run a call, retrying upstream failures.
+
+        Args:
+            operation: Starts a fresh attempt of the call
+            name: Name used in log messages and metrics
+
+        Returns:
+            The result of the first successful attempt
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        for attempt in itertools.count(1):
+            probe = self.breaker.check()
+            async with self.limiter.slot() as started:
+                try:
+                    result = await operation()
+                except Exception as e:
+                    delay = self._failed(e, started, attempt, name)
+                else:
+                    self._succeeded()
+                    return result
+                finally:
+                    self.breaker.release(probe)
+            await asyncio.sleep(delay)
+
+    async def stream(self, operation: Callable[[], AsyncIterator[T]], name: str = "agent") -> AsyncGenerator[T, None]:
+        """
+        Run a streamed call, retrying upstream failures that happen before its first item.
+
+        Once an item was yielded a failure propagates, since a retry would
+        repeat output the caller already consumed.
+
+        Args:
+            operation: Starts a fresh attempt of the streamed call
+            name: Name used in log messages and metrics
+
+        Yields:
+            The items of the successful attempt
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        for attempt in itertools.count(1):
+            probe = self.breaker.check()
+            async with self.limiter.slot() as started:
+                streamed = False
+                try:
+                    # Closing the attempt promptly stops its upstream call when the caller stops listening
+                    async with contextlib.aclosing(operation()) as items:
+                        async for item in items:
+                            streamed = True
+                            yield item
+                except Exception as e:
+                    delay = self._failed(e, started, attempt, name, retryable=not streamed)
+                else:
+                    self._succeeded()
+                    return
+                finally:
+                    self.breaker.release(probe)
+            await asyncio.sleep(delay)
+
+    def _succeeded(self) -> None:
+        self.breaker.record_success()
+        self.limiter.increase()
+
+    def _failed(self, error: Exception, started: float, attempt: int, name: str, retryable: bool = True) -> float:
+        """
+        Account for a failed attempt and decide whether to retry it.
+
+        Returns:
+            Seconds to wait before the next attempt
+
+        Raises:
+            The error itself when it should not be retried
+        """
+        kind = classify_error(error)
+        if kind is None:
+            raise error
+        if kind in OVERLOAD_ERRORS:
+            self.limiter.decrease(started)
+        # Rate limits are the limiter's to absorb until it cannot back off any further
+        if kind != RATE_LIMIT or self.limiter.limit <= self.limiter.minimum:
+            self.breaker.record_failure()
+        if not retryable or attempt >= self.retry.attempts:
+            raise error
+        delay = self.retry.delay(attempt, error)
+        AGENT_CALL_RETRIES.inc(reason=kind)
+        logger.warning("%s call failed (%s), retrying in %.1fs (attempt %d)", name, kind, delay, attempt + 1)
+        return delay
@@ -0,0 +1,220 @@
+"""
+Findings Compression - Sentence-level near-duplicate removal across search summaries
+"""
+
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from .metrics import COMPRESSION_SENTENCES_DROPPED, COMPRESSION_TOKENS_SAVED, metrics
+from .query_dedup import text_terms
+from .synthesis import estimate_tokens, format_findings
+
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+(?=[\"'“(\[*_]*[A-Z0-9])")
+MARKDOWN_LINK = re.compile(r"\[([^\]]*)\]\((https?://[^)\s]+)\)")
+BARE_URL = re.compile(r"https?://[^\s<>()\[\]\"']+")
+LIST_MARKER = re.compile(r"^(\s*(?:[-*+]|\d+[.)])\s+)")
+# Lines kept verbatim: headings, tables, code fences and blank lines
+STRUCTURAL_LINE = re.compile(r"^\s*(?:#|\||```|~~~|$)")
+# Connectives a restatement may add without saying anything new
+DISCOURSE_TERMS = frozenset(text_terms(
+    "also notably overall additionally addition according recent reports furthermore moreover meanwhile indeed"
+))
+# Terms that flip or qualify a claim; a sentence dropping one of them says something else
+NEGATION_TERMS = frozenset(text_terms(
+    "not no never none nor neither without cannot t isn aren wasn weren doesn didn hasn haven hadn shouldn couldn wouldn"
+))
+ABBREVIATIONS = ("e.g.", "i.e.", "vs.", "etc.", "et al.", "approx.", "U.S.", "U.K.", "Dr.", "Inc.", "No.")
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split a line of prose into sentences, keeping common abbreviations intact."""
+    sentences: list[str] = []
+    for piece in SENTENCE_BOUNDARY.split(text.strip()):
+        if sentences and sentences[-1].endswith(ABBREVIATIONS):
+            sentences[-1] += " " + piece
+        else:
+            sentences.append(piece)
+    return sentences
+
+
+def sentence_sources(sentence: str) -> list[str]:
+    """Source URLs cited in a sentence, as markdown links or bare URLs, in order."""
+    urls = [url for _, url in MARKDOWN_LINK.findall(sentence)]
+    urls += [url.rstrip(".,;:") for url in BARE_URL.findall(MARKDOWN_LINK.sub("", sentence))]
+    return list(dict.fromkeys(urls))
+
+
+@dataclass
+class _Sentence:
+    text: str
+    sources: list[str]
+    terms: frozenset[str] = frozenset()
+    merged_sources: list[str] = field(default_factory=list)
+    kept: bool = True
+
+    def render(self) -> str:
+        if not self.merged_sources:
+            return self.text
+        links = ", ".join(f"[{urlsplit(url).netloc.removeprefix('www.')}]({url})" for url in self.merged_sources)
+        return f"{self.text} (also reported by {links})"
+
+
+@dataclass
+class CompressionStats:
+    """What sentence-level deduplication removed from one run's findings."""
+    sentences: int = 0
+    duplicates: int = 0
+    sources_merged: int = 0
+    tokens_before: int = 0
+    tokens_after: int = 0
+    seconds: float = 0.0
+
+    @property
+    def token_reduction(self) -> float:
+        """Fraction of the estimated prompt tokens removed."""
+        return 1 - self.tokens_after / self.tokens_before if self.tokens_before else 0.0
+
+    def describe(self) -> str:
+        """Summarize the compression in one line."""
+        return (
+            f"removed {self.duplicates} of {self.sentences} sentences as repeats, "
+            f"{self.tokens_before} → {self.tokens_after} tokens (-{self.token_reduction:.0%})"
+        )
+
+
+class FindingsCompressor:
+    """
+    Drops sentences repeated across search summaries before they reach the report writer.
+    Each sentence is reduced to hashed shingles of its normalized terms; a
+    sentence whose shingles are mostly contained in an earlier sentence, and
+    which adds no term beyond connectives nor leaves out a negation or figure
+    of it, is dropped and its source URLs are merged into the sentence it
+    repeats. Earlier findings win, so findings should be ordered by priority.
+    """
+
+    def __init__(self, threshold: float = 0.7, shingle_size: int = 2, min_terms: int = 4):
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        # Shorter sentences, e.g. "Key findings:", carry too little to compare
+        self.min_terms = min_terms
+
+    def _terms(self, text: str) -> list[str] | None:
+        terms = text_terms(MARKDOWN_LINK.sub("", BARE_URL.sub("", text)))
+        return terms if len(terms) >= self.min_terms else None
+
+    def _shingles(self, terms: list[str]) -> set[int]:
+        size = min(self.shingle_size, len(terms))
+        return {hash(tuple(terms[index:index + size])) for index in range(len(terms) - size + 1)}
+
+    def compress(self, findings: list[str]) -> tuple[list[str], CompressionStats]:
+        """
+        Remove near-duplicate sentences across findings.
+
+        Args:
+            findings: Search summaries, highest priority first
+
+        Returns:
+            Tuple of (compressed findings without any left empty, statistics)
+        """
+        started = time.perf_counter()
+        stats = CompressionStats(tokens_before=estimate_tokens(format_findings(findings)))
+        kept_sentences: list[_Sentence] = []
+        postings: dict[int, list[int]] = {}
+        # Per finding, its lines as verbatim text or (list marker, sentences)
+        documents: list[list[str | tuple[str, list[_Sentence]]]] = []
+
+        for finding in findings:
+            lines: list[str | tuple[str, list[_Sentence]]] = []
+            for line in finding.strip().splitlines():
+                if STRUCTURAL_LINE.match(line):
+                    lines.append(line)
+                    continue
+                marker = LIST_MARKER.match(line)
+                prefix = marker.group(1) if marker else ""
+                sentences = []
+                for text in split_sentences(line[len(prefix):]):
+                    sentence = _Sentence(text, sentence_sources(text))
+                    sentences.append(sentence)
+                    stats.sentences += 1
+                    terms = self._terms(text)
+                    if terms is None:
+                        continue
+                    sentence.terms = frozenset(terms)
+                    shingles = self._shingles(terms)
+                    original = self._find_original(sentence, shingles, postings, kept_sentences)
+                    if original is None:
+                        for shingle in shingles:
+                            postings.setdefault(shingle, []).append(len(kept_sentences))
+                        kept_sentences.append(sentence)
+                        continue
+                    sentence.kept = False
+                    stats.duplicates += 1
+                    target = kept_sentences[original]
+                    for url in sentence.sources:
+                        if url not in target.sources and url not in target.merged_sources:
+                            target.merged_sources.append(url)
+                            stats.sources_merged += 1
+                lines.append((prefix, sentences))
+            documents.append(lines)
+
+        compressed = []
+        for lines in documents:
+            rendered = []
+            for line in lines:
+                if isinstance(line, str):
+                    rendered.append(line)
+                    continue
+                prefix, sentences = line
+                text = " ".join(sentence.render() for sentence in sentences if sentence.kept)
+                if text:
+                    rendered.append(prefix + text)
+            finding = re.sub(r"\n{3,}", "\n\n", "\n".join(rendered)).strip()
+            if finding:
+                compressed.append(finding)
+
+        stats.tokens_after = estimate_tokens(format_findings(compressed))
+        stats.seconds = time.perf_counter() - started
+        COMPRESSION_SENTENCES_DROPPED.inc(stats.duplicates)
+        COMPRESSION_TOKENS_SAVED.inc(stats.tokens_before - stats.tokens_after)
+        metrics.log_event(
+            "findings_compression",
+            sentences=stats.sentences,
+            duplicates=stats.duplicates,
+            sources_merged=stats.sources_merged,
+            tokens_before=stats.tokens_before,
+            tokens_after=stats.tokens_after,
+            seconds=round(stats.seconds, 4),
+        )
+        return compressed, stats
+
+    def _find_original(
+        self,
+        sentence: _Sentence,
+        shingles: set[int],
+        postings: dict[int, list[int]],
+        kept_sentences: list[_Sentence],
+    ) -> int | None:
+        """Return the kept sentence that contains most of these shingles and states the same claim, if any."""
+        overlaps = Counter(index for shingle in shingles for index in postings.get(shingle, ()))
+        for index, overlap in overlaps.most_common():
+            if overlap / len(shingles) < self.threshold:
+                break
+            if self._same_claim(sentence.terms, kept_sentences[index].terms):
+                return index
+        return None
+
+    @staticmethod
+    def _same_claim(terms: frozenset[str], kept_terms: frozenset[str]) -> bool:
+        """
+        Whether a sentence only restates a kept one.
+
+        It must not add a term beyond connectives, e.g. "fell" for "rose" or
+        a "not", nor leave out a negation or number the kept sentence has.
+        """
+        if terms - kept_terms - DISCOURSE_TERMS:
+            return False
+        return not any(term in NEGATION_TERMS or term.isdigit() for term in kept_terms - terms)
@@ -0,0 +1,303 @@
+"""
+Findings Index - On-disk BM25 index of past web research summaries
+"""
+
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from .metrics import FINDINGS_INDEX_BYTES, FINDINGS_INDEX_DOCUMENTS, FINDINGS_INDEX_LOOKUPS
+from .query_dedup import query_terms, text_terms
+from .search_cache import normalize_query
+
+
+DEFAULT_INDEX_PATH = os.path.join(".research_cache", "findings_index.sqlite3")
+
+URL_PATTERN = re.compile(r"https?://[^\s<>()\[\]\"']+")
+
+# Term frequency of a document that counts as fully relevant to a query term
+REFERENCE_TF = 3
+
+
+@dataclass
+class IndexedFinding:
+    """A stored search summary matched against a query."""
+    doc_id: int
+    query: str
+    summary: str
+    sources: list[str] = field(default_factory=list)
+    created_at: float = 0.0
+    score: float = 0.0
+    # IDF-weighted share of the query's terms found in the summary
+    coverage: float = 0.0
+    # BM25 score relative to a summary mentioning every query term a few times
+    relevance: float = 0.0
+
+
+@dataclass
+class IndexStats:
+    """Snapshot of index effectiveness and size."""
+    lookups: int = 0
+    local_hits: int = 0
+    documents: int = 0
+    size_bytes: int = 0
+    compactions: int = 0
+
+    @property
+    def local_hit_ratio(self) -> float:
+        return self.local_hits / self.lookups if self.lookups else 0.0
+
+
+class FindingsIndex:
+    """
+    Local on-disk inverted index of web search summaries, ranked with BM25.
+    Every live search is added incrementally, and a planned search whose terms
+    are well covered by a fresh stored summary is answered without the web.
+    Replaced and expired summaries are tombstoned and removed by compaction,
+    which rewrites the whole database. Adding a summary never compacts: the
+    caller runs compact() off the event loop once compaction_due is set.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_INDEX_PATH,
+        max_age_seconds: float = 3 * 24 * 60 * 60,
+        min_coverage: float = 0.8,
+        min_relevance: float = 0.7,
+        max_matches: int = 2,
+        compact_after: int = 500,
+        k1: float = 1.2,
+        b: float = 0.75,
+        bypass: bool = False,
+    ):
+        self.path = path
+        self.max_age_seconds = max_age_seconds
+        self.min_coverage = min_coverage
+        self.min_relevance = min_relevance
+        self.max_matches = max_matches
+        self.compact_after = compact_after
+        self.k1 = k1
+        self.b = b
+        self.bypass = bypass
+        self.stats = IndexStats()
+        self._lock = threading.Lock()
+        self._connection = self._connect()
+        self._tombstones = self._connection.execute("SELECT COUNT(*) FROM documents WHERE live = 0").fetchone()[0]
+        self.compact()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite database and create the schema if needed."""
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                query TEXT NOT NULL,
+                query_key TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                sources TEXT NOT NULL,
+                length INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                live INTEGER NOT NULL DEFAULT 1
+            )
+            """
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_documents_query ON documents (query_key, live)")
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                doc_id INTEGER NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term, doc_id)
+            ) WITHOUT ROWID
+            """
+        )
+        connection.commit()
+        return connection
+
+    def add(self, query: str, summary: str) -> None:
+        """
+        Index the summary of a completed web search, replacing any earlier summary for the same query.
+
+        Args:
+            query: The search query text
+            summary: The web research summary
+        """
+        if self.bypass:
+            return
+
+        terms = Counter(text_terms(f"{query}\n{summary}"))
+        sources = list(dict.fromkeys(url.rstrip(".,;:") for url in URL_PATTERN.findall(summary)))
+        query_key = normalize_query(query)
+        with self._lock:
+            replaced = self._connection.execute(
+                "UPDATE documents SET live = 0 WHERE query_key = ? AND live = 1", (query_key,)
+            ).rowcount
+            cursor = self._connection.execute(
+                """
+                INSERT INTO documents (query, query_key, summary, sources, length, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (query, query_key, summary, json.dumps(sources), sum(terms.values()), time.time()),
+            )
+            self._connection.executemany(
+                "INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+                [(term, cursor.lastrowid, tf) for term, tf in terms.items()],
+            )
+            self._connection.commit()
+            self._tombstones += replaced
+
+    @property
+    def compaction_due(self) -> bool:
+        """Whether enough summaries were replaced since the last compaction to run another."""
+        return self._tombstones >= self.compact_after
+
+    def search(self, query: str, limit: int = 5) -> list[IndexedFinding]:
+        """
+        Rank fresh indexed summaries against a query with BM25.
+
+        Args:
+            query: The search query text
+            limit: Maximum number of findings to return
+
+        Returns:
+            The best-scoring fresh findings, highest score first
+        """
+        terms = sorted(query_terms(query))
+        if not terms:
+            return []
+
+        cutoff = time.time() - self.max_age_seconds
+        placeholders = ",".join("?" * len(terms))
+        with self._lock:
+            total_documents, total_length = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM documents WHERE live = 1 AND created_at >= ?",
+                (cutoff,),
+            ).fetchone()
+            if not total_documents:
+                return []
+            postings = self._connection.execute(
+                f"""
+                SELECT p.term, p.doc_id, p.tf, d.length FROM postings p
+                JOIN documents d ON d.doc_id = p.doc_id
+                WHERE p.term IN ({placeholders}) AND d.live = 1 AND d.created_at >= ?
+                """,
+                (*terms, cutoff),
+            ).fetchall()
+
+        document_frequency = Counter(term for term, _, _, _ in postings)
+        idf = {
+            term: math.log(1 + (total_documents - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+            for term in terms
+        }
+        average_length = total_length / total_documents
+        scores: dict[int, float] = {}
+        matched_weight: dict[int, float] = {}
+        for term, doc_id, tf, length in postings:
+            norm = self.k1 * (1 - self.b + self.b * length / average_length)
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            matched_weight[doc_id] = matched_weight.get(doc_id, 0.0) + idf[term]
+
+        total_weight = sum(idf.values())
+        reference_score = sum(weight * REFERENCE_TF * (self.k1 + 1) / (REFERENCE_TF + self.k1) for weight in idf.values())
+        ranked = sorted(scores, key=scores.get, reverse=True)[:limit]
+        if not ranked:
+            return []
+
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT doc_id, query, summary, sources, created_at FROM documents "
+                f"WHERE doc_id IN ({','.join('?' * len(ranked))})",
+                ranked,
+            ).fetchall()
+        documents = {row[0]: row for row in rows}
+        return [
+            IndexedFinding(
+                doc_id,
+                documents[doc_id][1],
+                documents[doc_id][2],
+                json.loads(documents[doc_id][3]),
+                documents[doc_id][4],
+                score=scores[doc_id],
+                coverage=matched_weight[doc_id] / total_weight if total_weight else 0.0,
+                relevance=scores[doc_id] / reference_score if reference_score else 0.0,
+            )
+            for doc_id in ranked
+            if doc_id in documents
+        ]
+
+    def lookup(self, query: str) -> list[IndexedFinding]:
+        """
+        Find fresh summaries good enough to answer a search without the web.
+
+        Args:
+            query: The search query text
+
+        Returns:
+            Up to max_matches findings passing the coverage and relevance
+            thresholds; empty on a miss or when bypassed
+        """
+        if self.bypass:
+            FINDINGS_INDEX_LOOKUPS.inc(result="bypass")
+            return []
+
+        matches = [
+            finding
+            for finding in self.search(query, limit=self.max_matches)
+            if finding.coverage >= self.min_coverage and finding.relevance >= self.min_relevance
+        ]
+        self.stats.lookups += 1
+        if matches:
+            self.stats.local_hits += 1
+        FINDINGS_INDEX_LOOKUPS.inc(result="hit" if matches else "miss")
+        return matches
+
+    def compact(self) -> int:
+        """
+        Remove replaced and expired summaries with their postings and reclaim disk space.
+
+        Returns:
+            Number of summaries removed
+        """
+        cutoff = time.time() - self.max_age_seconds
+        with self._lock:
+            stale = "SELECT doc_id FROM documents WHERE live = 0 OR created_at < ?"
+            self._connection.execute(f"DELETE FROM postings WHERE doc_id IN ({stale})", (cutoff,))
+            removed = self._connection.execute(
+                "DELETE FROM documents WHERE live = 0 OR created_at < ?", (cutoff,)
+            ).rowcount
+            self._connection.commit()
+            if removed:
+                self._connection.execute("VACUUM")
+                self.stats.compactions += 1
+            self._tombstones = 0
+        self.refresh_stats()
+        return removed
+
+    def refresh_stats(self) -> IndexStats:
+        """Update the document count and on-disk size in the stats and metrics."""
+        with self._lock:
+            self.stats.documents = self._connection.execute(
+                "SELECT COUNT(*) FROM documents WHERE live = 1"
+            ).fetchone()[0]
+            page_count = self._connection.execute("PRAGMA page_count").fetchone()[0]
+            page_size = self._connection.execute("PRAGMA page_size").fetchone()[0]
+        self.stats.size_bytes = page_count * page_size
+        FINDINGS_INDEX_DOCUMENTS.set(self.stats.documents)
+        FINDINGS_INDEX_BYTES.set(self.stats.size_bytes)
+        return self.stats
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._connection.close()
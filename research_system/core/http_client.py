@@ -0,0 +1,233 @@
+"""
+HTTP Client - Process-wide pooled AsyncOpenAI client shared by every agent call
+"""
+
+import asyncio
+import importlib.util
+import logging
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .metrics import HTTP_CONNECTIONS_OPENED, HTTP_POOL_CONNECTIONS, HTTP_REQUESTS_IN_FLIGHT, TLS_HANDSHAKES
+
+if TYPE_CHECKING:
+    import httpx
+    from openai import AsyncOpenAI
+
+
+logger = logging.getLogger(__name__)
+
+
+async def _close_at_loop_shutdown(client: "AsyncOpenAI"):
+    """Park until the event loop shuts down its async generators, then close the client on that loop."""
+    try:
+        yield
+    finally:
+        await client.close()
+
+
+def _close_with_running_loop(client: "AsyncOpenAI"):
+    """
+    Close a client when the running event loop shuts down, e.g. at the end of asyncio.run().
+
+    Its connections belong to that loop and cannot be closed from the next one,
+    so the loop is handed a parked async generator to finalize instead.
+
+    Returns:
+        The generator, which must stay referenced until then
+    """
+    closer = _close_at_loop_shutdown(client)
+    try:
+        closer.asend(None).send(None)
+    except StopIteration:
+        pass
+    return closer
+
+
+@dataclass
+class ClientPoolSettings:
+    """
+    Connection pool configuration for the shared OpenAI client.
+
+    Attributes:
+        max_connections: Upper bound on open connections to the API
+        max_keepalive_connections: Idle connections kept warm for reuse
+        keepalive_expiry: Seconds an idle connection is kept before closing
+        connect_timeout: Seconds allowed for TCP connect and TLS handshake
+        read_timeout: Seconds allowed between received bytes of a response
+        http2: Multiplex requests over HTTP/2 when the h2 package is installed
+        max_retries: Retries the OpenAI client makes on transient errors; agent call
+            control retries with backoff instead, so rate limits reach its limiter
+    """
+    max_connections: int = 100
+    max_keepalive_connections: int = 50
+    keepalive_expiry: float = 120.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 600.0
+    http2: bool = True
+    max_retries: int = 0
+
+
+@dataclass
+class PoolStats:
+    """Snapshot of shared client activity since it was created."""
+    requests_total: int = 0
+    # Requests still waiting for response headers
+    requests_in_flight: int = 0
+    connections_opened: int = 0
+    tls_handshakes: int = 0
+    open_connections: int = 0
+    idle_connections: int = 0
+    http2: bool = False
+
+    @property
+    def connection_reuse_rate(self) -> float:
+        """Fraction of requests served without opening a new connection."""
+        if not self.requests_total:
+            return 0.0
+        return max(0.0, 1 - self.connections_opened / self.requests_total)
+
+
+class SharedClient:
+    """
+    Lazily built AsyncOpenAI client with a tuned connection pool.
+    Installed as the agents SDK default client so every agent run reuses warm
+    connections. Connections belong to an event loop, so a new client is built
+    when used from a different loop, and each client is closed when its
+    loop shuts down.
+    """
+
+    def __init__(self, settings: ClientPoolSettings | None = None):
+        self.settings = settings if settings is not None else ClientPoolSettings()
+        self.stats = PoolStats()
+        self._client: "AsyncOpenAI | None" = None
+        self._transport: "httpx.AsyncHTTPTransport | None" = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Closes each loop's client when that loop shuts down
+        self._closers: list = []
+        self._lock = threading.Lock()
+
+    def ensure_installed(self) -> "AsyncOpenAI | None":
+        """
+        Build the client for the running event loop if needed and make it the SDK default.
+
+        Returns:
+            The shared client, or None when it cannot be built (e.g. no API key)
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return self._client
+
+        with self._lock:
+            if self._loop is loop:
+                return self._client
+            from agents import set_default_openai_client
+            from openai import AsyncOpenAI, OpenAIError
+
+            try:
+                client = AsyncOpenAI(http_client=self._build_http_client(), max_retries=self.settings.max_retries)
+            except OpenAIError as e:
+                # Remember the failure so it is reported once per event loop
+                logger.warning("Shared OpenAI client unavailable, using SDK defaults: %s", e)
+                self._client, self._loop = None, loop
+                return None
+            set_default_openai_client(client)
+            self._closers = [closer for closer in self._closers if closer.ag_frame is not None]
+            self._closers.append(_close_with_running_loop(client))
+            self._client, self._loop = client, loop
+            logger.info(
+                "Shared OpenAI client ready (max %d connections, HTTP/2 %s)",
+                self.settings.max_connections,
+                "on" if self.stats.http2 else "off",
+            )
+            return client
+
+    def _build_http_client(self) -> "httpx.AsyncClient":
+        import httpx
+
+        settings = self.settings
+        http2 = settings.http2 and importlib.util.find_spec("h2") is not None
+        if settings.http2 and not http2:
+            logger.info("h2 is not installed; the shared client will use HTTP/1.1 keep-alive")
+        self.stats.http2 = http2
+        shared = self
+
+        class _InstrumentedTransport(httpx.AsyncHTTPTransport):
+            async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+                shared._request_started(request)
+                try:
+                    return await super().handle_async_request(request)
+                finally:
+                    shared._request_finished()
+
+        transport = _InstrumentedTransport(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.max_connections,
+                max_keepalive_connections=settings.max_keepalive_connections,
+                keepalive_expiry=settings.keepalive_expiry,
+            ),
+        )
+        self._transport = transport
+        return httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(settings.read_timeout, connect=settings.connect_timeout),
+        )
+
+    def _request_started(self, request: "httpx.Request") -> None:
+        self.stats.requests_total += 1
+        self.stats.requests_in_flight += 1
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        request.extensions["trace"] = self._on_trace
+
+    def _request_finished(self) -> None:
+        self.stats.requests_in_flight -= 1
+        HTTP_REQUESTS_IN_FLIGHT.dec()
+        self._refresh_pool_stats()
+
+    async def _on_trace(self, event: str, info: dict) -> None:
+        """Count connection setup reported by httpcore's trace extension."""
+        if event == "connection.connect_tcp.complete":
+            self.stats.connections_opened += 1
+            HTTP_CONNECTIONS_OPENED.inc()
+        elif event == "connection.start_tls.complete":
+            self.stats.tls_handshakes += 1
+            TLS_HANDSHAKES.inc()
+
+    def _refresh_pool_stats(self) -> None:
+        # httpx does not expose its pool, so read httpcore's connection list defensively
+        pool = getattr(self._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        self.stats.open_connections = len(connections)
+        self.stats.idle_connections = sum(1 for connection in connections if connection.is_idle())
+        HTTP_POOL_CONNECTIONS.set(self.stats.open_connections - self.stats.idle_connections, state="active")
+        HTTP_POOL_CONNECTIONS.set(self.stats.idle_connections, state="idle")
+
+    def pool_stats(self) -> PoolStats:
+        """Return current pool statistics."""
+        self._refresh_pool_stats()
+        return PoolStats(**vars(self.stats))
+
+
+_shared_client = SharedClient()
+
+
+def shared_client() -> SharedClient:
+    """The process-wide shared client."""
+    return _shared_client
+
+
+def configure_shared_client(settings: ClientPoolSettings) -> SharedClient:
+    """
+    Replace the process-wide client settings; takes effect on the next agent call.
+
+    Args:
+        settings: New connection pool configuration
+
+    Returns:
+        The new shared client
+    """
+    global _shared_client
+    _shared_client = SharedClient(settings)
+    return _shared_client
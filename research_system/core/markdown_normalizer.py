@@ -0,0 +1,423 @@
+"""
+Markdown Normalizer - Deterministic linear-time cleanup of generated reports
+"""
+
+import re
+from dataclasses import dataclass, field
+
+
+FENCE = re.compile(r"^\s{0,3}(`{3,}|~{3,})")
+ATX_HEADING = re.compile(r"^\s{0,3}(#{1,6})(?:[ \t]+|$)(.*?)(?:[ \t]+#+)?[ \t]*$")
+SETEXT_UNDERLINE = re.compile(r"^\s{0,3}(=+|-+)\s*$")
+THEMATIC_BREAK = re.compile(r"^\s{0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$")
+BULLET_ITEM = re.compile(r"^(\s*)[*+-][ \t]+(.*)$")
+ORDERED_ITEM = re.compile(r"^(\s*)(\d{1,9})[.)][ \t]+(.*)$")
+TABLE_DELIMITER = re.compile(r"^\s*\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?\s*$")
+REFERENCE_DEFINITION = re.compile(r"^\s{0,3}\[[^\]]+\]:\s")
+CODE_SPAN = re.compile(r"(`+)[^`]*?\1")
+MARKDOWN_LINK = re.compile(r"\[([^\[\]\n]*)\]\((https?://[^\s()<>]+)\)")
+# One alternation so every URL is matched exactly once in a single scan
+LINK_OR_URL = re.compile(
+    r"(?P<image>!\[[^\[\]\n]*\]\([^()\s]*\))"
+    r"|\[\[\d+\]\]\((?P<cited>https?://[^\s()<>]+)\)"
+    r"|\[(?P<label>[^\[\]\n]*)\]\((?P<url>https?://[^\s()<>]+)\)"
+    r"|<(?P<autolink>https?://[^\s<>]+)>"
+    r"|(?P<bare>\bhttps?://[^\s<>()\[\]\"'`]+)"
+)
+CITATION = re.compile(r"\[\[\d+\]\]\(https?://[^\s()<>]+\)")
+
+# Reference sections the normalizer regenerates itself
+GENERATED_SECTIONS = {"references", "sources", "bibliography", "citations"}
+
+
+def _heading_text(text: str) -> str:
+    """Strip inline markup from a heading so it can be compared and slugged."""
+    text = MARKDOWN_LINK.sub(r"\1", CITATION.sub("", text))
+    return re.sub(r"[*_`]", "", text).strip()
+
+
+def _slugify(text: str, seen: dict[str, int]) -> str:
+    """Build a GitHub-style anchor for a heading, numbering repeated slugs."""
+    base = re.sub(r"[^\w\- ]", "", _heading_text(text).lower()).replace(" ", "-")
+    slug = base
+    while slug in seen:
+        seen[base] += 1
+        slug = f"{base}-{seen[base]}"
+    seen[slug] = 0
+    return slug
+
+
+def _canonical_url(url: str) -> str:
+    """Key under which differently written copies of a URL are deduplicated."""
+    url = url.split("#", 1)[0]
+    scheme, _, rest = url.partition("://")
+    host, slash, path = rest.partition("/")
+    return f"{scheme.lower()}://{host.lower()}{slash}{path}".rstrip("/")
+
+
+def _split_cells(row: str) -> list[str]:
+    """Split a table row on unescaped pipes, dropping the outer pipes."""
+    row = row.strip()
+    if row.startswith("|"):
+        row = row[1:]
+    if row.endswith("|") and not row.endswith("\\|"):
+        row = row[:-1]
+    return [cell.strip() for cell in re.split(r"(?<!\\)\|", row)]
+
+
+def _delimiter_cell(cell: str) -> str:
+    left, right = cell.startswith(":"), cell.endswith(":")
+    return (":" if left else "") + "---" + (":" if right else "")
+
+
+@dataclass
+class _Heading:
+    level: int
+    text: str
+    slug: str
+
+
+@dataclass
+class _State:
+    """Per-document bookkeeping collected while lines are rewritten."""
+    out: list[str] = field(default_factory=list)
+    headings: list[_Heading] = field(default_factory=list)
+    slugs: dict[str, int] = field(default_factory=dict)
+    references: dict[str, int] = field(default_factory=dict)
+    reference_urls: list[str] = field(default_factory=list)
+    reference_titles: list[str] = field(default_factory=list)
+    title: str | None = None
+    list_counters: dict[int, int] = field(default_factory=dict)
+
+
+class MarkdownNormalizer:
+    """
+    Rewrites report markdown into a consistent shape in a single pass over its lines.
+    Fixes the heading hierarchy, normalizes list and table syntax, numbers and
+    deduplicates cited URLs into a references section and adds a table of contents.
+    """
+
+    def __init__(
+        self,
+        table_of_contents: bool = True,
+        references: bool = True,
+        toc_min_headings: int = 3,
+        toc_max_depth: int = 3,
+    ):
+        self.table_of_contents = table_of_contents
+        self.references = references
+        self.toc_min_headings = toc_min_headings
+        self.toc_max_depth = toc_max_depth
+
+    def normalize(self, markdown: str) -> str:
+        """
+        Normalize a markdown document.
+
+        Args:
+            markdown: The markdown to clean up
+
+        Returns:
+            The normalized markdown, ending with a single newline unless empty
+        """
+        lines = self._tokenize(markdown)
+        levels = self._plan_heading_levels(lines)
+        state = _State()
+
+        index = 0
+        skipped_level: int | None = None
+        skipped_kind: str | None = None
+        heading_number = 0
+        while index < len(lines):
+            line, in_code = lines[index]
+            if in_code:
+                if skipped_level is None:
+                    state.out.append(line)
+                index += 1
+                continue
+
+            heading = ATX_HEADING.match(line)
+            if heading:
+                text = heading.group(2).strip()
+                level = levels[heading_number]
+                heading_number += 1
+                if skipped_level is not None and level > skipped_level:
+                    index += 1
+                    continue
+                skipped_kind = self._generated_section(text, level)
+                skipped_level = level if skipped_kind else None
+                if skipped_level is None:
+                    self._emit_heading(state, level, text)
+                index += 1
+                continue
+
+            if skipped_level is not None and skipped_kind == "contents" and line and not self._is_list_line(line):
+                # A table of contents is only a list; whatever follows it is body text
+                skipped_level = None
+            if skipped_level is not None:
+                # Keep the URLs of a replaced references section so none are lost
+                self._collect_urls(state, line)
+                index += 1
+                continue
+
+            if "|" in line and index + 1 < len(lines) and not lines[index + 1][1] and self._starts_table(
+                line, lines[index + 1][0]
+            ):
+                index = self._emit_table(state, lines, index)
+                continue
+
+            self._emit_line(state, line)
+            index += 1
+
+        return self._assemble(state)
+
+    def _tokenize(self, markdown: str) -> list[tuple[str, bool]]:
+        """Split into lines marked as code or text, converting setext headings to ATX."""
+        raw_lines = markdown.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+        lines: list[tuple[str, bool]] = []
+        fence: str | None = None
+        for raw in raw_lines:
+            fence_match = FENCE.match(raw)
+            if fence is not None:
+                lines.append((raw, True))
+                if fence_match and fence_match.group(1)[0] == fence[0] and len(fence_match.group(1)) >= len(fence):
+                    fence = None
+                continue
+            if fence_match:
+                fence = fence_match.group(1)
+                lines.append((raw.rstrip(), True))
+                continue
+
+            raw = raw.replace("\t", "    ").rstrip()
+            underline = SETEXT_UNDERLINE.match(raw)
+            if underline and lines and not lines[-1][1] and self._is_paragraph_text(lines[-1][0]):
+                marker = "#" if underline.group(1)[0] == "=" else "##"
+                lines[-1] = (f"{marker} {lines[-1][0].strip()}", False)
+                continue
+            lines.append((raw, False))
+        return lines
+
+    @staticmethod
+    def _is_paragraph_text(line: str) -> bool:
+        return bool(line.strip()) and not (
+            ATX_HEADING.match(line)
+            or BULLET_ITEM.match(line)
+            or ORDERED_ITEM.match(line)
+            or THEMATIC_BREAK.match(line)
+            or "|" in line
+        )
+
+    def _plan_heading_levels(self, lines: list[tuple[str, bool]]) -> list[int]:
+        """
+        Assign every heading a level so that no level is skipped.
+
+        A lone top-level heading that opens the document becomes the level 1
+        title and every other heading nests below it; without such a title,
+        sections start at level 2.
+        """
+        raw_levels = [
+            len(match.group(1))
+            for line, in_code in lines
+            if not in_code and (match := ATX_HEADING.match(line))
+        ]
+        if not raw_levels:
+            return []
+
+        top = min(raw_levels)
+        has_title = raw_levels[0] == top and raw_levels.count(top) == 1
+        levels = []
+        stack: list[tuple[int, int]] = []
+        for position, raw in enumerate(raw_levels):
+            if has_title and position == 0:
+                levels.append(1)
+                continue
+            while stack and stack[-1][0] >= raw:
+                stack.pop()
+            level = min(6, stack[-1][1] + 1 if stack else 2)
+            stack.append((raw, level))
+            levels.append(level)
+        return levels
+
+    def _generated_section(self, text: str, level: int) -> str | None:
+        """Return "contents" or "references" if a heading opens a section this normalizer regenerates."""
+        if level == 1:
+            return None
+        name = _heading_text(text).lower().rstrip(":")
+        if name in ("table of contents", "contents"):
+            return "contents" if self.table_of_contents else None
+        return "references" if self.references and name in GENERATED_SECTIONS else None
+
+    def _emit_heading(self, state: _State, level: int, text: str) -> None:
+        text = self._link_citations(state, text)
+        self._ensure_blank(state)
+        state.out.append(f"{'#' * level} {text}")
+        state.out.append("")
+        state.list_counters.clear()
+        slug = _slugify(text, state.slugs)
+        if level == 1 and state.title is None:
+            state.title = text
+            state.out.pop()
+            state.out.pop()
+            return
+        state.headings.append(_Heading(level, text, slug))
+
+    def _emit_line(self, state: _State, line: str) -> None:
+        """Rewrite one non-heading, non-table line."""
+        if not line:
+            if state.out and state.out[-1] != "":
+                state.out.append("")
+            return
+
+        if THEMATIC_BREAK.match(line):
+            self._ensure_blank(state)
+            state.out.append("---")
+            state.out.append("")
+            state.list_counters.clear()
+            return
+
+        if REFERENCE_DEFINITION.match(line):
+            state.out.append(line)
+            return
+
+        bullet = BULLET_ITEM.match(line)
+        ordered = None if bullet else ORDERED_ITEM.match(line)
+        if bullet or ordered:
+            match = bullet or ordered
+            indent = len(match.group(1))
+            previous = state.out[-1] if state.out else ""
+            if indent == 0 and previous and (
+                not self._is_list_line(previous) or bool(BULLET_ITEM.match(previous)) != bool(bullet)
+            ):
+                # Separate a list from the paragraph before it, and bullet lists from numbered ones
+                state.out.append("")
+            # A shallower item ends any deeper nested lists
+            for depth in [depth for depth in state.list_counters if depth > indent]:
+                del state.list_counters[depth]
+            if bullet:
+                state.list_counters.pop(indent, None)
+                state.out.append(f"{' ' * indent}- {self._link_citations(state, bullet.group(2))}")
+            else:
+                # Renumber consecutively from the list's own start number, as renderers do
+                number = state.list_counters[indent] + 1 if indent in state.list_counters else int(ordered.group(2))
+                state.list_counters[indent] = number
+                state.out.append(f"{' ' * indent}{number}. {self._link_citations(state, ordered.group(3))}")
+            return
+
+        if not line.startswith(" "):
+            state.list_counters.clear()
+        state.out.append(self._link_citations(state, line))
+
+    @staticmethod
+    def _is_list_line(line: str) -> bool:
+        return bool(BULLET_ITEM.match(line) or ORDERED_ITEM.match(line) or line.startswith("  "))
+
+    @staticmethod
+    def _starts_table(header: str, delimiter: str) -> bool:
+        return bool(TABLE_DELIMITER.match(delimiter)) and "-" in delimiter and len(_split_cells(header)) > 1
+
+    def _emit_table(self, state: _State, lines: list[tuple[str, bool]], index: int) -> int:
+        """Rewrite a pipe table with consistent pipes and column counts; return the next line index."""
+        header = _split_cells(lines[index][0])
+        width = len(header)
+        delimiter = (_split_cells(lines[index + 1][0]) + ["---"] * width)[:width]
+
+        self._ensure_blank(state)
+        state.out.append("| " + " | ".join(self._link_citations(state, cell) for cell in header) + " |")
+        state.out.append("| " + " | ".join(_delimiter_cell(cell) for cell in delimiter) + " |")
+
+        index += 2
+        while index < len(lines) and not lines[index][1] and "|" in lines[index][0]:
+            cells = (_split_cells(lines[index][0]) + [""] * width)[:width]
+            state.out.append("| " + " | ".join(self._link_citations(state, cell) for cell in cells) + " |")
+            index += 1
+        state.out.append("")
+        state.list_counters.clear()
+        return index
+
+    def _ensure_blank(self, state: _State) -> None:
+        if state.out and state.out[-1] != "":
+            state.out.append("")
+
+    def _reference_number(self, state: _State, url: str, title: str | None) -> int:
+        """Number a URL by first citation, reusing the number of an equivalent URL."""
+        url = url.rstrip(".,;:!?")
+        key = _canonical_url(url)
+        number = state.references.get(key)
+        if number is None:
+            state.reference_urls.append(url)
+            state.reference_titles.append(title or "")
+            number = state.references[key] = len(state.reference_urls)
+        elif title and not state.reference_titles[number - 1]:
+            state.reference_titles[number - 1] = title
+        return number
+
+    def _collect_urls(self, state: _State, line: str) -> None:
+        if self.references and "http" in line:
+            self._cite(state, line)
+
+    def _link_citations(self, state: _State, text: str) -> str:
+        """Replace links and bare URLs outside code spans with numbered citations."""
+        if not self.references or "http" not in text:
+            return text
+        if "`" not in text:
+            return self._cite(state, text)
+        parts = []
+        position = 0
+        for span in CODE_SPAN.finditer(text):
+            parts.append(self._cite(state, text[position:span.start()]))
+            parts.append(span.group(0))
+            position = span.end()
+        parts.append(self._cite(state, text[position:]))
+        return "".join(parts)
+
+    def _cite(self, state: _State, text: str) -> str:
+        """Number every link and URL in a run of text, leaving images alone."""
+        if "http" not in text:
+            return text
+
+        def replace(match: re.Match) -> str:
+            if match.group("image"):
+                return match.group(0)
+            if match.group("cited"):
+                # Citations from an earlier pass are renumbered, keeping normalization idempotent
+                number = self._reference_number(state, match.group("cited"), None)
+                return f"[[{number}]]({state.reference_urls[number - 1]})"
+            if match.group("url"):
+                label = match.group("label").strip()
+                number = self._reference_number(state, match.group("url"), label)
+                citation = f"[[{number}]]({state.reference_urls[number - 1]})"
+                return f"{label} {citation}" if label else citation
+            raw = match.group("autolink") or match.group("bare")
+            url = raw.rstrip(".,;:!?")
+            number = self._reference_number(state, url, None)
+            trailing = "" if match.group("autolink") else raw[len(url):]
+            return f"[[{number}]]({state.reference_urls[number - 1]})" + trailing
+
+        return LINK_OR_URL.sub(replace, text)
+
+    def _assemble(self, state: _State) -> str:
+        """Join title, table of contents, body and references."""
+        if self.references and state.reference_urls:
+            state.headings.append(_Heading(2, "References", _slugify("References", state.slugs)))
+
+        sections: list[str] = []
+        if state.title is not None:
+            sections.extend([f"# {state.title}", ""])
+        if self.table_of_contents and len(state.headings) >= self.toc_min_headings:
+            sections.extend(self._table_of_contents(state))
+        sections.extend(state.out)
+        if self.references and state.reference_urls:
+            sections.extend(["", "## References", ""])
+            for number, (url, title) in enumerate(zip(state.reference_urls, state.reference_titles), start=1):
+                sections.append(f"{number}. [{title}]({url})" if title and title != url else f"{number}. <{url}>")
+
+        text = re.sub(r"\n{3,}", "\n\n", "\n".join(sections)).strip("\n")
+        return text + "\n" if text else ""
+
+    def _table_of_contents(self, state: _State) -> list[str]:
+        lines = ["## Table of Contents", ""]
+        for heading in state.headings:
+            if heading.level <= self.toc_max_depth:
+                indent = "  " * (heading.level - 2)
+                lines.append(f"{indent}- [{_heading_text(heading.text)}](#{heading.slug})")
+        lines.append("")
+        return lines
@@ -0,0 +1,397 @@
+"""
+Metrics - Prometheus-style instrumentation and JSON-lines event log
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+# USD per million tokens as (input, output)
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+}
+
+
+def _escape_label_value(value: str) -> str:
+    """Escape a label value as the Prometheus text format requires."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """Common state for labelled metrics."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...], lock: threading.Lock):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = labels
+        self._lock = lock
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def _value_samples(self, values: dict[tuple[str, ...], float]) -> list[str]:
+        if not values and not self.label_names:
+            # Unlabelled series are always exported, starting at zero
+            return [f"{self.name} 0.0"]
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {value}"
+            for key, value in sorted(values.items())
+        ]
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> list[str]:
+        return self._value_samples(self._values)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> list[str]:
+        return self._value_samples(self._values)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(*args)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: dict[tuple[str, ...], list[int]] = {}
+        self._sums: dict[tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall-clock duration of the enclosed block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        return sum(self._counts.get(self._key(labels), []))
+
+    def _samples(self) -> list[str]:
+        lines = []
+        for key, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {self._sums[key]}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Process-wide collection of metrics with an optional JSON-lines event log.
+    Metrics are rendered in the Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: dict[str, _Metric] = {}
+        self._event_log_path: str | None = None
+        self._event_log_lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels, threading.Lock()))
+
+    def gauge(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labels, threading.Lock()))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, threading.Lock(), buckets=buckets))
+
+    def render_prometheus(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def configure_event_log(self, path: str | None) -> None:
+        """Enable (or with None, disable) the JSON-lines event log."""
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._event_log_path = path
+
+    def log_event(self, event: str, **fields) -> None:
+        """
+        Append a structured event to the JSON-lines log, if enabled.
+
+        Args:
+            event: Event name
+            **fields: JSON-serializable event attributes
+        """
+        if self._event_log_path is None:
+            return
+        record = {"ts": round(time.time(), 6), "event": event, **fields}
+        line = json.dumps(record, default=str)
+        with self._event_log_lock:
+            with open(self._event_log_path, "a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+
+
+metrics = MetricsRegistry()
+metrics.configure_event_log(os.environ.get("RESEARCH_EVENT_LOG"))
+
+PHASE_LATENCY = metrics.histogram(
+    "research_phase_duration_seconds", "Duration of each research pipeline phase", ("phase",)
+)
+RUN_LATENCY = metrics.histogram(
+    "research_run_duration_seconds", "Duration of complete research runs", ("outcome",)
+)
+RUNS_TOTAL = metrics.counter("research_runs_total", "Research runs by outcome", ("outcome",))
+RUNS_IN_FLIGHT = metrics.gauge("research_runs_in_flight", "Research pipelines currently running")
+REQUESTS_QUEUED = metrics.gauge(
+    "research_requests_queued", "Web requests accepted but not yet receiving pipeline events"
+)
+WEB_REQUESTS = metrics.counter(
+    "research_web_requests_total", "Research requests received by the web interface", ("outcome",)
+)
+ADMISSION_WAIT = metrics.histogram(
+    "research_admission_wait_seconds", "Time research requests waited for admission", ("outcome",)
+)
+ADMISSION_REJECTED = metrics.counter(
+    "research_admission_rejected_total", "Research requests turned away by admission control", ("reason",)
+)
+ADMISSION_QUEUE_DEPTH = metrics.gauge("research_admission_queue_depth", "Research requests waiting for admission")
+ADMISSION_RUNNING = metrics.gauge("research_admission_running", "Research requests admitted and still running")
+RUNS_CANCELLED = metrics.counter(
+    "research_runs_cancelled_total", "Research runs cancelled before finishing", ("reason",)
+)
+PHASES_CANCELLED = metrics.counter(
+    "research_phases_cancelled_total", "Pipeline phases cancelled runs abandoned or never started", ("phase",)
+)
+COALESCED_REQUESTS = metrics.counter(
+    "research_coalesced_requests_total", "Requests attached to an identical in-flight run"
+)
+AGENT_CALL_LATENCY = metrics.histogram(
+    "research_agent_call_duration_seconds", "Duration of agent runs", ("agent",)
+)
+AGENT_CALLS = metrics.counter("research_agent_calls_total", "Agent runs by outcome", ("agent", "outcome"))
+AGENT_TOKENS = metrics.counter(
+    "research_agent_tokens_total", "Tokens used by agent runs", ("agent", "direction")
+)
+AGENT_CONCURRENCY_LIMIT = metrics.gauge(
+    "research_agent_concurrency_limit", "Current adaptive limit on concurrent agent calls"
+)
+AGENT_CALL_RETRIES = metrics.counter(
+    "research_agent_call_retries_total", "Agent call retries by upstream failure", ("reason",)
+)
+AGENT_CIRCUIT_STATE = metrics.gauge(
+    "research_agent_circuit_state", "Agent call circuit breaker state (1 for the current state)", ("state",)
+)
+AGENT_CALLS_REJECTED = metrics.counter(
+    "research_agent_calls_rejected_total", "Agent calls failed fast by the open circuit breaker"
+)
+AGENT_COST = metrics.counter("research_agent_cost_usd_total", "Estimated agent spend in USD", ("agent",))
+SEARCHES_IN_FLIGHT = metrics.gauge("research_searches_in_flight", "Web searches currently running")
+SEARCH_OUTCOMES = metrics.counter(
+    "research_search_outcomes_total", "Web search outcomes, including failures and drops", ("outcome",)
+)
+CACHE_LOOKUPS = metrics.counter(
+    "research_search_cache_lookups_total", "Search cache lookups by result", ("result",)
+)
+COMPRESSION_SENTENCES_DROPPED = metrics.counter(
+    "research_compression_sentences_dropped_total", "Repeated sentences removed from findings before reporting"
+)
+COMPRESSION_TOKENS_SAVED = metrics.counter(
+    "research_compression_tokens_saved_total", "Estimated report prompt tokens saved by findings compression"
+)
+FINDINGS_INDEX_LOOKUPS = metrics.counter(
+    "research_findings_index_lookups_total", "Local findings index lookups by result", ("result",)
+)
+FINDINGS_INDEX_DOCUMENTS = metrics.gauge(
+    "research_findings_index_documents", "Search summaries held in the local findings index"
+)
+FINDINGS_INDEX_BYTES = metrics.gauge("research_findings_index_bytes", "Size of the local findings index database")
+HTTP_REQUESTS_IN_FLIGHT = metrics.gauge(
+    "research_http_requests_in_flight", "OpenAI API requests waiting for response headers"
+)
+HTTP_CONNECTIONS_OPENED = metrics.counter(
+    "research_http_connections_opened_total", "New TCP connections opened to the OpenAI API"
+)
+TLS_HANDSHAKES = metrics.counter("research_tls_handshakes_total", "TLS handshakes with the OpenAI API")
+HTTP_POOL_CONNECTIONS = metrics.gauge(
+    "research_http_pool_connections", "Connections in the shared client pool", ("state",)
+)
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """Estimate the USD cost of a model call from its token usage."""
+    input_price, output_price = MODEL_PRICES.get(str(model), (0.0, 0.0))
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+def record_agent_call(agent_name: str, model: str, seconds: float, usage=None, error: BaseException | None = None) -> None:
+    """
+    Record latency, token usage and cost of one agent run.
+
+    Args:
+        agent_name: Name of the agent that ran
+        model: Model name used for cost estimation
+        seconds: Wall-clock duration of the run
+        usage: The run's agents.Usage, if it completed
+        error: The exception that ended the run, if any; cancellation counts
+            as a cancelled run rather than an error
+    """
+    if error is None:
+        outcome = "success"
+    else:
+        outcome = "cancelled" if isinstance(error, (asyncio.CancelledError, GeneratorExit)) else "error"
+    if not isinstance(model, str):
+        model = getattr(model, "model", type(model).__name__)
+    AGENT_CALL_LATENCY.observe(seconds, agent=agent_name)
+    AGENT_CALLS.inc(agent=agent_name, outcome=outcome)
+
+    input_tokens = getattr(usage, "input_tokens", 0) or 0
+    output_tokens = getattr(usage, "output_tokens", 0) or 0
+    cost = estimate_cost(model, input_tokens, output_tokens)
+    AGENT_TOKENS.inc(input_tokens, agent=agent_name, direction="input")
+    AGENT_TOKENS.inc(output_tokens, agent=agent_name, direction="output")
+    AGENT_COST.inc(cost, agent=agent_name)
+
+    metrics.log_event(
+        "agent_call",
+        agent=agent_name,
+        model=model,
+        seconds=round(seconds, 4),
+        outcome=outcome,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cost_usd=round(cost, 6),
+        error=None if error is None else repr(error),
+    )
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> "ThreadingHTTPServer":
+    """
+    Serve the Prometheus text endpoint at /metrics from a background thread.
+
+    Args:
+        port: Port to listen on
+        host: Interface to bind
+
+    Returns:
+        The running HTTP server
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug("Metrics request: " + format, *args)
+
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info("Serving Prometheus metrics on http://%s:%d/metrics", host, port)
+    return server
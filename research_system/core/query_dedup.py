@@ -0,0 +1,163 @@
+"""
+Query Deduplication - Collapses near-duplicate search queries before fan-out
+"""
+
+import re
+
+from ..agents.search_planner import SearchQuery
+
+
+STOPWORDS = frozenset(
+    """
+    a about an and are as at be by for from how in into is it its of on or over
+    that the their this to what when where which who why with within
+    """.split()
+)
+
+# Words planners use interchangeably when paraphrasing the same search
+SYNONYMS = {
+    "latest": "recent",
+    "newest": "recent",
+    "current": "recent",
+    "new": "recent",
+    "development": "advance",
+    "progress": "advance",
+    "breakthrough": "advance",
+    "innovation": "advance",
+    "improvement": "advance",
+    "effect": "impact",
+    "influence": "impact",
+    "consequence": "impact",
+    "challenge": "problem",
+    "issue": "problem",
+    "limitation": "problem",
+    "usage": "use",
+    "application": "use",
+    "adoption": "use",
+    "outlook": "future",
+    "forecast": "future",
+    "prediction": "future",
+}
+SYNONYM_GROUPS = frozenset(SYNONYMS.values())
+
+
+def _stem(token: str) -> str:
+    """Strip common English suffixes so inflected forms compare equal."""
+    for suffix in ("ies", "ing", "es", "ed", "s"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            if suffix == "ies":
+                return token[:-3] + "y"
+            return token[: -len(suffix)]
+    return token
+
+
+def _canonical_term(token: str) -> str:
+    """Stem a token and map it to the term of its synonym group, if it has one."""
+    stemmed = _stem(token)
+    candidates = [stemmed, token]
+    if token.endswith("es"):
+        # "-es" is stripped before "-s", which cuts plurals like "advances" or "issues" below their entry
+        candidates.insert(0, token[:-1])
+    for candidate in candidates:
+        if candidate in SYNONYMS:
+            return SYNONYMS[candidate]
+        if candidate in SYNONYM_GROUPS:
+            return candidate
+    return stemmed
+
+
+def text_terms(text: str) -> list[str]:
+    """
+    Reduce text to its canonical content terms in order, keeping repeats.
+
+    Args:
+        text: The raw text
+
+    Returns:
+        Stemmed, synonym-normalized terms without stopwords
+    """
+    terms = []
+    for token in re.findall(r"[a-z0-9]+", text.lower()):
+        if token in STOPWORDS:
+            continue
+        terms.append(_canonical_term(token))
+    return terms
+
+
+def query_terms(text: str) -> frozenset[str]:
+    """
+    Reduce query text to a set of canonical content terms.
+
+    Args:
+        text: The raw query text
+
+    Returns:
+        Set of stemmed, synonym-normalized terms without stopwords
+    """
+    return frozenset(text_terms(text))
+
+
+def jaccard_similarity(left: frozenset[str], right: frozenset[str]) -> float:
+    """Token-set Jaccard similarity between two term sets."""
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+class NearDuplicateFilter:
+    """
+    Incrementally filters near-duplicate search queries as they are planned.
+    Used when queries are dispatched one by one, before the full strategy
+    is known. The rationale of a near-duplicate is merged into the accepted
+    query it repeats, so a search not yet started still covers both intents.
+    """
+
+    def __init__(self, threshold: float = 0.6):
+        self.threshold = threshold
+        self.searches_saved = 0
+        self.searches_covered = 0
+        self._seen_queries: set[str] = set()
+        self._kept: list[tuple[frozenset[str], SearchQuery]] = []
+        self._covered_terms: list[frozenset[str]] = []
+
+    def exclude(self, queries: list[str]) -> None:
+        """
+        Treat queries searched by an earlier run as already covered.
+
+        Args:
+            queries: Query texts whose results are already available
+        """
+        for query in queries:
+            self._seen_queries.add(query)
+            self._covered_terms.append(query_terms(query))
+
+    def accept(self, search_item: SearchQuery) -> bool:
+        """
+        Decide whether a query should be searched.
+
+        Args:
+            search_item: The newly planned query
+
+        Returns:
+            True for a new distinct query; False for a query seen before or a
+            near-duplicate of an accepted or excluded one, whose rationale is
+            then merged into the accepted query
+        """
+        if search_item.query in self._seen_queries:
+            return False
+        self._seen_queries.add(search_item.query)
+
+        terms = query_terms(search_item.query)
+        if any(jaccard_similarity(terms, covered) >= self.threshold for covered in self._covered_terms):
+            self.searches_covered += 1
+            return False
+        for kept_terms, kept in self._kept:
+            if jaccard_similarity(terms, kept_terms) >= self.threshold:
+                if search_item.rationale and search_item.rationale not in kept.rationale:
+                    kept.rationale = f"{kept.rationale} {search_item.rationale}".strip()
+                self.searches_saved += 1
+                return False
+
+        self._kept.append((terms, search_item))
+        return True
+
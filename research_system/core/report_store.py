@@ -0,0 +1,247 @@
+"""
+Report Store - Compressed archive of finished research reports with near-match lookup
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+
+from ..agents.report_writer import ResearchReport
+from .query_dedup import jaccard_similarity, query_terms
+from .search_cache import normalize_query
+
+
+DEFAULT_REPORT_STORE_PATH = os.path.join(".research_cache", "reports.sqlite3")
+
+
+def query_hash(query: str) -> str:
+    """Hash of the normalized query text, shared by trivially different spellings."""
+    return hashlib.sha256(normalize_query(query).encode("utf-8")).hexdigest()
+
+
+def _compress(value) -> bytes:
+    return zlib.compress(json.dumps(value).encode("utf-8"), 6)
+
+
+def _decompress(blob: bytes):
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+@dataclass
+class ReportEntry:
+    """A stored report's headline data, read without decompressing the report."""
+    run_id: str
+    query: str
+    created_at: float
+    size_bytes: int
+    # Jaccard similarity to the looked-up query; 1.0 for the same normalized query
+    similarity: float = 1.0
+
+
+@dataclass
+class StoredReport:
+    """A finished report with the markdown shown for it and its run metadata."""
+    run_id: str
+    query: str
+    created_at: float
+    report: ResearchReport
+    formatted: str
+    metadata: dict = field(default_factory=dict)
+
+
+class ReportStore:
+    """
+    Local on-disk archive of finished research reports.
+    Reports, executive summaries and metadata are stored zlib-compressed
+    and indexed by a hash of the normalized query; a near-match lookup on
+    the query terms finds recent reports for reworded questions. Reports
+    are evicted once older than the maximum age, and the oldest ones go
+    first when the archive grows beyond its size bound.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_REPORT_STORE_PATH,
+        max_age_seconds: float = 30 * 24 * 60 * 60,
+        max_bytes: int = 50_000_000,
+        match_threshold: float = 0.8,
+    ):
+        self.path = path
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        self.match_threshold = match_threshold
+        self._lock = threading.Lock()
+        self._connection = self._connect()
+        self.evict()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite database and create the schema if needed."""
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS reports (
+                run_id TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                query_hash TEXT NOT NULL,
+                terms TEXT NOT NULL,
+                summary BLOB NOT NULL,
+                payload BLOB NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_reports_query ON reports (query_hash, created_at)")
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_reports_age ON reports (created_at)")
+        connection.commit()
+        return connection
+
+    def save(
+        self, run_id: str, query: str, report: ResearchReport, formatted: str, metadata: dict | None = None
+    ) -> None:
+        """
+        Archive a finished report, then evict reports beyond the age and size bounds.
+
+        Args:
+            run_id: Identifier of the run that wrote the report
+            query: The research question
+            report: The report as written
+            formatted: The markdown displayed for the report
+            metadata: JSON-compatible details of the run, e.g. its budget plan
+        """
+        summary = zlib.compress(report.executive_summary.encode("utf-8"), 6)
+        payload = _compress({"report": report.model_dump(), "formatted": formatted, "metadata": metadata or {}})
+        with self._lock:
+            self._connection.execute(
+                """
+                INSERT OR REPLACE INTO reports
+                    (run_id, query, query_hash, terms, summary, payload, size_bytes, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    run_id,
+                    query,
+                    query_hash(query),
+                    " ".join(sorted(query_terms(query))),
+                    summary,
+                    payload,
+                    len(summary) + len(payload),
+                    time.time(),
+                ),
+            )
+            self._connection.commit()
+        self.evict()
+
+    def load(self, run_id: str) -> StoredReport | None:
+        """
+        Load and decompress an archived report.
+
+        Returns:
+            The stored report, or None if it was never saved or has been evicted
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT query, created_at, payload FROM reports WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        query, created_at, payload = row
+        data = _decompress(payload)
+        return StoredReport(
+            run_id,
+            query,
+            created_at,
+            ResearchReport.model_validate(data["report"]),
+            data["formatted"],
+            data["metadata"],
+        )
+
+    def executive_summary(self, run_id: str) -> str | None:
+        """Return a stored report's executive summary without decompressing the report."""
+        with self._lock:
+            row = self._connection.execute("SELECT summary FROM reports WHERE run_id = ?", (run_id,)).fetchone()
+        return zlib.decompress(row[0]).decode("utf-8") if row is not None else None
+
+    def find_similar(self, query: str, max_age_seconds: float | None = None) -> ReportEntry | None:
+        """
+        Find the most similar recent report for a query.
+
+        Args:
+            query: The research question about to be researched
+            max_age_seconds: Only consider reports at most this old; defaults to the store's maximum age
+
+        Returns:
+            The newest report of the same normalized query, else the most
+            similar one at or above the match threshold, else None
+        """
+        cutoff = time.time() - (max_age_seconds if max_age_seconds is not None else self.max_age_seconds)
+        with self._lock:
+            exact = self._connection.execute(
+                """
+                SELECT run_id, query, created_at, size_bytes FROM reports
+                WHERE query_hash = ? AND created_at >= ? ORDER BY created_at DESC LIMIT 1
+                """,
+                (query_hash(query), cutoff),
+            ).fetchone()
+            if exact is not None:
+                return ReportEntry(*exact)
+            rows = self._connection.execute(
+                """
+                SELECT run_id, query, created_at, size_bytes, terms FROM reports
+                WHERE created_at >= ? ORDER BY created_at DESC
+                """,
+                (cutoff,),
+            ).fetchall()
+
+        terms = query_terms(query)
+        best: ReportEntry | None = None
+        for run_id, stored_query, created_at, size_bytes, stored_terms in rows:
+            similarity = jaccard_similarity(terms, frozenset(stored_terms.split()))
+            if similarity >= self.match_threshold and (best is None or similarity > best.similarity):
+                best = ReportEntry(run_id, stored_query, created_at, size_bytes, similarity)
+        return best
+
+    def history(self, limit: int = 50) -> list[ReportEntry]:
+        """List the most recent archived reports, newest first."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT run_id, query, created_at, size_bytes FROM reports ORDER BY created_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [ReportEntry(*row) for row in rows]
+
+    def evict(self) -> int:
+        """
+        Delete reports older than the maximum age, then the oldest ones beyond the size bound.
+
+        Returns:
+            Number of reports deleted
+        """
+        with self._lock:
+            removed = self._connection.execute(
+                "DELETE FROM reports WHERE created_at < ?", (time.time() - self.max_age_seconds,)
+            ).rowcount
+            total = 0
+            overflow = []
+            for run_id, size_bytes in self._connection.execute(
+                "SELECT run_id, size_bytes FROM reports ORDER BY created_at DESC"
+            ).fetchall():
+                total += size_bytes
+                if total > self.max_bytes:
+                    overflow.append((run_id,))
+            self._connection.executemany("DELETE FROM reports WHERE run_id = ?", overflow)
+            self._connection.commit()
+        return removed + len(overflow)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._connection.close()
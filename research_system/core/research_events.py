@@ -0,0 +1,34 @@
+"""
+Research Events - Typed progress events emitted by the research workflow
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+
+
+# Pipeline phases in the order a run goes through them
+PHASES = ("planning", "searching", "reporting", "formatting")
+
+
+class EventKind(str, Enum):
+    """Kinds of events produced while a research run progresses."""
+    QUEUE = "queue"
+    RUN = "run"
+    TRACE = "trace"
+    PROGRESS = "progress"
+    REPORT_DELTA = "report_delta"
+    REPORT = "report"
+
+
+@dataclass
+class ResearchEvent:
+    """
+    A single update from the research workflow.
+    QUEUE events carry a request's place while it waits for admission,
+    the RUN event carries the run ID, REPORT_DELTA events carry the report
+    markdown generated so far, and the REPORT event carries the final
+    formatted report.
+    """
+    kind: EventKind
+    message: str
+    phase: str | None = None
@@ -3,13 +3,55 @@ Research Orchestrator - Coordinates the entire research workflow
 """
 
 import asyncio
-from typing import AsyncGenerator
-from agents import Runner, trace, gen_trace_id
+import contextlib
+import functools
+import logging
+import time
+from dataclasses import asdict
+from typing import TYPE_CHECKING, AsyncGenerator, Awaitable, Callable
+from pydantic import ValidationError
 
-from ..agents.search_planner import SearchPlanner, SearchStrategy
+from ..agents.search_planner import SearchPlanner, SearchQuery, SearchStrategy
 from ..agents.web_researcher import WebResearcher
 from ..agents.report_writer import ReportWriter, ResearchReport
 from ..agents.notification_sender import ReportFormatter
+from ..agents.findings_summarizer import FindingsSummarizer
+from ..agents.base_agent import BaseAgent
+from ..agents.registry import shared_agent
+from .budget import BudgetPlanner, ExecutionPlan, PhaseStats, ResearchBudget, agent_variant, resolve_budget
+from .call_control import AgentCallController, CircuitOpenError
+from .compression import FindingsCompressor
+from .http_client import PoolStats, shared_client
+from .metrics import (
+    COALESCED_REQUESTS,
+    PHASE_LATENCY,
+    PHASES_CANCELLED,
+    RUN_LATENCY,
+    RUNS_IN_FLIGHT,
+    RUNS_TOTAL,
+    SEARCH_OUTCOMES,
+    SEARCHES_IN_FLIGHT,
+    metrics,
+    record_agent_call,
+)
+from .query_dedup import NearDuplicateFilter
+from .report_store import ReportStore
+from .research_events import PHASES, EventKind, ResearchEvent
+from .run_store import RunCheckpoint, RunStore, new_run_id
+from .findings_index import FindingsIndex
+from .search_cache import SearchCache, agent_fingerprint, normalize_query
+from .search_fanout import FanOutPolicy, FanOutReport, LatencyTracker, SearchFanOut
+from .session_recording import SessionRecorder, SessionReplay
+from .single_flight import SingleFlight
+from .stream_parsing import PartialObjectArray, PartialStringField
+from .synthesis import SynthesisEngine
+from .task_queue import REPORT_TASK, SEARCH_TASK, InProcessBackend, TaskBackend
+
+if TYPE_CHECKING:
+    from agents import Agent, RunResult, RunResultStreaming
+
+
+logger = logging.getLogger(__name__)
 
 
 class ResearchOrchestrator:
@@ -18,115 +60,866 @@ class ResearchOrchestrator:
     Manages the entire process from query planning to final report display.
     """
 
-    def __init__(self):
-        self.search_planner = SearchPlanner()
-        self.web_researcher = WebResearcher()
-        self.report_writer = ReportWriter()
-        self.report_formatter = ReportFormatter()
+    def __init__(
+        self,
+        search_cache: SearchCache | None = None,
+        dedup_threshold: float = 0.6,
+        fanout_policy: FanOutPolicy | None = None,
+        synthesis_token_budget: int = 6000,
+        coalesce_requests: bool = True,
+        coalesce_searches: bool = False,
+        agent_call_limit: int | None = None,
+        run_store: RunStore | None = None,
+        llm_formatting: bool = False,
+        shared_agents: bool = True,
+        task_backend: TaskBackend | None = None,
+        findings_index: FindingsIndex | None = None,
+        findings_compressor: FindingsCompressor | None = None,
+        report_store: ReportStore | None = None,
+        recorder: SessionRecorder | None = None,
+        replay: SessionReplay | None = None,
+    ):
+        # Agents are shared process-wide unless an orchestrator needs private ones to modify
+        create = shared_agent if shared_agents else lambda agent_class, **options: agent_class(**options)
+        self.search_planner = create(SearchPlanner)
+        self.web_researcher = create(WebResearcher)
+        self.report_writer = create(ReportWriter)
+        self.report_formatter = create(ReportFormatter, use_llm=llm_formatting)
+        self.findings_summarizer = create(FindingsSummarizer)
+        self.search_cache = search_cache if search_cache is not None else SearchCache()
+        # Past search summaries that can answer similar searches without the web
+        self.findings_index = findings_index if findings_index is not None else FindingsIndex()
+        # Compaction of the findings index running in a worker thread, if any
+        self._index_compaction: asyncio.Task | None = None
+        self.run_store = run_store if run_store is not None else RunStore()
+        # Finished reports, kept compressed for history and reuse by similar queries
+        self.report_store = report_store if report_store is not None else ReportStore()
+        self.dedup_threshold = dedup_threshold
+        self.fanout_policy = fanout_policy if fanout_policy is not None else FanOutPolicy()
+        self.search_latency = LatencyTracker()
+        self.phase_stats = PhaseStats()
+        self.budget_planner = BudgetPlanner(self.phase_stats)
+        # Agents cloned with the models and search context chosen by budget plans
+        self._agent_variants: dict[tuple[str, str, str | None], "Agent"] = {}
+        self.synthesis = SynthesisEngine(self._summarize_findings, synthesis_token_budget)
+        # Removes sentences repeated across search summaries before synthesis
+        self.findings_compressor = findings_compressor if findings_compressor is not None else FindingsCompressor()
+        self.coalesce_requests = coalesce_requests
+        self.coalesce_searches = coalesce_searches
+        # Report deltas carry the whole report so far, so a shared run only buffers the latest
+        self._inflight_runs: SingleFlight[ResearchEvent] = SingleFlight(
+            cumulative=lambda event: event.kind == EventKind.REPORT_DELTA
+        )
+        self._inflight_searches: SingleFlight[str | None] = SingleFlight()
+        # Adaptively bounds concurrent agent runs across every query handled by this
+        # orchestrator, retrying and failing fast on upstream errors
+        self.agent_calls = AgentCallController(max_concurrency=agent_call_limit or 64)
+        # Web searches and report writing run wherever the task backend sends them
+        self.task_backend = task_backend if task_backend is not None else InProcessBackend()
+        self.task_backend.bind(self.execute_task)
+        # Captures every agent call for offline replay
+        self.recorder = recorder
+        # Serves agent calls from a recorded session instead of the OpenAI API
+        self.replay = replay
 
-    async def execute_research(self, query: str) -> AsyncGenerator[str, None]:
+    async def execute_research(
+        self, query: str, budget: ResearchBudget | str | None = None
+    ) -> AsyncGenerator[str, None]:
         """
         Execute the complete research process for a given query.
         
         Args:
             query: The research question to investigate
+            budget: Latency/cost budget or preset name ("fast", "deep"), or None
+                for the default agents
+            
+        Yields:
+            Status updates throughout the process, followed by the final report
+        """
+        async for event in self.stream_research(query, budget=budget):
+            if event.kind == EventKind.RUN:
+                yield f"🆔 Run ID: {event.message}"
+            elif event.kind != EventKind.REPORT_DELTA:
+                yield event.message
+
+    async def stream_research(
+        self,
+        query: str,
+        run_id: str | None = None,
+        follow_up_of: str | None = None,
+        budget: ResearchBudget | str | None = None,
+    ) -> AsyncGenerator[ResearchEvent, None]:
+        """
+        Execute the research process, emitting typed events as they happen.
+        
+        Every phase output is checkpointed under the run ID, so calling this
+        again with the ID of a failed run resumes at its first incomplete phase
+        without repeating completed searches.
+        
+        A follow-up run builds on an earlier run: only searches not already
+        covered by the earlier strategies are planned, and the report is
+        written from the earlier findings together with the new ones.
+        
+        A budget makes the run choose its number of searches, search context
+        size and per-phase models from recently observed phase latencies.
+        
+        Identical queries already in flight are coalesced: the caller attaches
+        to the running pipeline and receives its full event stream instead of
+        starting new agent runs.
+        
+        Closing the event stream or cancelling the task iterating it cancels
+        the run, its searches and every agent call in flight, unless other
+        coalesced callers are still listening. A cancelled new run leaves no
+        checkpoint behind; a cancelled resumed run keeps its checkpoint.
+        
+        Args:
+            query: The research question to investigate
+            run_id: ID of a previous run to resume, or None to start a new run
+            follow_up_of: ID of an earlier run this query follows up on
+            budget: Latency/cost budget or preset name ("fast", "deep"), or None
+                for the default agents
+            
+        Raises:
+            ValueError: If the budget preset name is unknown
             
         Yields:
-            Status updates throughout the process
+            The run ID, progress events, partial report markdown while the
+            report is being written, and finally the formatted report
+        """
+        budget = resolve_budget(budget)
+        discard_on_cancel = run_id is None
+        if run_id is None:
+            run_id = new_run_id()
+            coalesce_key = normalize_query(query).rstrip("?!. ")
+            if follow_up_of is not None:
+                coalesce_key += f"\nfollow-up:{follow_up_of}"
+            if budget is not None:
+                coalesce_key += f"\nbudget:{budget}"
+        else:
+            coalesce_key = f"run:{run_id}"
+        
+        if not self.coalesce_requests:
+            async with contextlib.aclosing(
+                self._run_pipeline(query, run_id, follow_up_of, budget, discard_on_cancel)
+            ) as events:
+                async for event in events:
+                    yield event
+            return
+        
+        events, started = self._inflight_runs.stream(
+            coalesce_key, lambda: self._run_pipeline(query, run_id, follow_up_of, budget, discard_on_cancel)
+        )
+        async with contextlib.aclosing(events):
+            if not started:
+                logger.info("Coalescing request with in-flight research for: %s", query)
+                COALESCED_REQUESTS.inc()
+                yield ResearchEvent(EventKind.PROGRESS, "🔗 Joined identical research already in progress")
+            async for event in events:
+                yield event
+
+    async def _run_pipeline(
+        self,
+        query: str,
+        run_id: str,
+        follow_up_of: str | None = None,
+        budget: ResearchBudget | None = None,
+        discard_on_cancel: bool = False,
+    ) -> AsyncGenerator[ResearchEvent, None]:
+        """Run the pipeline for a query, recording run-level metrics and cleaning up after cancellation."""
+        started = time.perf_counter()
+        outcome = "error"
+        phase = None
+        RUNS_IN_FLIGHT.inc()
+        metrics.log_event("run_started", query=query, run_id=run_id, follow_up_of=follow_up_of)
+        try:
+            async with contextlib.aclosing(self._run_phases(query, run_id, follow_up_of, budget)) as events:
+                async for event in events:
+                    phase = event.phase or phase
+                    yield event
+            outcome = "success"
+        except (asyncio.CancelledError, GeneratorExit):
+            outcome = "cancelled"
+            self._discard_cancelled_run(run_id, phase, discard_on_cancel)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            RUNS_IN_FLIGHT.dec()
+            RUNS_TOTAL.inc(outcome=outcome)
+            RUN_LATENCY.observe(elapsed, outcome=outcome)
+            metrics.log_event(
+                "run_finished", query=query, run_id=run_id, outcome=outcome, seconds=round(elapsed, 4)
+            )
+
+    def _discard_cancelled_run(self, run_id: str, phase: str | None, delete_checkpoint: bool) -> None:
         """
+        Record the work a cancelled run no longer does and remove its partial checkpoint.
+        
+        Completed searches stay in the search cache and findings index, so a
+        later run of the same query does not repeat them.
+        """
+        skipped = PHASES[PHASES.index(phase):] if phase is not None else PHASES
+        for skipped_phase in skipped:
+            PHASES_CANCELLED.inc(phase=skipped_phase)
+        if delete_checkpoint:
+            self.run_store.delete(run_id)
+        logger.info("Research run %s cancelled during %s", run_id, phase or "startup")
+        metrics.log_event("run_cancelled", run_id=run_id, phase=phase, skipped_phases=list(skipped))
+
+    def _record_phase(self, phase: str, started: float, agent: "Agent | None" = None) -> float:
+        """
+        Record the duration of a finished phase and return the current time.
+        
+        The duration also feeds the budget planner's statistics for the agent
+        variant that did the phase's work, if any agent ran.
+        """
+        now = time.perf_counter()
+        PHASE_LATENCY.observe(now - started, phase=phase)
+        if agent is not None:
+            self.phase_stats.record(phase, agent_variant(agent), now - started)
+        metrics.log_event("phase_finished", phase=phase, seconds=round(now - started, 4))
+        return now
+
+    async def _run_phases(
+        self,
+        query: str,
+        run_id: str,
+        follow_up_of: str | None = None,
+        budget: ResearchBudget | None = None,
+    ) -> AsyncGenerator[ResearchEvent, None]:
+        """Run the planner, search, report and formatting phases for a query, skipping checkpointed work."""
+        from agents import gen_trace_id, trace
+        
+        prior_runs = self._load_prior_runs(follow_up_of) if follow_up_of is not None else []
+        checkpoint = self.run_store.open_run(run_id, query, parent_run_id=follow_up_of)
+        if not prior_runs and checkpoint.parent_run_id is not None:
+            prior_runs = self._load_prior_runs(checkpoint.parent_run_id)
         trace_id = gen_trace_id()
         
-        with trace("Research Execution Trace", trace_id=trace_id):
+        with trace("Research Execution Trace", trace_id=trace_id), contextlib.ExitStack() as cleanup:
+            yield ResearchEvent(EventKind.RUN, run_id)
             # Log trace URL
             trace_url = f"https://platform.openai.com/traces/trace?trace_id={trace_id}"
-            yield f"🔍 Research Trace: {trace_url}"
+            yield ResearchEvent(EventKind.TRACE, f"🔍 Research Trace: {trace_url}")
             
-            # Phase 1: Plan research strategy
-            yield "📋 Planning research strategy..."
-            search_strategy = await self._create_search_strategy(query)
-            yield f"✅ Strategy planned: {len(search_strategy.search_queries)} search queries identified"
+            # Phase 1: Plan research strategy, dispatching each search as soon as it is planned
+            yield ResearchEvent(EventKind.PROGRESS, "📋 Planning research strategy...", "planning")
+            phase_started = time.perf_counter()
+            plan = None
+            if budget is not None:
+                plan = self.budget_planner.plan(budget, llm_formatting=self.report_formatter.use_llm)
+                metrics.log_event("budget_plan", run_id=run_id, budget=str(budget), plan=plan.describe())
+                yield ResearchEvent(EventKind.PROGRESS, f"⏱️ Budget plan: {plan.describe()}", "planning")
+            fanout = SearchFanOut(
+                self._checkpointed(run_id, functools.partial(self._execute_single_search, plan=plan)),
+                self.fanout_policy if plan is None else plan.fanout_policy(self.fanout_policy),
+                self.search_latency,
+                hedge_search=self._checkpointed(run_id, functools.partial(self._dispatch_search, plan=plan)),
+            )
+            # Searches still running when the run ends early, e.g. because it was cancelled, are stopped
+            cleanup.callback(fanout.cancel)
+            dedup = NearDuplicateFilter(self.dedup_threshold)
+            accepted_searches: list[str] = []
+            capped_searches: set[str] = set()
+            restored_results: list[str] = []
+            prior_findings: list[str] = []
+            for prior in prior_runs:
+                dedup.exclude([search_item.query for search_item in prior.strategy.search_queries])
+                prior_findings.extend(prior.search_results.values())
+            if prior_runs:
+                yield ResearchEvent(
+                    EventKind.PROGRESS,
+                    f"🔁 Following up on run {prior_runs[0].run_id}: "
+                    f"{len(prior_findings)} earlier findings available",
+                    "planning",
+                )
+            
+            def dispatch(search_item: SearchQuery) -> None:
+                if plan is not None and len(accepted_searches) >= plan.max_searches:
+                    if search_item.query not in accepted_searches:
+                        capped_searches.add(search_item.query)
+                    return
+                if not dedup.accept(search_item):
+                    return
+                accepted_searches.append(search_item.query)
+                if search_item.query in checkpoint.search_results:
+                    restored_results.append(checkpoint.search_results[search_item.query])
+                elif checkpoint.report is None:
+                    # A saved report is reused as is, so searches that failed before would be wasted
+                    logger.info("Dispatching search: %s", search_item.query)
+                    fanout.submit(search_item)
+            
+            planner_agent = None
+            if checkpoint.strategy is not None:
+                search_strategy = checkpoint.strategy
+            else:
+                planner_agent = self._agent_for(self.search_planner, "planning", plan)
+                try:
+                    search_strategy = await self._create_search_strategy(
+                        query, on_query=dispatch, prior_runs=prior_runs, plan=plan
+                    )
+                except BaseException:
+                    fanout.cancel()
+                    raise
+                self.run_store.save_strategy(run_id, search_strategy)
+            # Dispatch anything the incremental parser missed, or the restored strategy
+            for search_item in search_strategy.search_queries:
+                dispatch(search_item)
+            phase_started = self._record_phase("planning", phase_started, planner_agent)
+            yield ResearchEvent(
+                EventKind.PROGRESS,
+                f"✅ Strategy planned: {len(search_strategy.search_queries)} search queries identified",
+                "planning",
+            )
+            
+            if checkpoint.strategy is not None:
+                yield ResearchEvent(EventKind.PROGRESS, self._describe_resume(checkpoint, restored_results), "planning")
             
-            # Phase 2: Execute web searches
-            yield "🌐 Executing web searches..."
-            search_results = await self._conduct_web_research(search_strategy)
-            yield f"✅ Research complete: {len(search_results)} sources analyzed"
+            if dedup.searches_covered:
+                yield ResearchEvent(
+                    EventKind.PROGRESS,
+                    f"✅ Skipped {dedup.searches_covered} searches already covered by earlier research",
+                    "planning",
+                )
+            
+            if dedup.searches_saved:
+                yield ResearchEvent(
+                    EventKind.PROGRESS,
+                    f"✅ Merged near-duplicate queries: {dedup.searches_saved} searches saved",
+                    "planning",
+                )
+            
+            if capped_searches:
+                yield ResearchEvent(
+                    EventKind.PROGRESS,
+                    f"⏱️ Budget limited research to {plan.max_searches} searches: {len(capped_searches)} skipped",
+                    "planning",
+                )
+            
+            # Phase 2: Collect web search results
+            yield ResearchEvent(EventKind.PROGRESS, "🌐 Executing web searches...", "searching")
+            fanout_report = await self._conduct_web_research(fanout)
+            phase_started = self._record_phase("searching", phase_started)
+            # New findings lead so they survive if synthesis has to condense
+            search_results = restored_results + fanout_report.results + prior_findings
+            yield ResearchEvent(
+                EventKind.PROGRESS,
+                f"✅ Research complete: {len(search_results)} sources analyzed ({fanout_report.describe()})",
+                "searching",
+            )
             
-            # Phase 3: Generate comprehensive report
-            yield "📝 Generating comprehensive report..."
-            research_report = await self._generate_research_report(query, search_results)
-            yield "✅ Report generated successfully"
+            # Phase 3: Generate comprehensive report, streaming it as it is written
+            yield ResearchEvent(EventKind.PROGRESS, "📝 Generating comprehensive report...", "reporting")
+            research_report = checkpoint.report
+            writer_agent = None
+            if research_report is None:
+                writer_agent = self._agent_for(self.report_writer, "reporting", plan)
+                synthesis = self.synthesis
+                if plan is not None:
+                    synthesis = SynthesisEngine(
+                        functools.partial(self._summarize_findings, plan=plan),
+                        self.synthesis.token_budget,
+                        self.synthesis.max_rounds,
+                    )
+                findings, compression = self.findings_compressor.compress(search_results)
+                logger.info("Findings compression %s in %.1f ms", compression.describe(), compression.seconds * 1000)
+                if compression.duplicates:
+                    yield ResearchEvent(
+                        EventKind.PROGRESS, f"🧹 Compressed findings: {compression.describe()}", "reporting"
+                    )
+                research_data, synthesis_rounds = await synthesis.prepare(query, findings)
+                if synthesis_rounds:
+                    yield ResearchEvent(
+                        EventKind.PROGRESS,
+                        f"✅ Condensed findings in {synthesis_rounds} synthesis round(s)",
+                        "reporting",
+                    )
+                report_query = query
+                if prior_runs:
+                    report_query += f"\n(Follow-up to earlier research on: {prior_runs[0].query})"
+                async for update in self._dispatch_report(report_query, research_data, plan):
+                    if isinstance(update, ResearchReport):
+                        research_report = update
+                    else:
+                        yield ResearchEvent(EventKind.REPORT_DELTA, update, "reporting")
+                self.run_store.save_report(run_id, research_report)
+            phase_started = self._record_phase("reporting", phase_started, writer_agent)
+            yield ResearchEvent(EventKind.PROGRESS, "✅ Report generated successfully", "reporting")
             
             # Phase 4: Format report for display
-            yield "📄 Formatting report for display..."
-            formatted_report = self.report_formatter.format_report_for_display(research_report.markdown_content)
-            yield "✅ Report formatted and ready for display"
+            yield ResearchEvent(EventKind.PROGRESS, "📄 Formatting report for display...", "formatting")
+            formatted_report = await self._format_report(research_report.markdown_content, plan)
+            self._record_phase(
+                "formatting",
+                phase_started,
+                self._agent_for(self.report_formatter, "formatting", plan) if self.report_formatter.use_llm else None,
+            )
+            yield ResearchEvent(EventKind.PROGRESS, "✅ Report formatted and ready for display", "formatting")
+            self.report_store.save(
+                run_id,
+                query,
+                research_report,
+                formatted_report,
+                {
+                    "follow_up_of": checkpoint.parent_run_id,
+                    "sources": len(search_results),
+                    # Lets a follow-up plan around these searches once the run checkpoint has expired
+                    "searches": [search_item.query for search_item in search_strategy.search_queries],
+                    "budget_plan": plan.describe() if plan is not None else None,
+                },
+            )
             
             # Return final report
-            yield "🎉 Research process completed!"
-            yield formatted_report
+            yield ResearchEvent(EventKind.PROGRESS, "🎉 Research process completed!")
+            yield ResearchEvent(EventKind.REPORT, formatted_report)
 
-    async def _create_search_strategy(self, query: str) -> SearchStrategy:
-        """Create an optimized search strategy for the research query."""
-        print(f"Creating search strategy for: {query}")
+    async def _format_report(self, markdown: str, plan: ExecutionPlan | None = None) -> str:
+        """Normalize the report locally, letting the formatter agent rewrite it first when opted in."""
+        if self.report_formatter.use_llm:
+            try:
+                result = await self._run_agent(self._agent_for(self.report_formatter, "formatting", plan), markdown)
+                markdown = str(result.final_output)
+            except Exception as e:
+                logger.warning("LLM formatting failed, using local formatting only: %s", e)
+        return self.report_formatter.format_report_for_display(markdown)
+
+    def _load_prior_runs(self, run_id: str) -> list[RunCheckpoint]:
+        """
+        Load the run a follow-up builds on, together with the runs it followed up on.
         
-        result = await Runner.run(
-            self.search_planner.agent,
-            f"Research Query: {query}"
+        Report history outlives run checkpoints, so a run whose checkpoint has
+        expired is rebuilt from its archived report: the report stands in for
+        its findings and its searches are taken from the report metadata.
+        
+        Raises:
+            ValueError: If the run is unknown or never got as far as planning
+        """
+        prior_runs = [prior for prior in self.run_store.load_lineage(run_id) if prior.strategy is not None]
+        if prior_runs and prior_runs[0].run_id == run_id:
+            return prior_runs
+        
+        stored = self.report_store.load(run_id)
+        if stored is None:
+            raise ValueError(f"Run {run_id} has no saved research to follow up on")
+        logger.info("Following up on run %s from its archived report", run_id)
+        searches = [
+            SearchQuery(query=search, rationale="Searched by the earlier research")
+            for search in stored.metadata.get("searches", [])
+        ]
+        return [
+            RunCheckpoint(
+                run_id,
+                stored.query,
+                # Archived searches need not satisfy the planner's bounds on a strategy
+                strategy=SearchStrategy.model_construct(search_queries=searches),
+                search_results={stored.query: stored.report.markdown_content},
+                report=stored.report,
+            )
+        ]
+
+    def _describe_resume(self, checkpoint: RunCheckpoint, restored_results: list[str]) -> str:
+        """Describe what a resumed run restored from its checkpoint."""
+        if checkpoint.report is not None:
+            return f"♻️ Resumed run {checkpoint.run_id}: strategy, searches and report restored"
+        return (
+            f"♻️ Resumed run {checkpoint.run_id}: strategy and "
+            f"{len(restored_results)} completed searches restored"
         )
+
+    def _checkpointed(
+        self, run_id: str, search: Callable[[SearchQuery], Awaitable[str | None]]
+    ) -> Callable[[SearchQuery], Awaitable[str | None]]:
+        """Wrap a search so each successful result is saved to the run checkpoint as it completes."""
+        async def search_and_save(search_item: SearchQuery) -> str | None:
+            summary = await search(search_item)
+            if summary is not None:
+                self.run_store.save_search(run_id, search_item.query, summary)
+            return summary
+        
+        return search_and_save
+
+    async def _create_search_strategy(
+        self,
+        query: str,
+        on_query: Callable[[SearchQuery], None] | None = None,
+        prior_runs: list[RunCheckpoint] | None = None,
+        plan: ExecutionPlan | None = None,
+    ) -> SearchStrategy:
+        """
+        Create an optimized search strategy for the research query.
+        
+        The planner output is streamed and each search query is handed to
+        on_query as soon as it is complete, so searches can start while the
+        rest of the strategy is still being generated.
+        
+        Args:
+            query: The research question to investigate
+            on_query: Called with each search query as soon as it is parsed
+            prior_runs: Earlier runs a follow-up builds on, nearest first
+            plan: Budget plan limiting the number of searches and choosing the model
+            
+        Returns:
+            The validated search strategy
+        """
+        logger.info("Creating search strategy for: %s", query)
+        
+        result = None
+        queries_field = PartialObjectArray("search_queries")
+        planner_input = f"Research Query: {query}"
+        if prior_runs:
+            planner_input += "\n\n" + self._describe_prior_research(prior_runs)
+        if plan is not None:
+            planner_input += f"\n\nSearch budget: plan no more than {plan.max_searches} search queries."
+        planner_agent = self._agent_for(self.search_planner, "planning", plan)
+        async for update in self._stream_agent(planner_agent, planner_input):
+            if not isinstance(update, str):
+                result = update
+                continue
+            for planned in queries_field.feed(update):
+                if on_query is not None:
+                    try:
+                        on_query(SearchQuery.model_validate(planned))
+                    except ValidationError:
+                        continue
         
         strategy = result.final_output_as(SearchStrategy)
-        print(f"Planned {len(strategy.search_queries)} search queries")
+        logger.info("Planned %d search queries", len(strategy.search_queries))
         return strategy
 
-    async def _conduct_web_research(self, strategy: SearchStrategy) -> list[str]:
-        """Execute all planned web searches and collect results."""
-        print("Starting web research...")
+    def _describe_prior_research(self, prior_runs: list[RunCheckpoint]) -> str:
+        """Tell the planner what earlier runs already searched and suggested."""
+        lines = [f"This is a follow-up to earlier research on: {prior_runs[0].query}", "Searches already performed:"]
+        for prior in prior_runs:
+            lines.extend(f"- {search_item.query}" for search_item in prior.strategy.search_queries)
+        directions = prior_runs[0].report.future_research_directions if prior_runs[0].report else []
+        if directions:
+            lines.append("Suggested directions from the earlier report:")
+            lines.extend(f"- {direction}" for direction in directions)
+        lines.append("Plan only the additional searches needed to answer the follow-up question.")
+        return "\n".join(lines)
+
+    async def _conduct_web_research(self, fanout: SearchFanOut) -> FanOutReport:
+        """Collect the dispatched web searches under the fan-out policy."""
+        logger.info("Collecting web research results...")
         
-        # Create concurrent search tasks
-        search_tasks = [
-            asyncio.create_task(self._execute_single_search(search_item))
-            for search_item in strategy.search_queries
-        ]
+        report = await fanout.gather()
         
-        results = []
-        completed_count = 0
+        logger.info("Web research completed with %d successful results", len(report.results))
+        SEARCH_OUTCOMES.inc(len(report.results), outcome="success")
+        SEARCH_OUTCOMES.inc(len(report.failed), outcome="failed")
+        SEARCH_OUTCOMES.inc(len(report.hedged), outcome="hedged")
+        for dropped_query, reason in report.dropped.items():
+            logger.warning("Dropped search '%s': %s", dropped_query, reason)
+            SEARCH_OUTCOMES.inc(outcome=f"dropped: {reason}")
+        stats = self.search_cache.stats
+        logger.info(
+            "Search cache: %d hits, %d misses (%.0f%% hit rate)", stats.hits, stats.misses, stats.hit_rate * 100
+        )
+        index_stats = await asyncio.to_thread(self.findings_index.refresh_stats)
+        logger.info(
+            "Findings index: %d local hits in %d lookups (%.0f%%), %d summaries, %.1f MB",
+            index_stats.local_hits,
+            index_stats.lookups,
+            index_stats.local_hit_ratio * 100,
+            index_stats.documents,
+            index_stats.size_bytes / 1e6,
+        )
+        return report
+
+    async def _execute_single_search(self, search_item: SearchQuery, plan: ExecutionPlan | None = None) -> str | None:
+        """Execute a single web search query, sharing identical searches already in flight."""
+        if not self.coalesce_searches:
+            return await self._dispatch_search(search_item, plan)
         
-        # Process results as they complete
-        for task in asyncio.as_completed(search_tasks):
-            result = await task
-            if result:
-                results.append(result)
-            completed_count += 1
-            print(f"Research progress: {completed_count}/{len(search_tasks)} queries completed")
+        variant = agent_variant(self._agent_for(self.web_researcher, "searching", plan))
+        return await self._inflight_searches.call(
+            f"{normalize_query(search_item.query)}\n{variant}", lambda: self._dispatch_search(search_item, plan)
+        )
+
+    async def _dispatch_search(self, search_item: SearchQuery, plan: ExecutionPlan | None = None) -> str | None:
+        """
+        Run a web search on the task backend.
         
-        print(f"Web research completed with {len(results)} successful results")
-        return results
+        The duration of a live search is recorded here rather than where it
+        ran, so hedging and budget planning see searches run by workers, and
+        searches answered from the cache or past findings do not drag the
+        observed latencies towards zero.
+        """
+        payload = {"search": search_item.model_dump(), "plan": asdict(plan) if plan is not None else None}
+        async for message in self.task_backend.stream(SEARCH_TASK, payload):
+            if message["type"] == "result":
+                if message.get("live"):
+                    variant = agent_variant(self._agent_for(self.web_researcher, "searching", plan))
+                    self.phase_stats.record("searching", variant, message["seconds"])
+                    self.search_latency.record(message["seconds"])
+                return message["data"]
+        return None
+
+    async def _dispatch_report(
+        self, query: str, research_data: str, plan: ExecutionPlan | None = None
+    ) -> AsyncGenerator[str | ResearchReport, None]:
+        """
+        Write the research report on the task backend, streaming it back as it is written.
+        
+        Yields:
+            The report markdown written so far after each received chunk, and
+            finally the validated ResearchReport
+        """
+        payload = {"query": query, "research_data": research_data, "plan": asdict(plan) if plan is not None else None}
+        markdown = ""
+        async for message in self.task_backend.stream(REPORT_TASK, payload):
+            if message["type"] == "delta":
+                markdown += message["data"]
+                yield markdown
+            elif message["type"] == "restart":
+                # A worker died mid-report; the new attempt streams from the beginning
+                markdown = ""
+            else:
+                yield ResearchReport.model_validate(message["data"])
+
+    async def execute_task(self, kind: str, payload: dict) -> AsyncGenerator[dict, None]:
+        """
+        Run a search or report task in this process, e.g. on behalf of a queue worker.
+        
+        Args:
+            kind: SEARCH_TASK or REPORT_TASK
+            payload: Task arguments as produced by the dispatching orchestrator
+            
+        Yields:
+            Report text deltas and finally the task result, as task queue messages
+            
+        Raises:
+            ValueError: If the task kind is unknown
+        """
+        plan = ExecutionPlan(**payload["plan"]) if payload.get("plan") else None
+        if kind == SEARCH_TASK:
+            summary, seconds = await self._run_search(SearchQuery.model_validate(payload["search"]), plan)
+            yield {"type": "result", "data": summary, "live": seconds is not None, "seconds": seconds}
+        elif kind == REPORT_TASK:
+            sent = 0
+            async for update in self._stream_research_report(payload["query"], payload["research_data"], plan):
+                if isinstance(update, ResearchReport):
+                    yield {"type": "result", "data": update.model_dump()}
+                else:
+                    yield {"type": "delta", "data": update[sent:]}
+                    sent = len(update)
+        else:
+            raise ValueError(f"Unknown task kind: {kind}")
+
+    async def _run_search(
+        self, search_item: SearchQuery, plan: ExecutionPlan | None = None
+    ) -> tuple[str | None, float | None]:
+        """
+        Run a web search query, serving repeated queries from the cache and similar ones from past findings.
+        
+        Returns:
+            Tuple of (summary, or None if the search failed; seconds the web
+            researcher took, or None unless it ran and succeeded)
+        """
+        researcher_agent = self._agent_for(self.web_researcher, "searching", plan)
+        cache_key = self.search_cache.make_key(search_item.query, agent_fingerprint(researcher_agent))
+        cached_summary = self.search_cache.get(cache_key)
+        if cached_summary is not None:
+            logger.info("Search cache hit for '%s'", search_item.query)
+            return cached_summary, None
+        
+        # Index calls run in a thread so a compaction holding the index does not stall the event loop
+        local_findings = await asyncio.to_thread(self.findings_index.lookup, search_item.query)
+        if local_findings:
+            logger.info(
+                "Answered '%s' from %d indexed findings (best match: '%s')",
+                search_item.query,
+                len(local_findings),
+                local_findings[0].query,
+            )
+            return "\n\n".join(finding.summary for finding in local_findings), None
 
-    async def _execute_single_search(self, search_item) -> str | None:
-        """Execute a single web search query."""
         search_input = f"Search Query: {search_item.query}\nSearch Rationale: {search_item.rationale}"
         
+        SEARCHES_IN_FLIGHT.inc()
+        started = time.perf_counter()
         try:
-            result = await Runner.run(
-                self.web_researcher.agent,
-                search_input
-            )
-            return str(result.final_output)
+            result = await self._run_agent(researcher_agent, search_input)
+            summary = str(result.final_output)
+            elapsed = time.perf_counter() - started
+        except CircuitOpenError as e:
+            logger.warning("Skipped search '%s': %s", search_item.query, e)
+            return None, None
+        except Exception as e:
+            logger.warning("Search failed for '%s': %s", search_item.query, e)
+            return None, None
+        finally:
+            SEARCHES_IN_FLIGHT.dec()
+        
+        # The search succeeded and was paid for; failing to store it, e.g. on a locked database, must not lose it
+        try:
+            self.search_cache.put(cache_key, search_item.query, summary)
+        except Exception as e:
+            logger.warning("Caching the search '%s' failed: %s", search_item.query, e)
+        try:
+            await asyncio.to_thread(self.findings_index.add, search_item.query, summary)
         except Exception as e:
-            print(f"Search failed for '{search_item.query}': {e}")
-            return None
+            logger.warning("Indexing the search '%s' failed: %s", search_item.query, e)
+        else:
+            self._schedule_index_compaction()
+        return summary, elapsed
 
-    async def _generate_research_report(self, query: str, search_results: list[str]) -> ResearchReport:
-        """Generate a comprehensive research report from collected data."""
-        print("Generating research report...")
+    def _schedule_index_compaction(self) -> None:
+        """Compact the findings index in a worker thread once it is due, one compaction at a time."""
+        if not self.findings_index.compaction_due:
+            return
+        if self._index_compaction is not None and not self._index_compaction.done():
+            return
+        self._index_compaction = asyncio.create_task(asyncio.to_thread(self.findings_index.compact))
+        self._index_compaction.add_done_callback(self._log_compaction_failure)
+
+    @staticmethod
+    def _log_compaction_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Compacting the findings index failed: %s", task.exception())
+
+    async def _summarize_findings(self, query: str, findings: str, plan: ExecutionPlan | None = None) -> str:
+        """Condense a chunk of findings into an intermediate summary."""
+        result = await self._run_agent(
+            self._agent_for(self.findings_summarizer, "summarizing", plan),
+            f"Research Query: {query}\n\nFindings:\n{findings}"
+        )
+        return str(result.final_output)
+
+    async def _stream_research_report(
+        self, query: str, research_data: str, plan: ExecutionPlan | None = None
+    ) -> AsyncGenerator[str | ResearchReport, None]:
+        """
+        Generate the research report with a streamed run.
         
-        report_input = f"Original Research Query: {query}\nCollected Research Data: {search_results}"
+        Args:
+            query: The original research question
+            research_data: Findings prepared by the synthesis engine
+            plan: Budget plan choosing the writer model, if any
+            
+        Yields:
+            The report markdown written so far after each received chunk, and
+            finally the validated ResearchReport
+        """
+        logger.info("Generating research report...")
         
-        result = await Runner.run(
-            self.report_writer.agent,
-            report_input
-        )
+        report_input = f"Original Research Query: {query}\n\nCollected Research Data:\n{research_data}"
+        
+        result = None
+        markdown_field = PartialStringField("markdown_content")
+        async for update in self._stream_agent(self._agent_for(self.report_writer, "reporting", plan), report_input):
+            if not isinstance(update, str):
+                result = update
+            elif markdown_field.feed(update):
+                yield markdown_field.value
         
         report = result.final_output_as(ResearchReport)
-        print("Research report generated successfully")
-        return report
+        logger.info("Research report generated successfully")
+        yield report
+
+    async def _run_agent(self, agent: "Agent", agent_input: str) -> "RunResult":
+        """Run an agent to completion under call control, recording latency, token usage and cost."""
+        runner = self._runner(agent)
+        
+        async def attempt() -> "RunResult":
+            recording = self.recorder.start(agent, agent_input) if self.recorder is not None else None
+            started = time.perf_counter()
+            try:
+                result = await runner.run(agent, agent_input)
+            except BaseException as e:
+                record_agent_call(agent.name, agent.model, time.perf_counter() - started, error=e)
+                if recording is not None and isinstance(e, Exception):
+                    recording.fail(e)
+                raise
+            if recording is not None:
+                recording.finish(result)
+            record_agent_call(agent.name, agent.model, time.perf_counter() - started, result.context_wrapper.usage)
+            return result
+        
+        return await self.agent_calls.call(attempt, agent.name)
+
+    async def _stream_agent(
+        self, agent: "Agent", agent_input: str
+    ) -> AsyncGenerator["str | RunResultStreaming", None]:
+        """
+        Run an agent with a streamed run under call control, recording latency, token usage and cost.
+        
+        Upstream failures are only retried before the first chunk arrived.
+        
+        Args:
+            agent: The agent to run
+            agent_input: The input prompt
+            
+        Yields:
+            Each chunk of output text as it arrives, and finally the completed
+            streamed run result
+        """
+        runner = self._runner(agent)
+        
+        async def attempt() -> AsyncGenerator["str | RunResultStreaming", None]:
+            recording = self.recorder.start(agent, agent_input, streamed=True) if self.recorder is not None else None
+            started = time.perf_counter()
+            result = runner.run_streamed(agent, agent_input)
+            try:
+                async for event in result.stream_events():
+                    if event.type == "raw_response_event" and event.data.type == "response.output_text.delta":
+                        if recording is not None:
+                            recording.delta(event.data.delta)
+                        yield event.data.delta
+                if asyncio.current_task().cancelling():
+                    # The agents SDK ends its event stream quietly when cancelled
+                    raise asyncio.CancelledError()
+            except BaseException as e:
+                record_agent_call(agent.name, agent.model, time.perf_counter() - started, error=e)
+                if not isinstance(e, Exception):
+                    # Abandoned midway: stop the agents SDK's background run as well
+                    result.cancel()
+                elif recording is not None:
+                    recording.fail(e)
+                raise
+            if recording is not None:
+                recording.finish(result)
+            record_agent_call(agent.name, agent.model, time.perf_counter() - started, result.context_wrapper.usage)
+            yield result
+        
+        async for update in self.agent_calls.stream(attempt, agent.name):
+            yield update
+
+    def _agent_for(self, research_agent: BaseAgent, role: str, plan: ExecutionPlan | None) -> "Agent":
+        """
+        Return the agent to run for a role, switched to a budget plan's model.
+        
+        The web researcher also gets the plan's search context size. Variants
+        are cloned once and reused by later runs with the same choices.
+        """
+        agent = research_agent.agent
+        if plan is None:
+            return agent
+        context = plan.search_context_size if role == "searching" else None
+        key = (agent.name, plan.models[role], context)
+        variant = self._agent_variants.get(key)
+        if variant is None:
+            overrides = {"model": plan.models[role]}
+            if context is not None:
+                from agents import WebSearchTool
+                
+                overrides["tools"] = [WebSearchTool(search_context_size=context)]
+            variant = self._agent_variants[key] = agent.clone(**overrides)
+        return variant
+
+    def _runner(self, agent: "Agent"):
+        """Return the replay when replaying a recorded session, else the agents SDK Runner."""
+        if self.replay is not None:
+            return self.replay
+        from agents import Runner
+        
+        self._ensure_client(agent)
+        return Runner
+
+    def _ensure_client(self, agent: "Agent") -> None:
+        """Route agents that resolve their model by name through the shared pooled client."""
+        if agent.model is None or isinstance(agent.model, str):
+            shared_client().ensure_installed()
+
+    def connection_pool_stats(self) -> PoolStats:
+        """Statistics of the process-wide OpenAI client connection pool."""
+        return shared_client().pool_stats()
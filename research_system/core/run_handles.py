@@ -0,0 +1,133 @@
+"""
+Run Handles - Cancellable research runs tracked per user session
+"""
+
+import asyncio
+import contextlib
+import logging
+from typing import AsyncGenerator, AsyncIterator, Generic, TypeVar
+
+from .metrics import RUNS_CANCELLED
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Why a run was cancelled, as recorded in the research_runs_cancelled_total metric
+CLEARED = "cleared"
+SUPERSEDED = "superseded"
+DISCONNECTED = "disconnected"
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+class RunHandle(Generic[T]):
+    """
+    A research run drained by its own task, so it can be cancelled from anywhere.
+    Cancelling the task propagates into the orchestrator's pipeline, its
+    searches and every agent call still in flight.
+    """
+
+    def __init__(self, source: AsyncGenerator[T, None], session_id: str | None = None):
+        self.session_id = session_id
+        self.cancel_reason: str | None = None
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self.task = asyncio.create_task(self._pump(source))
+
+    async def _pump(self, source: AsyncGenerator[T, None]) -> None:
+        try:
+            async with contextlib.aclosing(source) as events:
+                async for event in events:
+                    self._queue.put_nowait(event)
+        except Exception as e:
+            self._queue.put_nowait(_Failure(e))
+        finally:
+            self._queue.put_nowait(_DONE)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_reason is not None
+
+    def cancel(self, reason: str) -> bool:
+        """
+        Cancel the run unless it already finished.
+
+        Args:
+            reason: Why the run is no longer wanted, e.g. CLEARED
+
+        Returns:
+            Whether a running run was cancelled
+        """
+        if self.task.done() or self.cancelled:
+            return False
+        logger.info("Cancelling research run of session %s: %s", self.session_id, reason)
+        self.cancel_reason = reason
+        RUNS_CANCELLED.inc(reason=reason)
+        self.task.cancel()
+        return True
+
+    async def events(self) -> AsyncIterator[T]:
+        """
+        Iterate over the run's events as they arrive.
+
+        Yields:
+            Every event of the run; the stream simply ends if the run is cancelled
+
+        Raises:
+            The exception that ended the run, if it failed
+        """
+        while True:
+            item = await self._queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+
+
+class SessionRuns:
+    """
+    The research run in flight for each user session.
+    A session runs one research at a time: starting a new run cancels the
+    previous one, whose results nobody would see.
+    """
+
+    def __init__(self):
+        self._runs: dict[str, RunHandle] = {}
+
+    def start(self, session_id: str | None, source: AsyncGenerator[T, None]) -> RunHandle[T]:
+        """
+        Start draining a run for a session, cancelling the session's previous run.
+
+        Args:
+            session_id: The user session, or None for a run no other request can cancel
+            source: The run's event stream
+
+        Returns:
+            The handle of the new run
+        """
+        if session_id is not None:
+            self.cancel(session_id, SUPERSEDED)
+        handle = RunHandle(source, session_id)
+        if session_id is not None:
+            self._runs[session_id] = handle
+            handle.task.add_done_callback(lambda _: self._forget(session_id, handle))
+        return handle
+
+    def cancel(self, session_id: str | None, reason: str) -> bool:
+        """Cancel the session's run in flight, if any; returns whether one was cancelled."""
+        handle = self._runs.get(session_id) if session_id is not None else None
+        return handle is not None and handle.cancel(reason)
+
+    def _forget(self, session_id: str, handle: RunHandle) -> None:
+        if self._runs.get(session_id) is handle:
+            del self._runs[session_id]
+
+    def __len__(self) -> int:
+        return len(self._runs)
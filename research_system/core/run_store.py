@@ -0,0 +1,222 @@
+"""
+Run Store - Persistent per-run checkpoints of research phase outputs
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from ..agents.report_writer import ResearchReport
+from ..agents.search_planner import SearchStrategy
+
+
+DEFAULT_RUN_STORE_PATH = os.path.join(".research_cache", "runs.sqlite3")
+
+
+def new_run_id() -> str:
+    """Generate an identifier for a new research run."""
+    return uuid.uuid4().hex[:12]
+
+
+@dataclass
+class RunCheckpoint:
+    """Phase outputs saved so far for one research run."""
+    run_id: str
+    query: str
+    parent_run_id: str | None = None
+    strategy: SearchStrategy | None = None
+    search_results: dict[str, str] = field(default_factory=dict)
+    report: ResearchReport | None = None
+
+
+class RunStore:
+    """
+    Local on-disk store of research run checkpoints.
+    The strategy, every completed search and the report are saved as soon as
+    they exist, so a failed run can be resumed from its first incomplete phase.
+    """
+
+    def __init__(self, path: str = DEFAULT_RUN_STORE_PATH, ttl_seconds: float = 7 * 24 * 60 * 60):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._connection = self._connect()
+        self._purge_expired()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite database and create the schema if needed."""
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA foreign_keys=ON")
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                parent_run_id TEXT,
+                strategy TEXT,
+                report TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS run_searches (
+                run_id TEXT NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+                query TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                completed_at REAL NOT NULL,
+                PRIMARY KEY (run_id, query)
+            )
+            """
+        )
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(runs)")}
+        if "parent_run_id" not in columns:
+            # Stores created before follow-up runs existed
+            connection.execute("ALTER TABLE runs ADD COLUMN parent_run_id TEXT")
+        connection.commit()
+        return connection
+
+    def _purge_expired(self) -> None:
+        """Delete runs that have not been touched within the TTL."""
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM runs WHERE updated_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            self._connection.commit()
+
+    def load(self, run_id: str) -> RunCheckpoint | None:
+        """
+        Load everything saved for a run.
+
+        Args:
+            run_id: Identifier of the run
+
+        Returns:
+            The run's checkpoint, or None if no such run is stored
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT query, parent_run_id, strategy, report FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            searches = self._connection.execute(
+                "SELECT query, summary FROM run_searches WHERE run_id = ? ORDER BY completed_at", (run_id,)
+            ).fetchall()
+
+        query, parent_run_id, strategy, report = row
+        return RunCheckpoint(
+            run_id,
+            query,
+            parent_run_id=parent_run_id,
+            strategy=SearchStrategy.model_validate_json(strategy) if strategy else None,
+            search_results=dict(searches),
+            report=ResearchReport.model_validate_json(report) if report else None,
+        )
+
+    def load_lineage(self, run_id: str, max_depth: int = 10) -> list[RunCheckpoint]:
+        """
+        Load a run followed by the runs it follows up on, nearest first.
+
+        Args:
+            run_id: Identifier of the most recent run
+            max_depth: Maximum number of runs to load
+
+        Returns:
+            The stored runs of the chain; empty if run_id is unknown
+        """
+        lineage = []
+        seen = set()
+        while run_id is not None and run_id not in seen and len(lineage) < max_depth:
+            seen.add(run_id)
+            checkpoint = self.load(run_id)
+            if checkpoint is None:
+                break
+            lineage.append(checkpoint)
+            run_id = checkpoint.parent_run_id
+        return lineage
+
+    def open_run(self, run_id: str, query: str, parent_run_id: str | None = None) -> RunCheckpoint:
+        """
+        Load the checkpoint of a run, creating an empty one for a new run ID.
+
+        Args:
+            run_id: Identifier of the run
+            query: The research question the run answers
+            parent_run_id: The earlier run a new run follows up on, if any
+
+        Returns:
+            Everything saved so far for the run
+
+        Raises:
+            ValueError: If the run ID already belongs to a different query
+        """
+        checkpoint = self.load(run_id)
+        if checkpoint is not None:
+            if checkpoint.query != query:
+                raise ValueError(f"Run {run_id} belongs to a different query: {checkpoint.query!r}")
+            return checkpoint
+
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO runs (run_id, query, parent_run_id, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (run_id, query, parent_run_id, now, now),
+            )
+            self._connection.commit()
+        return RunCheckpoint(run_id, query, parent_run_id=parent_run_id)
+
+    def save_strategy(self, run_id: str, strategy: SearchStrategy) -> None:
+        """Save the planned search strategy of a run."""
+        self._update(run_id, "strategy", strategy.model_dump_json())
+
+    def save_search(self, run_id: str, query: str, summary: str) -> None:
+        """
+        Save one completed web search of a run.
+
+        Args:
+            run_id: Identifier of the run
+            query: The search query text
+            summary: The web research summary
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                """
+                INSERT OR REPLACE INTO run_searches (run_id, query, summary, completed_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (run_id, query, summary, now),
+            )
+            self._connection.execute("UPDATE runs SET updated_at = ? WHERE run_id = ?", (now, run_id))
+            self._connection.commit()
+
+    def save_report(self, run_id: str, report: ResearchReport) -> None:
+        """Save the generated report of a run."""
+        self._update(run_id, "report", report.model_dump_json())
+
+    def _update(self, run_id: str, column: str, value: str) -> None:
+        with self._lock:
+            self._connection.execute(
+                f"UPDATE runs SET {column} = ?, updated_at = ? WHERE run_id = ?", (value, time.time(), run_id)
+            )
+            self._connection.commit()
+
+    def delete(self, run_id: str) -> None:
+        """Remove a run and all of its saved phase outputs."""
+        with self._lock:
+            self._connection.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+            self._connection.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,216 @@
+"""
+Search Cache - Persistent TTL/LRU cache for web research summaries
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .metrics import CACHE_LOOKUPS
+
+if TYPE_CHECKING:
+    from agents import Agent
+
+
+DEFAULT_CACHE_PATH = os.path.join(".research_cache", "search_cache.sqlite3")
+
+
+def normalize_query(query: str) -> str:
+    """Normalize query text so trivially different spellings share a cache key."""
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+
+def agent_fingerprint(agent: "Agent") -> str:
+    """
+    Build a stable fingerprint of the agent configuration.
+
+    Args:
+        agent: The agent whose model, instructions and tools define its output
+
+    Returns:
+        Hex digest identifying the agent configuration
+    """
+    tool_names = ",".join(
+        sorted(
+            # Web search results differ by context size, so it is part of the tool's identity
+            getattr(tool, "name", type(tool).__name__) + f":{getattr(tool, 'search_context_size', '')}"
+            for tool in agent.tools
+        )
+    )
+    material = f"{agent.model}\n{agent.instructions}\n{tool_names}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Snapshot of cache effectiveness counters."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class SearchCache:
+    """
+    Local on-disk cache for web search summaries.
+    Entries expire after a TTL and the least recently used ones are evicted
+    once the cache grows beyond its size bound.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl_seconds: float = 24 * 60 * 60,
+        max_entries: int = 5000,
+        bypass: bool = False,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.bypass = bypass
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._connection = self._connect()
+        self.stats.entries = self._count_entries()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite database and create the schema if needed."""
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS search_cache (
+                cache_key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+            """
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_search_cache_lru ON search_cache (last_accessed)"
+        )
+        connection.commit()
+        return connection
+
+    def _count_entries(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+
+    def make_key(self, query: str, fingerprint: str) -> str:
+        """
+        Build the cache key for a query run by a given agent configuration.
+
+        Args:
+            query: The raw search query text
+            fingerprint: Fingerprint of the agent that answers the query
+
+        Returns:
+            Hex digest cache key
+        """
+        material = f"{normalize_query(query)}\n{fingerprint}"
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """
+        Look up a cached summary.
+
+        Args:
+            key: Cache key produced by make_key
+
+        Returns:
+            The cached summary, or None on a miss, an expired entry or when bypassed
+        """
+        if self.bypass:
+            CACHE_LOOKUPS.inc(result="bypass")
+            return None
+
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT summary, created_at FROM search_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.stats.misses += 1
+                CACHE_LOOKUPS.inc(result="miss")
+                return None
+
+            summary, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._connection.execute("DELETE FROM search_cache WHERE cache_key = ?", (key,))
+                self._connection.commit()
+                self.stats.entries -= 1
+                self.stats.evictions += 1
+                self.stats.misses += 1
+                CACHE_LOOKUPS.inc(result="expired")
+                return None
+
+            self._connection.execute(
+                "UPDATE search_cache SET last_accessed = ? WHERE cache_key = ?", (now, key)
+            )
+            self._connection.commit()
+            self.stats.hits += 1
+            CACHE_LOOKUPS.inc(result="hit")
+            return summary
+
+    def put(self, key: str, query: str, summary: str) -> None:
+        """
+        Store a summary and evict least recently used entries beyond the size bound.
+
+        Args:
+            key: Cache key produced by make_key
+            query: The search query, kept for inspection
+            summary: The web research summary to cache
+        """
+        if self.bypass:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                """
+                INSERT OR REPLACE INTO search_cache (cache_key, query, summary, created_at, last_accessed)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (key, query, summary, now, now),
+            )
+            self.stats.entries = self._count_entries()
+
+            overflow = self.stats.entries - self.max_entries
+            if overflow > 0:
+                self._connection.execute(
+                    """
+                    DELETE FROM search_cache WHERE cache_key IN (
+                        SELECT cache_key FROM search_cache ORDER BY last_accessed ASC LIMIT ?
+                    )
+                    """,
+                    (overflow,),
+                )
+                self.stats.entries -= overflow
+                self.stats.evictions += overflow
+            self._connection.commit()
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            self._connection.execute("DELETE FROM search_cache")
+            self._connection.commit()
+            self.stats.entries = 0
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._connection.close()
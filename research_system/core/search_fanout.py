@@ -0,0 +1,211 @@
+"""
+Search Fan-Out - Deadline-aware concurrent execution of web searches
+"""
+
+import asyncio
+import logging
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from ..agents.search_planner import SearchQuery
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FanOutPolicy:
+    """
+    Settings controlling how long the search phase may wait for results.
+
+    Attributes:
+        search_timeout: Seconds a single search (including hedges) may take
+        phase_deadline: Seconds the whole search phase may take
+        quorum: Move on once this many searches succeeded, cancelling the rest
+        hedge: Start a duplicate call when a search runs past the latency percentile
+        hedge_percentile: Latency percentile that triggers a hedged request
+        hedge_min_samples: Observed searches required before hedging kicks in
+    """
+    search_timeout: float | None = 90.0
+    phase_deadline: float | None = 240.0
+    quorum: int | None = None
+    hedge: bool = False
+    hedge_percentile: float = 0.95
+    hedge_min_samples: int = 20
+
+
+class LatencyTracker:
+    """
+    Rolling window of observed latencies of live web searches.
+    Used to decide when a search is slow enough to be worth hedging, so
+    searches answered from the cache or past findings must not be recorded.
+    """
+
+    def __init__(self, window: int = 200):
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        """Record the latency of a completed search."""
+        self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> float | None:
+        """
+        Return the latency at the given percentile.
+
+        Args:
+            fraction: Percentile as a fraction between 0 and 1
+
+        Returns:
+            Latency in seconds, or None when no samples were recorded
+        """
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+        return ordered[index]
+
+
+@dataclass
+class FanOutReport:
+    """Outcome of a search fan-out, used to tune the fan-out policy."""
+    results: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+    dropped: dict[str, str] = field(default_factory=dict)
+    hedged: list[str] = field(default_factory=list)
+
+    def describe(self) -> str:
+        """Summarize dropped and hedged searches in one line."""
+        parts = [f"{len(self.results)} succeeded"]
+        if self.failed:
+            parts.append(f"{len(self.failed)} failed")
+        if self.dropped:
+            parts.append(f"{len(self.dropped)} dropped")
+        if self.hedged:
+            parts.append(f"{len(self.hedged)} hedged")
+        return ", ".join(parts)
+
+
+class SearchFanOut:
+    """
+    Runs searches concurrently under a fan-out policy.
+    Applies per-search timeouts, an overall phase deadline, an optional quorum
+    and optional hedged requests, and records what happened to each search.
+    The latency tracker is only read here; the search callable records the
+    searches it actually ran.
+    """
+
+    def __init__(
+        self,
+        search: Callable[[SearchQuery], Awaitable[str | None]],
+        policy: FanOutPolicy,
+        latency: LatencyTracker,
+        hedge_search: Callable[[SearchQuery], Awaitable[str | None]] | None = None,
+    ):
+        self.search = search
+        self.hedge_search = hedge_search if hedge_search is not None else search
+        self.policy = policy
+        self.latency = latency
+        self.report = FanOutReport()
+        self._tasks: dict[asyncio.Task, SearchQuery] = {}
+
+    def submit(self, search_item: SearchQuery) -> None:
+        """Start a search immediately."""
+        task = asyncio.create_task(self._run_with_timeout(search_item))
+        self._tasks[task] = search_item
+
+    def cancel(self) -> None:
+        """Cancel every submitted search, e.g. when planning fails midway."""
+        for task in self._tasks:
+            task.cancel()
+
+    async def gather(self) -> FanOutReport:
+        """
+        Wait for submitted searches according to the policy.
+
+        Returns:
+            FanOutReport with the successful results and the fate of the rest
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if self.policy.phase_deadline is None else loop.time() + self.policy.phase_deadline
+        pending = set(self._tasks)
+        total = len(pending)
+        completed_count = 0
+
+        try:
+            while pending:
+                if self.policy.quorum is not None and len(self.report.results) >= self.policy.quorum:
+                    self._drop(pending, "quorum reached")
+                    break
+
+                timeout = None if deadline is None else max(0.0, deadline - loop.time())
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    self._drop(pending, "phase deadline exceeded")
+                    break
+
+                for task in done:
+                    completed_count += 1
+                    self._collect(task)
+                logger.info("Research progress: %d/%d queries completed", completed_count, total)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        return self.report
+
+    def _collect(self, task: asyncio.Task) -> None:
+        """Record the outcome of a finished search task."""
+        search_item = self._tasks[task]
+        if task.cancelled():
+            self.report.dropped[search_item.query] = "cancelled"
+        elif isinstance(task.exception(), asyncio.TimeoutError):
+            self.report.dropped[search_item.query] = "search timeout"
+        elif task.exception() is not None or task.result() is None:
+            self.report.failed.append(search_item.query)
+        else:
+            self.report.results.append(task.result())
+
+    def _drop(self, tasks: set[asyncio.Task], reason: str) -> None:
+        """Mark still-running searches as dropped."""
+        for task in tasks:
+            self.report.dropped[self._tasks[task].query] = reason
+
+    async def _run_with_timeout(self, search_item: SearchQuery) -> str | None:
+        return await asyncio.wait_for(self._run_hedged(search_item), timeout=self.policy.search_timeout)
+
+    async def _run_hedged(self, search_item: SearchQuery) -> str | None:
+        """Run a search, starting one duplicate call if it becomes a straggler."""
+        attempts = {asyncio.create_task(self.search(search_item))}
+
+        try:
+            hedge_delay = self._hedge_delay()
+            if hedge_delay is not None:
+                done, _ = await asyncio.wait(attempts, timeout=hedge_delay)
+                if not done:
+                    logger.info("Hedging slow search '%s' after %.1fs", search_item.query, hedge_delay)
+                    self.report.hedged.append(search_item.query)
+                    attempts.add(asyncio.create_task(self.hedge_search(search_item)))
+
+            while attempts:
+                done, attempts = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None and attempt.result() is not None:
+                        return attempt.result()
+            return None
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
+    def _hedge_delay(self) -> float | None:
+        if not self.policy.hedge or len(self.latency) < self.policy.hedge_min_samples:
+            return None
+        return self.latency.percentile(self.policy.hedge_percentile)
@@ -0,0 +1,330 @@
+"""
+Session Recording - Record agent calls of live research runs and replay them offline
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, AsyncIterator
+
+from pydantic import BaseModel
+
+from .call_control import CONNECTION_ERROR, RATE_LIMIT, SERVER_ERROR, TIMEOUT, classify_error
+from .synthesis import estimate_tokens
+
+if TYPE_CHECKING:
+    from agents import Agent
+
+
+logger = logging.getLogger(__name__)
+
+RECORDING_VERSION = 1
+
+# Stream deltas closer together than this are merged to keep recordings compact
+DELTA_MERGE_SECONDS = 0.02
+
+
+@dataclass
+class RecordedCall:
+    """
+    One agent run with its input, output and timings.
+
+    Attributes:
+        agent: Name of the agent that ran
+        model: Model the agent used
+        input: The input prompt
+        output: Final output; a pydantic model is stored as its dict
+        streamed: Whether the run was streamed
+        started: Seconds from the start of the session to the start of the run
+        duration: Seconds the run took
+        deltas: For streamed runs, (seconds into the run, text) chunks as they arrived
+        input_tokens: Prompt tokens the API reported
+        output_tokens: Completion tokens the API reported
+        error: Representation of the exception that ended the run, if any
+        error_kind: Upstream cause of the error as classified by call control
+    """
+    agent: str
+    model: str
+    input: str
+    output: Any = None
+    streamed: bool = False
+    started: float = 0.0
+    duration: float = 0.0
+    deltas: list[tuple[float, str]] = field(default_factory=list)
+    input_tokens: int = 0
+    output_tokens: int = 0
+    error: str | None = None
+    error_kind: str | None = None
+
+
+@dataclass
+class RecordedSession:
+    """Every agent call of one research session."""
+    query: str
+    recorded_at: float
+    calls: list[RecordedCall] = field(default_factory=list)
+    metadata: dict = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        """Seconds from the first call's start to the last call's end."""
+        return max((call.started + call.duration for call in self.calls), default=0.0)
+
+    def save(self, path: str) -> None:
+        """Write the session as gzip-compressed JSON lines: a header, then one line per call."""
+        header = {
+            "version": RECORDING_VERSION,
+            "query": self.query,
+            "recorded_at": self.recorded_at,
+            "metadata": self.metadata,
+        }
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            file.write(json.dumps(header) + "\n")
+            for call in sorted(self.calls, key=lambda call: call.started):
+                file.write(json.dumps(asdict(call)) + "\n")
+
+    @classmethod
+    def load(cls, path: str) -> "RecordedSession":
+        """
+        Read a session written by save().
+
+        Raises:
+            ValueError: If the file was written by an unsupported recording version
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            header = json.loads(file.readline())
+            if header.get("version") != RECORDING_VERSION:
+                raise ValueError(f"Unsupported recording version {header.get('version')!r} in {path}")
+            calls = []
+            for line in file:
+                data = json.loads(line)
+                data["deltas"] = [tuple(delta) for delta in data["deltas"]]
+                calls.append(RecordedCall(**data))
+        return cls(header["query"], header["recorded_at"], calls, header.get("metadata", {}))
+
+
+class CallRecording:
+    """Collects one agent run while it happens."""
+
+    def __init__(self, recorder: "SessionRecorder", agent: "Agent", agent_input: str, streamed: bool):
+        self.recorder = recorder
+        model = agent.model if isinstance(agent.model, str) or agent.model is None else type(agent.model).__name__
+        self.call = RecordedCall(
+            agent.name, model or "default", agent_input, streamed=streamed, started=recorder.elapsed()
+        )
+        self._started = time.perf_counter()
+
+    def delta(self, text: str) -> None:
+        """Record a chunk of streamed output."""
+        offset = time.perf_counter() - self._started
+        deltas = self.call.deltas
+        if deltas and offset - deltas[-1][0] < DELTA_MERGE_SECONDS:
+            deltas[-1] = (deltas[-1][0], deltas[-1][1] + text)
+        else:
+            deltas.append((offset, text))
+
+    def finish(self, result) -> None:
+        """Record the run's final output and token usage."""
+        output = result.final_output
+        self.call.output = output.model_dump() if isinstance(output, BaseModel) else output
+        usage = result.context_wrapper.usage
+        self.call.input_tokens = getattr(usage, "input_tokens", 0) or 0
+        self.call.output_tokens = getattr(usage, "output_tokens", 0) or 0
+        self._close()
+
+    def fail(self, error: BaseException) -> None:
+        """Record the exception that ended the run."""
+        self.call.error = repr(error)
+        self.call.error_kind = classify_error(error)
+        self._close()
+
+    def _close(self) -> None:
+        self.call.duration = time.perf_counter() - self._started
+        self.recorder.session.calls.append(self.call)
+
+
+class SessionRecorder:
+    """
+    Captures the input, output and timings of every agent call of an orchestrator.
+    Attach it with ResearchOrchestrator(recorder=...) before a live run and
+    save the session afterwards to replay it without the network.
+    """
+
+    def __init__(self, query: str = "", metadata: dict | None = None):
+        self.session = RecordedSession(query, time.time(), metadata=metadata or {})
+        self._started = time.perf_counter()
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._started
+
+    def start(self, agent: "Agent", agent_input: str, streamed: bool = False) -> CallRecording:
+        """Begin recording an agent run."""
+        return CallRecording(self, agent, agent_input, streamed)
+
+    def save(self, path: str) -> RecordedSession:
+        """Write the recorded session to a gzip JSON-lines file."""
+        self.session.save(path)
+        logger.info("Recorded %d agent calls to %s", len(self.session.calls), path)
+        return self.session
+
+
+class ReplayMissError(LookupError):
+    """The orchestrator made an agent call the recording has no counterpart for."""
+
+
+class ReplayedError(RuntimeError):
+    """A recorded failure raised again, classified like the original by call control."""
+
+    STATUS_CODES = {RATE_LIMIT: 429, SERVER_ERROR: 500, CONNECTION_ERROR: 503}
+
+    def __init__(self, call: RecordedCall):
+        super().__init__(f"Recorded failure: {call.error}")
+        self.status_code = self.STATUS_CODES.get(call.error_kind)
+
+
+def _replayed_error(call: RecordedCall) -> Exception:
+    return TimeoutError(f"Recorded timeout: {call.error}") if call.error_kind == TIMEOUT else ReplayedError(call)
+
+
+@dataclass
+class _ReplayUsage:
+    requests: int = 1
+    input_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+
+
+@dataclass
+class _ReplayContext:
+    usage: _ReplayUsage
+
+
+@dataclass
+class _ReplayDelta:
+    delta: str
+    type: str = "response.output_text.delta"
+
+
+@dataclass
+class _ReplayEvent:
+    data: _ReplayDelta
+    type: str = "raw_response_event"
+
+
+class ReplayResult:
+    """Stands in for the agents SDK's RunResult and RunResultStreaming during replay."""
+
+    def __init__(self, call: RecordedCall, agent: "Agent", time_scale: float):
+        self.call = call
+        self.time_scale = time_scale
+        output = call.output
+        output_type = getattr(agent, "output_type", None)
+        if isinstance(output_type, type) and issubclass(output_type, BaseModel) and isinstance(output, dict):
+            output = output_type.model_validate(output)
+        self.final_output = output
+        self.context_wrapper = _ReplayContext(
+            _ReplayUsage(
+                input_tokens=call.input_tokens,
+                output_tokens=call.output_tokens,
+                total_tokens=call.input_tokens + call.output_tokens,
+            )
+        )
+
+    def final_output_as(self, cls: type, raise_if_incorrect_type: bool = False):
+        return self.final_output
+
+    def cancel(self) -> None:
+        """Nothing runs in the background of a replayed call."""
+
+    async def stream_events(self) -> AsyncIterator[_ReplayEvent]:
+        """Re-emit the recorded deltas on their recorded schedule, time-scaled."""
+        elapsed = 0.0
+        for offset, text in self.call.deltas:
+            await asyncio.sleep(max(0.0, offset - elapsed) * self.time_scale)
+            elapsed = offset
+            yield _ReplayEvent(_ReplayDelta(text))
+        await asyncio.sleep(max(0.0, self.call.duration - elapsed) * self.time_scale)
+        if self.call.error is not None:
+            raise _replayed_error(self.call)
+
+
+@dataclass
+class ReplayStats:
+    """What the orchestrator asked for while replaying a session."""
+    calls: dict[str, int] = field(default_factory=dict)
+    # Estimated tokens of the prompts the orchestrator sent, instructions included
+    prompt_tokens: dict[str, int] = field(default_factory=dict)
+    # Calls whose input differed from every recorded input of that agent
+    inexact_matches: int = 0
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    @property
+    def total_prompt_tokens(self) -> int:
+        return sum(self.prompt_tokens.values())
+
+
+class SessionReplay:
+    """
+    Serves recorded agent calls in place of the OpenAI API.
+    Exposes the Runner interface the orchestrator uses. Each call is matched
+    to an unused recording of the same agent with the same input, or else the
+    next unused recording of that agent, so a session still replays after
+    orchestrator changes alter prompts. Calls take their recorded duration
+    multiplied by time_scale, and streamed calls re-emit their recorded deltas.
+    """
+
+    def __init__(self, session: RecordedSession, time_scale: float = 1.0):
+        self.session = session
+        self.time_scale = time_scale
+        self.stats = ReplayStats()
+        self._by_input: dict[tuple[str, str], deque[RecordedCall]] = defaultdict(deque)
+        self._by_agent: dict[str, deque[RecordedCall]] = defaultdict(deque)
+        self._used: set[int] = set()
+        for call in sorted(session.calls, key=lambda call: call.started):
+            self._by_input[(call.agent, call.input)].append(call)
+            self._by_agent[call.agent].append(call)
+
+    @classmethod
+    def from_file(cls, path: str, time_scale: float = 1.0) -> "SessionReplay":
+        return cls(RecordedSession.load(path), time_scale)
+
+    def _match(self, agent: "Agent", agent_input: str) -> RecordedCall:
+        """
+        Claim the recording that answers a call.
+
+        Raises:
+            ReplayMissError: If every recording of the agent was used up
+        """
+        self.stats.calls[agent.name] = self.stats.calls.get(agent.name, 0) + 1
+        instructions = agent.instructions if isinstance(agent.instructions, str) else ""
+        self.stats.prompt_tokens[agent.name] = (
+            self.stats.prompt_tokens.get(agent.name, 0) + estimate_tokens(instructions + agent_input)
+        )
+        for candidates in (self._by_input.get((agent.name, agent_input)), self._by_agent.get(agent.name)):
+            while candidates:
+                call = candidates.popleft()
+                if id(call) not in self._used:
+                    self._used.add(id(call))
+                    if call.input != agent_input:
+                        self.stats.inexact_matches += 1
+                    return call
+        raise ReplayMissError(f"No recorded call left for agent {agent.name!r}")
+
+    async def run(self, agent: "Agent", agent_input: str) -> ReplayResult:
+        """Replay a non-streamed run."""
+        call = self._match(agent, agent_input)
+        await asyncio.sleep(call.duration * self.time_scale)
+        if call.error is not None:
+            raise _replayed_error(call)
+        return ReplayResult(call, agent, self.time_scale)
+
+    def run_streamed(self, agent: "Agent", agent_input: str) -> ReplayResult:
+        """Replay a streamed run; its deltas arrive through stream_events()."""
+        return ReplayResult(self._match(agent, agent_input), agent, self.time_scale)
@@ -0,0 +1,175 @@
+"""
+Single Flight - Coalescing of identical concurrent research work
+"""
+
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Generic, TypeVar
+
+
+T = TypeVar("T")
+
+
+class BroadcastRun(Generic[T]):
+    """
+    An event stream produced once and replayed to every subscriber.
+    The source is drained by its own task, so a subscriber can disconnect at
+    any time without affecting the other subscribers. Once the last
+    subscriber has gone the run is cancelled, since nobody would see it.
+    Events marked cumulative carry everything before them, e.g. the report
+    written so far, so only the latest of consecutive ones is buffered; a
+    subscriber that falls behind skips straight to it.
+    """
+
+    def __init__(self, source: AsyncIterator[T], cumulative: Callable[[T], bool] | None = None):
+        self.events: list[T] = []
+        self.cumulative = cumulative
+        # Bumped whenever the last buffered event is replaced by a newer cumulative one
+        self.revision = 0
+        self.error: BaseException | None = None
+        self.done = False
+        self.cancelled = False
+        self.subscribers = 0
+        self._changed = asyncio.Event()
+        self.task = asyncio.create_task(self._pump(source))
+
+    async def _pump(self, source: AsyncIterator[T]) -> None:
+        try:
+            async for event in source:
+                if self._replaces_last(event):
+                    self.events[-1] = event
+                    self.revision += 1
+                else:
+                    self.events.append(event)
+                self._notify()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+            self._notify()
+
+    def _replaces_last(self, event: T) -> bool:
+        return (
+            self.cumulative is not None and bool(self.events)
+            and self.cumulative(event) and self.cumulative(self.events[-1])
+        )
+
+    def _notify(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def subscribe(self) -> AsyncIterator[T]:
+        """
+        Iterate over the run's events from the beginning.
+
+        Yields:
+            Every event of the run, replaying those emitted before subscribing;
+            of consecutive cumulative events, at least the latest
+
+        Raises:
+            The exception that ended the run, if it failed
+        """
+        self.subscribers += 1
+        index = 0
+        # Revision of the buffer when this subscriber took the last event it yielded
+        seen = self.revision
+        try:
+            while True:
+                if index < len(self.events):
+                    event, seen = self.events[index], self.revision
+                    index += 1
+                    yield event
+                    continue
+                if index and seen != self.revision:
+                    # The event yielded last was the last buffered one and has been replaced since
+                    event, seen = self.events[-1], self.revision
+                    yield event
+                    continue
+                if self.done:
+                    if self.error is not None:
+                        raise self.error
+                    return
+                await self._changed.wait()
+        finally:
+            self.subscribers -= 1
+            if self.subscribers == 0 and not self.done:
+                self.cancel()
+
+    def cancel(self) -> None:
+        """Stop the run; its subscribers see the events so far and then the end of the stream."""
+        self.cancelled = True
+        self.task.cancel()
+
+
+class SingleFlight(Generic[T]):
+    """
+    Deduplicates identical work that is already in flight.
+    Streams are shared through BroadcastRun; awaitable calls share one task
+    that is only cancelled once every caller waiting on it has gone away.
+    """
+
+    def __init__(self, cumulative: Callable[[T], bool] | None = None):
+        # Marks stream events that supersede the previous one, see BroadcastRun
+        self.cumulative = cumulative
+        self._runs: dict[str, BroadcastRun] = {}
+        self._calls: dict[str, asyncio.Task] = {}
+        self._waiters: dict[str, int] = {}
+
+    def stream(self, key: str, factory: Callable[[], AsyncIterator[T]]) -> tuple[AsyncIterator[T], bool]:
+        """
+        Subscribe to the run for a key, starting it if none is in flight.
+
+        Args:
+            key: Identity of the work
+            factory: Creates the event stream when a new run is needed
+
+        Returns:
+            Tuple of (event iterator, whether this caller started the run)
+        """
+        run = self._runs.get(key)
+        # A finished or cancelled run lingers until its done callback fires; never replay it to a new caller
+        started = run is None or run.done or run.cancelled
+        if started:
+            run = BroadcastRun(factory(), self.cumulative)
+            self._runs[key] = run
+            run.task.add_done_callback(lambda _: self._forget_run(key, run))
+        return run.subscribe(), started
+
+    def _forget_run(self, key: str, run: BroadcastRun) -> None:
+        if self._runs.get(key) is run:
+            del self._runs[key]
+
+    async def call(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await the result for a key, sharing an in-flight call if there is one.
+
+        Args:
+            key: Identity of the work
+            factory: Creates the awaitable when a new call is needed
+
+        Returns:
+            The shared result
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._forget_call(key, task))
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[key] -= 1
+            if self._waiters[key] == 0:
+                del self._waiters[key]
+                if not task.done():
+                    task.cancel()
+
+    def _forget_call(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct runs and calls currently in flight."""
+        return len(self._runs) + len(self._calls)
@@ -0,0 +1,314 @@
+"""
+SQLite Queue - Shared task queue database drained by worker processes on any node
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import TYPE_CHECKING, AsyncGenerator
+
+from .task_queue import TaskBackend, serve_task
+
+if TYPE_CHECKING:
+    from .research_orchestrator import ResearchOrchestrator
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_PATH = os.path.join(".research_cache", "task_queue.sqlite3")
+
+
+class SQLiteTaskQueue:
+    """
+    Task and message tables shared by submitters and workers.
+    Workers claim queued tasks under a lease they keep renewing; a task whose
+    lease expires, e.g. because its worker died, is claimed again. Every
+    node must open the same database file, such as one on a shared volume.
+    The database uses a rollback journal rather than WAL, whose shared-memory
+    index only works between processes of one host; the volume must support
+    POSIX file locks. Every call blocks, so asyncio callers run them in a thread.
+    """
+
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite database and create the schema if needed."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Autocommit mode; claims take the write lock explicitly
+        connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        # WAL needs shared memory on one host and breaks on network filesystems
+        connection.execute("PRAGMA journal_mode=DELETE")
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                worker TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_expires REAL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS tasks_by_status ON tasks (status, created_at)")
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS task_messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_id TEXT NOT NULL,
+                message TEXT NOT NULL
+            )
+            """
+        )
+        return connection
+
+    def enqueue(self, task_id: str, kind: str, payload: dict) -> None:
+        """Add a task to the end of the queue."""
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO tasks (task_id, kind, payload, status, created_at) VALUES (?, ?, ?, 'queued', ?)",
+                (task_id, kind, json.dumps(payload), time.time()),
+            )
+
+    def claim(self, worker: str, lease_seconds: float) -> tuple[str, str, dict, int] | None:
+        """
+        Take the oldest queued task, or one whose worker stopped renewing its lease.
+
+        Args:
+            worker: Identifier of the claiming worker
+            lease_seconds: Seconds the claim holds without renewal
+
+        Returns:
+            Tuple of (task ID, kind, payload, attempt number), or None if the queue is empty
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._connection.execute(
+                    """
+                    SELECT task_id, kind, payload, attempts FROM tasks
+                    WHERE status = 'queued' OR (status = 'running' AND lease_expires < ?)
+                    ORDER BY created_at LIMIT 1
+                    """,
+                    (now,),
+                ).fetchone()
+                if row is not None:
+                    self._connection.execute(
+                        "UPDATE tasks SET status = 'running', worker = ?, attempts = attempts + 1, "
+                        "lease_expires = ? WHERE task_id = ?",
+                        (worker, now + lease_seconds, row[0]),
+                    )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        task_id, kind, payload, attempts = row
+        return task_id, kind, json.loads(payload), attempts + 1
+
+    def renew(self, worker: str, task_ids: list[str], lease_seconds: float) -> set[str]:
+        """
+        Extend the leases of a worker's running tasks.
+
+        Returns:
+            The task IDs the worker still owns; the others were cancelled or reclaimed
+        """
+        if not task_ids:
+            return set()
+        placeholders = ",".join("?" * len(task_ids))
+        with self._lock:
+            self._connection.execute(
+                f"UPDATE tasks SET lease_expires = ? WHERE worker = ? AND status = 'running' "
+                f"AND task_id IN ({placeholders})",
+                (time.time() + lease_seconds, worker, *task_ids),
+            )
+            rows = self._connection.execute(
+                f"SELECT task_id FROM tasks WHERE worker = ? AND status = 'running' AND task_id IN ({placeholders})",
+                (worker, *task_ids),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def append(self, task_id: str, message: dict) -> None:
+        """Publish a message of a task to its submitter."""
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO task_messages (task_id, message) VALUES (?, ?)", (task_id, json.dumps(message))
+            )
+
+    def finish(self, task_id: str, worker: str) -> None:
+        """Mark a task complete if the worker still owns it."""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE tasks SET status = 'done' WHERE task_id = ? AND worker = ? AND status = 'running'",
+                (task_id, worker),
+            )
+
+    def read(self, after_id: int) -> list[tuple[int, str, dict]]:
+        """Return every message published after the given message ID, oldest first."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, task_id, message FROM task_messages WHERE id > ? ORDER BY id", (after_id,)
+            ).fetchall()
+        return [(message_id, task_id, json.loads(message)) for message_id, task_id, message in rows]
+
+    def last_message_id(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COALESCE(MAX(id), 0) FROM task_messages").fetchone()[0]
+
+    def discard(self, task_id: str) -> None:
+        """Delete a task and its messages; a worker still running it stops at its next renewal."""
+        with self._lock:
+            self._connection.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+            self._connection.execute("DELETE FROM task_messages WHERE task_id = ?", (task_id,))
+
+    def depth(self) -> int:
+        """Number of tasks waiting for a worker."""
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM tasks WHERE status = 'queued'").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class SQLiteQueueBackend(TaskBackend):
+    """
+    Submits tasks to a shared SQLite queue drained by SQLiteQueueWorker processes.
+    One poller per backend reads new messages for every task in flight and
+    routes them to the waiting submitters.
+    """
+
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH, poll_interval: float = 0.05):
+        self.queue = SQLiteTaskQueue(path)
+        self.poll_interval = poll_interval
+        self._inboxes: dict[str, asyncio.Queue[dict]] = {}
+        self._poller: asyncio.Task | None = None
+        self._last_message_id = self.queue.last_message_id()
+
+    async def _stream(self, kind: str, payload: dict) -> AsyncGenerator[dict, None]:
+        task_id = uuid.uuid4().hex
+        inbox: asyncio.Queue[dict] = asyncio.Queue()
+        self._inboxes[task_id] = inbox
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll())
+        try:
+            await asyncio.to_thread(self.queue.enqueue, task_id, kind, payload)
+            while True:
+                message = await inbox.get()
+                yield message
+                if message["type"] in ("result", "error"):
+                    return
+        finally:
+            del self._inboxes[task_id]
+            await asyncio.to_thread(self.queue.discard, task_id)
+
+    async def _poll(self) -> None:
+        """Deliver published messages until no task is waiting for any."""
+        while self._inboxes:
+            try:
+                messages = await asyncio.to_thread(self.queue.read, self._last_message_id)
+            except sqlite3.Error as e:
+                logger.warning("Reading the task queue failed, retrying: %s", e)
+                messages = []
+            for message_id, task_id, message in messages:
+                self._last_message_id = message_id
+                inbox = self._inboxes.get(task_id)
+                if inbox is not None:
+                    inbox.put_nowait(message)
+            await asyncio.sleep(self.poll_interval)
+
+    async def close(self) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
+        await asyncio.to_thread(self.queue.close)
+
+
+class SQLiteQueueWorker:
+    """
+    Drains a shared SQLite task queue with its own orchestrator.
+    Start any number of workers, on any node that can open the queue
+    database, to scale search and report work without more UI processes.
+    """
+
+    def __init__(
+        self,
+        queue: SQLiteTaskQueue,
+        orchestrator: "ResearchOrchestrator",
+        concurrency: int = 8,
+        lease_seconds: float = 60.0,
+        poll_interval: float = 0.2,
+        flush_interval: float = 0.05,
+    ):
+        self.queue = queue
+        self.orchestrator = orchestrator
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.flush_interval = flush_interval
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.tasks_completed = 0
+        self._running: dict[str, asyncio.Task] = {}
+
+    async def run(self, stop: asyncio.Event | None = None) -> None:
+        """
+        Claim and run tasks until stopped.
+
+        Args:
+            stop: Event that ends the loop once set; running tasks are finished first
+        """
+        stop = stop if stop is not None else asyncio.Event()
+        heartbeat = asyncio.create_task(self._heartbeat())
+        logger.info("Worker %s draining %s", self.worker_id, self.queue.path)
+        try:
+            while not stop.is_set():
+                claimed = None
+                if len(self._running) < self.concurrency:
+                    claimed = await asyncio.to_thread(self.queue.claim, self.worker_id, self.lease_seconds)
+                if claimed is None:
+                    try:
+                        await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                task_id, kind, payload, attempt = claimed
+                self._running[task_id] = asyncio.create_task(self._run_task(task_id, kind, payload, attempt))
+            if self._running:
+                await asyncio.gather(*self._running.values(), return_exceptions=True)
+        finally:
+            heartbeat.cancel()
+
+    async def _run_task(self, task_id: str, kind: str, payload: dict, attempt: int) -> None:
+        try:
+            if attempt > 1:
+                logger.info("Rerunning %s task %s (attempt %d)", kind, task_id, attempt)
+                await asyncio.to_thread(self.queue.append, task_id, {"type": "restart", "data": attempt})
+            async for message in serve_task(self.orchestrator.execute_task, kind, payload, self.flush_interval):
+                await asyncio.to_thread(self.queue.append, task_id, message)
+            await asyncio.to_thread(self.queue.finish, task_id, self.worker_id)
+            self.tasks_completed += 1
+        except asyncio.CancelledError:
+            logger.info("Stopped %s task %s: cancelled by its submitter", kind, task_id)
+        finally:
+            self._running.pop(task_id, None)
+
+    async def _heartbeat(self) -> None:
+        """Renew leases and stop tasks that were cancelled or handed to another worker."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            owned = await asyncio.to_thread(self.queue.renew, self.worker_id, list(self._running), self.lease_seconds)
+            for task_id, task in list(self._running.items()):
+                if task_id not in owned:
+                    task.cancel()
@@ -0,0 +1,195 @@
+"""
+Stream Parsing - Incremental extraction of fields from streamed JSON output
+"""
+
+import json
+
+
+_SIMPLE_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+class PartialStringField:
+    """
+    Decodes one top-level string field of a JSON object while it is being streamed.
+    Each character of the stream is examined once, so feeding a long output
+    token by token stays linear in its length.
+    """
+
+    def __init__(self, field_name: str):
+        self._marker = json.dumps(field_name)
+        self._pending = ""
+        self._state = "searching"
+        self._escape = ""
+        self.value = ""
+
+    @property
+    def complete(self) -> bool:
+        """Whether the closing quote of the field has been seen."""
+        return self._state == "done"
+
+    def feed(self, delta: str) -> str:
+        """
+        Consume the next chunk of streamed JSON text.
+
+        Args:
+            delta: Newly received text
+
+        Returns:
+            The newly decoded portion of the field value
+        """
+        if self._state == "done":
+            return ""
+
+        text = self._pending + delta
+        self._pending = ""
+        position = 0
+
+        if self._state == "searching":
+            found = text.find(self._marker)
+            if found == -1:
+                # Keep a tail in case the marker is split across chunks
+                self._pending = text[-len(self._marker):]
+                return ""
+            position = found + len(self._marker)
+            self._state = "seeking_value"
+
+        if self._state == "seeking_value":
+            while position < len(text) and text[position] in ' \t\r\n:':
+                position += 1
+            if position == len(text):
+                return ""
+            if text[position] != '"':
+                self._state = "done"
+                return ""
+            position += 1
+            self._state = "in_value"
+
+        decoded = []
+        while position < len(text):
+            char = text[position]
+            position += 1
+            if self._escape:
+                self._escape += char
+                if self._escape[1] == "u":
+                    if len(self._escape) == 6:
+                        decoded.append(chr(int(self._escape[2:], 16)))
+                        self._escape = ""
+                else:
+                    decoded.append(_SIMPLE_ESCAPES.get(char, char))
+                    self._escape = ""
+            elif char == "\\":
+                self._escape = char
+            elif char == '"':
+                self._state = "done"
+                break
+            else:
+                decoded.append(char)
+
+        new_text = "".join(decoded)
+        self.value += new_text
+        return new_text
+
+
+class PartialObjectArray:
+    """
+    Extracts the objects of a top-level JSON array field while it is streamed.
+    Each object is returned as soon as its closing brace arrives, so callers
+    can act on early elements before the rest of the output is generated.
+    """
+
+    def __init__(self, field_name: str):
+        self._marker = json.dumps(field_name)
+        self._pending = ""
+        self._state = "searching"
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._current: list[str] = []
+
+    @property
+    def complete(self) -> bool:
+        """Whether the closing bracket of the array has been seen."""
+        return self._state == "done"
+
+    def feed(self, delta: str) -> list[dict]:
+        """
+        Consume the next chunk of streamed JSON text.
+
+        Args:
+            delta: Newly received text
+
+        Returns:
+            Array objects completed by this chunk
+        """
+        if self._state == "done":
+            return []
+
+        text = self._pending + delta
+        self._pending = ""
+        position = 0
+
+        if self._state == "searching":
+            found = text.find(self._marker)
+            if found == -1:
+                # Keep a tail in case the marker is split across chunks
+                self._pending = text[-len(self._marker):]
+                return []
+            position = found + len(self._marker)
+            self._state = "seeking_array"
+
+        if self._state == "seeking_array":
+            while position < len(text) and text[position] in ' \t\r\n:':
+                position += 1
+            if position == len(text):
+                return []
+            if text[position] != "[":
+                self._state = "done"
+                return []
+            position += 1
+            self._state = "in_array"
+
+        objects = []
+        while position < len(text):
+            char = text[position]
+            position += 1
+
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._current = [char]
+                elif char == "]":
+                    self._state = "done"
+                    break
+                continue
+
+            self._current.append(char)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        objects.append(json.loads("".join(self._current)))
+                    except json.JSONDecodeError:
+                        pass
+                    self._current = []
+
+        return objects
@@ -0,0 +1,145 @@
+"""
+Synthesis Engine - Token-budgeted map-reduce preparation of research data
+"""
+
+import asyncio
+import logging
+import math
+from typing import Awaitable, Callable
+
+
+logger = logging.getLogger(__name__)
+
+
+# Rough characters-per-token ratio for English text with OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a piece of text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def format_findings(findings: list[str], title: str = "Finding", start: int = 1) -> str:
+    """
+    Render findings as numbered markdown sections for a prompt.
+
+    Args:
+        findings: Finding texts to render
+        title: Section title prefix
+        start: Number of the first section
+
+    Returns:
+        Markdown text with one section per finding
+    """
+    return "\n\n".join(
+        f"### {title} {number}\n{finding.strip()}"
+        for number, finding in enumerate(findings, start=start)
+    )
+
+
+class ContextPacker:
+    """
+    Packs findings into chunks that each fit within a token budget.
+    Findings keep their order; a single finding larger than the budget is
+    truncated so every chunk stays within bounds.
+    """
+
+    def __init__(self, token_budget: int):
+        self.token_budget = token_budget
+
+    def pack(self, findings: list[str]) -> list[list[str]]:
+        """
+        Greedily group findings into budget-sized chunks.
+
+        Args:
+            findings: Finding texts in their original order
+
+        Returns:
+            List of chunks, each a list of findings
+        """
+        chunks: list[list[str]] = []
+        current: list[str] = []
+        current_tokens = 0
+        max_chars = self.token_budget * CHARS_PER_TOKEN
+
+        for finding in findings:
+            if estimate_tokens(finding) > self.token_budget:
+                finding = finding[:max_chars]
+            tokens = estimate_tokens(finding)
+            if current and current_tokens + tokens > self.token_budget:
+                chunks.append(current)
+                current, current_tokens = [], 0
+            current.append(finding)
+            current_tokens += tokens
+
+        if current:
+            chunks.append(current)
+        return chunks
+
+
+class SynthesisEngine:
+    """
+    Prepares collected findings for the report writer.
+    Findings that fit the token budget are passed through in a single pass;
+    otherwise they are packed into chunks that are summarized concurrently
+    (map) and the intermediate summaries are handed to the writer (reduce).
+    A chunk whose summary fails is passed on as its raw findings, truncated
+    to its share of the budget, so one failed call never loses the report.
+    """
+
+    def __init__(
+        self,
+        summarize: Callable[[str, str], Awaitable[str]],
+        token_budget: int = 6000,
+        max_rounds: int = 3,
+    ):
+        self.summarize = summarize
+        self.packer = ContextPacker(token_budget)
+        self.token_budget = token_budget
+        self.max_rounds = max_rounds
+
+    async def prepare(self, query: str, findings: list[str]) -> tuple[str, int]:
+        """
+        Build the research data section of the report prompt.
+
+        Args:
+            query: The original research question
+            findings: Summaries collected by the web searches
+
+        Returns:
+            Tuple of (research data text, number of map rounds performed)
+        """
+        research_data = format_findings(findings)
+        rounds = 0
+
+        while estimate_tokens(research_data) > self.token_budget and rounds < self.max_rounds:
+            chunks = self.packer.pack(findings)
+            if len(chunks) == 1 and rounds > 0:
+                break
+            logger.info(
+                "Synthesis round %d: summarizing %d findings in %d chunks", rounds + 1, len(findings), len(chunks)
+            )
+            summaries = await asyncio.gather(
+                *(self.summarize(query, format_findings(chunk)) for chunk in chunks), return_exceptions=True
+            )
+            share = max(1, self.token_budget // len(chunks)) * CHARS_PER_TOKEN
+            findings = []
+            failures = 0
+            for chunk, summary in zip(chunks, summaries):
+                if isinstance(summary, BaseException):
+                    if not isinstance(summary, Exception):
+                        raise summary
+                    logger.warning(
+                        "Summarizing a chunk of %d findings failed, using them raw: %s", len(chunk), summary
+                    )
+                    failures += 1
+                    summary = format_findings(chunk)[:share]
+                findings.append(summary)
+            research_data = format_findings(findings, title="Research Summary")
+            rounds += 1
+            if failures == len(chunks):
+                # Summarizing is failing outright, e.g. with the circuit open; stop retrying it
+                break
+
+        return research_data, rounds
@@ -0,0 +1,288 @@
+"""
+Task Queue - Pluggable backends that execute search and report tasks
+"""
+
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, AsyncGenerator, AsyncIterator, Callable
+
+if TYPE_CHECKING:
+    from .research_orchestrator import ResearchOrchestrator
+
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TASK = "search"
+REPORT_TASK = "report"
+
+# A task yields messages {"type": ..., "data": ...}: any number of "delta"
+# messages with new report text, then exactly one "result" or "error".
+# "restart" tells the submitter a crashed attempt is being run again.
+# A search result also carries "live" and "seconds": whether the web
+# researcher actually ran and how long it took, for the submitter's statistics.
+TaskExecutor = Callable[[str, dict], AsyncIterator[dict]]
+
+
+class TaskError(RuntimeError):
+    """A task failed while running on a worker."""
+
+
+class TaskBackend(ABC):
+    """
+    Executes search and report tasks on behalf of an orchestrator.
+    Payloads and messages are plain JSON-compatible dicts, so a backend can
+    hand tasks to other processes or machines and stream the messages back.
+    """
+
+    def bind(self, executor: TaskExecutor) -> None:
+        """Receive the orchestrator's executor; only in-process backends use it."""
+
+    async def stream(self, kind: str, payload: dict) -> AsyncGenerator[dict, None]:
+        """
+        Run a task and stream its messages back to the caller.
+
+        Args:
+            kind: SEARCH_TASK or REPORT_TASK
+            payload: Task arguments
+
+        Yields:
+            The task's delta messages and finally its result message
+
+        Raises:
+            TaskError: If the task failed on a worker
+        """
+        async for message in self._stream(kind, payload):
+            if message["type"] == "error":
+                raise TaskError(message["data"])
+            yield message
+
+    @abstractmethod
+    def _stream(self, kind: str, payload: dict) -> AsyncIterator[dict]:
+        """Submit a task and yield its raw messages, ending after the result or error."""
+
+    async def close(self) -> None:
+        """Release workers and connections held by the backend."""
+
+
+class InProcessBackend(TaskBackend):
+    """Runs tasks directly on the orchestrator's own event loop."""
+
+    def __init__(self):
+        self._executor: TaskExecutor | None = None
+
+    def bind(self, executor: TaskExecutor) -> None:
+        self._executor = executor
+
+    async def stream(self, kind: str, payload: dict) -> AsyncGenerator[dict, None]:
+        # Exceptions propagate unchanged instead of being wrapped in TaskError
+        async for message in self._stream(kind, payload):
+            yield message
+
+    def _stream(self, kind: str, payload: dict) -> AsyncIterator[dict]:
+        if self._executor is None:
+            raise RuntimeError("InProcessBackend is not bound to an orchestrator")
+        return self._executor(kind, payload)
+
+
+async def serve_task(
+    executor: TaskExecutor, kind: str, payload: dict, flush_interval: float = 0.05
+) -> AsyncGenerator[dict, None]:
+    """
+    Run a task for a remote submitter, turning failures into an error message.
+
+    Report deltas are merged so that at most one delta is sent per flush
+    interval, keeping the message volume independent of the token rate.
+
+    Yields:
+        Messages ready to be sent to the submitter
+    """
+    pending = ""
+    last_flush = time.monotonic()
+    try:
+        async with contextlib.aclosing(executor(kind, payload)) as messages:
+            async for message in messages:
+                if message["type"] != "delta":
+                    break
+                pending += message["data"]
+                if time.monotonic() - last_flush >= flush_interval:
+                    yield {"type": "delta", "data": pending}
+                    pending, last_flush = "", time.monotonic()
+            else:
+                raise TaskError(f"{kind} task ended without a result")
+    except Exception as e:
+        logger.exception("%s task failed", kind)
+        if pending:
+            yield {"type": "delta", "data": pending}
+        yield {"type": "error", "data": repr(e)}
+        return
+    if pending:
+        yield {"type": "delta", "data": pending}
+    yield message
+
+
+def _create_orchestrator(factory: "Callable[[], ResearchOrchestrator] | None") -> "ResearchOrchestrator":
+    if factory is not None:
+        return factory()
+    from .research_orchestrator import ResearchOrchestrator
+
+    return ResearchOrchestrator()
+
+
+def run_process_worker(
+    tasks: "multiprocessing.Queue",
+    results: "multiprocessing.Queue",
+    concurrency: int,
+    flush_interval: float,
+    orchestrator_factory: "Callable[[], ResearchOrchestrator] | None" = None,
+) -> None:
+    """Entry point of a multiprocessing worker: run tasks from the task queue until told to stop."""
+    asyncio.run(_serve_process(tasks, results, concurrency, flush_interval, orchestrator_factory))
+
+
+async def _serve_process(tasks, results, concurrency, flush_interval, orchestrator_factory) -> None:
+    orchestrator = _create_orchestrator(orchestrator_factory)
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(concurrency)
+    running: set[asyncio.Task] = set()
+
+    async def run(task_id: str, kind: str, payload: dict) -> None:
+        try:
+            async for message in serve_task(orchestrator.execute_task, kind, payload, flush_interval):
+                results.put((task_id, message))
+        finally:
+            slots.release()
+
+    while True:
+        await slots.acquire()
+        item = await loop.run_in_executor(None, tasks.get)
+        if item is None:
+            break
+        task = asyncio.create_task(run(*item))
+        running.add(task)
+        task.add_done_callback(running.discard)
+    if running:
+        await asyncio.gather(*running, return_exceptions=True)
+
+
+class MultiprocessingBackend(TaskBackend):
+    """
+    Runs tasks in a pool of worker processes on this machine.
+    Each worker has its own event loop and orchestrator, so searches and
+    report writing are spread over several CPUs. Workers start on first use.
+    A task abandoned by its submitter still runs to completion and its
+    messages are discarded.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        concurrency: int = 8,
+        flush_interval: float = 0.05,
+        orchestrator_factory: "Callable[[], ResearchOrchestrator] | None" = None,
+    ):
+        self.workers = workers
+        self.concurrency = concurrency
+        self.flush_interval = flush_interval
+        # Must be picklable (a module-level function) to reach spawned workers
+        self.orchestrator_factory = orchestrator_factory
+        self._processes: list[multiprocessing.Process] = []
+        self._inboxes: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = {}
+        self._lock = threading.Lock()
+        self._tasks = None
+        self._results = None
+        self._reader: threading.Thread | None = None
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._processes:
+                return
+            context = multiprocessing.get_context("spawn")
+            self._tasks = context.Queue()
+            self._results = context.Queue()
+            for index in range(self.workers):
+                process = context.Process(
+                    target=run_process_worker,
+                    args=(self._tasks, self._results, self.concurrency, self.flush_interval, self.orchestrator_factory),
+                    name=f"research-worker-{index}",
+                    daemon=True,
+                )
+                process.start()
+                self._processes.append(process)
+            self._reader = threading.Thread(target=self._read_results, name="research-worker-results", daemon=True)
+            self._reader.start()
+            logger.info("Started %d research worker processes", self.workers)
+
+    def _read_results(self) -> None:
+        """Route worker messages to the event loop queues of their submitters."""
+        while True:
+            item = self._results.get()
+            if item is None:
+                return
+            task_id, message = item
+            inbox = self._inboxes.get(task_id)
+            if inbox is not None:
+                loop, queue = inbox
+                loop.call_soon_threadsafe(queue.put_nowait, message)
+
+    async def _stream(self, kind: str, payload: dict) -> AsyncGenerator[dict, None]:
+        self._ensure_started()
+        task_id = uuid.uuid4().hex
+        inbox: asyncio.Queue[dict] = asyncio.Queue()
+        self._inboxes[task_id] = (asyncio.get_running_loop(), inbox)
+        try:
+            self._tasks.put((task_id, kind, payload))
+            while True:
+                message = await inbox.get()
+                yield message
+                if message["type"] in ("result", "error"):
+                    return
+        finally:
+            self._inboxes.pop(task_id, None)
+
+    async def close(self) -> None:
+        if not self._processes:
+            return
+        for _ in self._processes:
+            self._tasks.put(None)
+        await asyncio.get_running_loop().run_in_executor(None, self._join)
+
+    def _join(self) -> None:
+        for process in self._processes:
+            process.join(timeout=30)
+            if process.is_alive():
+                process.terminate()
+        self._results.put(None)
+        self._reader.join()
+        self._processes.clear()
+
+
+def create_task_backend(spec: str | None) -> TaskBackend:
+    """
+    Build a task backend from a short specification.
+
+    Args:
+        spec: "inprocess" (or None/empty), "multiprocessing[:<workers>]" or
+            "sqlite[:<queue database path>]"
+
+    Returns:
+        The configured backend
+
+    Raises:
+        ValueError: If the specification is not recognized
+    """
+    name, _, argument = (spec or "inprocess").partition(":")
+    if name == "inprocess":
+        return InProcessBackend()
+    if name == "multiprocessing":
+        return MultiprocessingBackend(workers=int(argument)) if argument else MultiprocessingBackend()
+    if name == "sqlite":
+        from .sqlite_queue import SQLiteQueueBackend
+
+        return SQLiteQueueBackend(argument) if argument else SQLiteQueueBackend()
+    raise ValueError(f"Unknown task backend {spec!r}; use inprocess, multiprocessing[:N] or sqlite[:path]")
@@ -0,0 +1,355 @@
+"""
+Batch Runner - Headless research over a JSONL file of queries
+
+Usage:
+    python batch.py queries.jsonl --output results.ndjson --concurrency 8 --agent-calls 16 [--budget fast]
+
+Each input line is a JSON object with a "query" and an optional "id"
+(defaulting to the line number). Results are appended to the NDJSON output
+as each query finishes, and queries already answered successfully in the
+output are skipped, so an interrupted batch resumes where it stopped. Failed
+queries rerun from their run checkpoints without repeating finished searches.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+
+from ..core.budget import BUDGET_PRESETS
+from ..core.http_client import ClientPoolSettings, configure_shared_client
+from ..core.metrics import metrics
+from ..core.research_events import EventKind
+from ..core.research_orchestrator import ResearchOrchestrator
+from ..core.task_queue import create_task_backend
+
+
+logger = logging.getLogger(__name__)
+
+PHASES = ("planning", "searching", "reporting", "formatting")
+
+
+@dataclass
+class BatchItem:
+    """One research question read from the batch input."""
+    id: str
+    query: str
+
+
+@dataclass
+class QueryResult:
+    """Outcome of one batch query, written as a line of the NDJSON output."""
+    id: str
+    query: str
+    run_id: str = ""
+    status: str = "error"
+    report: str | None = None
+    error: str | None = None
+    total_seconds: float = 0.0
+    phases: dict[str, float] = field(default_factory=dict)
+    finished_at: str = ""
+
+
+@dataclass
+class BatchSummary:
+    """Throughput and per-query latency of a batch run."""
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    elapsed_seconds: float = 0.0
+    queries_per_minute: float = 0.0
+    latency: dict[str, float] = field(default_factory=dict)
+    phase_latency: dict[str, dict[str, float]] = field(default_factory=dict)
+    http_pool: dict = field(default_factory=dict)
+    queries: list[dict] = field(default_factory=list)
+
+
+def load_queries(path: str) -> list[BatchItem]:
+    """
+    Read batch queries from a JSONL file.
+
+    Args:
+        path: File with one JSON object per line
+
+    Returns:
+        The queries in file order
+
+    Raises:
+        ValueError: If a line is not valid JSON, has no query or repeats an id
+    """
+    items = []
+    seen_ids = set()
+    with open(path, encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: invalid JSON ({e})") from e
+            if not isinstance(record, dict) or not str(record.get("query", "")).strip():
+                raise ValueError(f"{path}:{line_number}: expected an object with a non-empty 'query'")
+            item_id = str(record.get("id", line_number))
+            if item_id in seen_ids:
+                raise ValueError(f"{path}:{line_number}: duplicate id '{item_id}'")
+            seen_ids.add(item_id)
+            items.append(BatchItem(item_id, str(record["query"]).strip()))
+    return items
+
+
+def load_checkpoint(path: str) -> set[str]:
+    """
+    Collect the ids already answered successfully in an NDJSON output file.
+
+    A line cut short by a crash is ignored, so its query runs again.
+
+    Args:
+        path: The NDJSON output of an earlier run
+
+    Returns:
+        Ids of queries that do not need to run again
+    """
+    if not os.path.exists(path):
+        return set()
+    completed = set()
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and record.get("status") == "success":
+                completed.add(str(record.get("id")))
+    return completed
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    """Return p50/p95 and max of a list of durations."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    return {
+        "p50": round(statistics.median(ordered), 3),
+        "p95": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+class BatchRunner:
+    """
+    Runs many research queries through one orchestrator with bounded concurrency.
+    Agent calls from every query share the orchestrator's agent call pool.
+    """
+
+    def __init__(
+        self,
+        orchestrator: ResearchOrchestrator,
+        output_path: str,
+        concurrency: int = 4,
+        budget: str | None = None,
+    ):
+        self.orchestrator = orchestrator
+        self.output_path = output_path
+        self.concurrency = max(1, concurrency)
+        self.budget = budget
+
+    async def run(self, items: list[BatchItem], resume: bool = True) -> BatchSummary:
+        """
+        Run every pending query and append each result as soon as it finishes.
+
+        Args:
+            items: Queries to research
+            resume: Skip queries already answered successfully in the output and
+                restore their checkpointed phases; otherwise start every query afresh
+
+        Returns:
+            Summary of throughput and per-query latency
+        """
+        completed = load_checkpoint(self.output_path) if resume else set()
+        pending = [item for item in items if item.id not in completed]
+        summary = BatchSummary(total=len(items), skipped=len(items) - len(pending))
+        if summary.skipped:
+            print(f"Resuming: {summary.skipped} of {len(items)} queries already complete")
+
+        queue: asyncio.Queue[BatchItem] = asyncio.Queue()
+        for item in pending:
+            queue.put_nowait(item)
+        results: list[QueryResult] = []
+
+        with self._open_output(resume) as output:
+            async def worker() -> None:
+                while not queue.empty():
+                    item = queue.get_nowait()
+                    result = await self._research(item, resume)
+                    # One flushed line per query keeps the checkpoint current after a crash
+                    output.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+                    output.flush()
+                    os.fsync(output.fileno())
+                    results.append(result)
+                    print(
+                        f"[{len(results)}/{len(pending)}] {result.status} {result.id} "
+                        f"in {result.total_seconds:.1f}s"
+                    )
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(pending)))))
+            summary.elapsed_seconds = round(time.perf_counter() - started, 3)
+
+        succeeded = [result for result in results if result.status == "success"]
+        summary.succeeded = len(succeeded)
+        summary.failed = len(results) - len(succeeded)
+        if summary.elapsed_seconds:
+            summary.queries_per_minute = round(len(succeeded) * 60 / summary.elapsed_seconds, 3)
+        summary.latency = _percentiles([result.total_seconds for result in succeeded])
+        summary.phase_latency = {
+            phase: _percentiles([result.phases[phase] for result in succeeded if phase in result.phases])
+            for phase in PHASES
+        }
+        pool = self.orchestrator.connection_pool_stats()
+        summary.http_pool = {**asdict(pool), "connection_reuse_rate": round(pool.connection_reuse_rate, 3)}
+        summary.queries = [
+            {"id": result.id, "status": result.status, "total_seconds": result.total_seconds, **result.phases}
+            for result in results
+        ]
+        return summary
+
+    def _open_output(self, resume: bool):
+        """Open the NDJSON output, completing any line left unterminated by a crash."""
+        directory = os.path.dirname(os.path.abspath(self.output_path))
+        os.makedirs(directory, exist_ok=True)
+        output = open(self.output_path, "a" if resume else "w", encoding="utf-8")
+        if resume and output.tell() > 0:
+            with open(self.output_path, "rb") as existing:
+                existing.seek(-1, os.SEEK_END)
+                if existing.read(1) != b"\n":
+                    output.write("\n")
+        return output
+
+    async def _research(self, item: BatchItem, resume: bool = True) -> QueryResult:
+        """Research one query, deriving phase timings from its events."""
+        # A stable run ID lets a rerun resume the query's checkpointed phases
+        query_hash = hashlib.sha256(item.query.encode("utf-8")).hexdigest()[:8]
+        result = QueryResult(item.id, item.query, run_id=f"batch-{item.id}-{query_hash}")
+        if not resume:
+            # A fresh batch must not restore searches or a report from an earlier one
+            self.orchestrator.run_store.delete(result.run_id)
+        phase_starts: dict[str, float] = {}
+        started = time.perf_counter()
+
+        try:
+            async for event in self.orchestrator.stream_research(
+                item.query, run_id=result.run_id, budget=self.budget
+            ):
+                if event.phase is not None:
+                    phase_starts.setdefault(event.phase, time.perf_counter() - started)
+                if event.kind == EventKind.REPORT:
+                    result.report = event.message
+            result.status = "success" if result.report is not None else "error"
+        except Exception as e:
+            logger.exception("Batch query %s failed", item.id)
+            result.error = repr(e)
+
+        total = time.perf_counter() - started
+        result.total_seconds = round(total, 3)
+        ordered = [(phase, phase_starts[phase]) for phase in PHASES if phase in phase_starts]
+        for index, (phase, start) in enumerate(ordered):
+            end = ordered[index + 1][1] if index + 1 < len(ordered) else total
+            result.phases[phase] = round(end - start, 3)
+        result.finished_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        metrics.log_event(
+            "batch_query_finished", id=item.id, status=result.status, seconds=result.total_seconds
+        )
+        return result
+
+
+def format_summary(summary: BatchSummary) -> str:
+    """Render a batch summary as a plain-text report."""
+    lines = [
+        f"Queries: {summary.total} total, {summary.succeeded} succeeded, "
+        f"{summary.failed} failed, {summary.skipped} skipped",
+        f"Elapsed: {summary.elapsed_seconds:.1f}s, throughput {summary.queries_per_minute:.2f} queries/min",
+        f"Latency: {summary.latency}",
+    ]
+    for phase, stats in summary.phase_latency.items():
+        if stats:
+            lines.append(f"  {phase}: {stats}")
+    if summary.http_pool.get("requests_total"):
+        pool = summary.http_pool
+        lines.append(
+            f"HTTP pool: {pool['requests_total']} requests over {pool['connections_opened']} connections "
+            f"({pool['connection_reuse_rate']:.0%} reused), {pool['tls_handshakes']} TLS handshakes"
+        )
+    if summary.queries:
+        lines.append("")
+        lines.append(f"{'id':<24} {'status':<8} {'total':>8} " + " ".join(f"{phase:>10}" for phase in PHASES))
+        for query in summary.queries:
+            phases = " ".join(
+                f"{query[phase]:>10.1f}" if phase in query else f"{'-':>10}" for phase in PHASES
+            )
+            lines.append(f"{query['id'][:24]:<24} {query['status']:<8} {query['total_seconds']:>8.1f} {phases}")
+    return "\n".join(lines)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run research queries from a JSONL file without the UI")
+    parser.add_argument("input", help="JSONL file with one {\"id\": ..., \"query\": ...} object per line")
+    parser.add_argument("--output", help="NDJSON results file (default: <input>.results.ndjson)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Queries researched at once")
+    parser.add_argument(
+        "--agent-calls", type=int, default=8, help="Agent calls in flight at once, shared by all queries"
+    )
+    parser.add_argument(
+        "--budget", choices=sorted(BUDGET_PRESETS), help="Latency budget preset (default: standard agents)"
+    )
+    parser.add_argument(
+        "--task-backend",
+        default="inprocess",
+        help="Where searches and reports run: inprocess, multiprocessing[:N] or sqlite[:path]",
+    )
+    parser.add_argument(
+        "--no-resume", action="store_true", help="Overwrite the output and discard run checkpoints instead of resuming"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run a batch of research queries and print the summary."""
+    from dotenv import load_dotenv
+
+    args = parse_args(argv)
+    load_dotenv(override=True)
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    output_path = args.output or os.path.splitext(args.input)[0] + ".results.ndjson"
+    items = load_queries(args.input)
+    # Keep a warm connection for every agent call the pool allows
+    configure_shared_client(
+        ClientPoolSettings(
+            max_connections=max(100, args.agent_calls),
+            max_keepalive_connections=max(50, args.agent_calls),
+        )
+    )
+    orchestrator = ResearchOrchestrator(
+        agent_call_limit=args.agent_calls, task_backend=create_task_backend(args.task_backend)
+    )
+    runner = BatchRunner(orchestrator, output_path, args.concurrency, args.budget)
+
+    async def run_batch() -> BatchSummary:
+        try:
+            return await runner.run(items, resume=not args.no_resume)
+        finally:
+            await orchestrator.task_backend.close()
+
+    summary = asyncio.run(run_batch())
+
+    summary_path = os.path.splitext(output_path)[0] + ".summary.json"
+    with open(summary_path, "w", encoding="utf-8") as handle:
+        json.dump(asdict(summary), handle, indent=2)
+    print(format_summary(summary))
+    print(f"Results written to {output_path}, summary to {summary_path}")
@@ -2,10 +2,42 @@
 Web Interface - Gradio-based user interface for the research system
 """
 
+import contextlib
+import logging
+import os
+import time
+from typing import AsyncGenerator
+
 import gradio as gr
 from dotenv import load_dotenv
 
+from ..core.admission import AdmissionController, AdmissionRejected, AdmissionTicket
+from ..core.metrics import REQUESTS_QUEUED, WEB_REQUESTS, start_metrics_server
+from ..core.research_events import EventKind, ResearchEvent
 from ..core.research_orchestrator import ResearchOrchestrator
+from ..core.run_handles import CLEARED, DISCONNECTED, SessionRuns
+from ..core.task_queue import create_task_backend
+
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between report refreshes while the report is streaming
+REPORT_REFRESH_INTERVAL = 0.1
+
+# Saved reports this recent are offered instead of researching a similar query again
+REUSE_MAX_AGE_SECONDS = 24 * 60 * 60
+
+# Share of a session's fair queueing allowance a run of each mode uses up
+ADMISSION_COSTS = {"fast": 0.5, "standard": 1.0, "deep": 2.0}
+
+
+def _format_age(seconds: float) -> str:
+    """Describe an age in the largest whole unit, e.g. "3 hours"."""
+    for unit, length in (("day", 86400), ("hour", 3600), ("minute", 60)):
+        if seconds >= length:
+            count = int(seconds // length)
+            return f"{count} {unit}{'s' if count != 1 else ''}"
+    return "moments"
 
 
 class ResearchWebInterface:
@@ -16,7 +48,19 @@ class ResearchWebInterface:
 
     def __init__(self):
         load_dotenv(override=True)
-        self.orchestrator = ResearchOrchestrator()
+        # Searches and reports can be handed to worker processes or nodes, e.g. "sqlite:/shared/queue.sqlite3"
+        self.orchestrator = ResearchOrchestrator(
+            task_backend=create_task_backend(os.environ.get("RESEARCH_TASK_BACKEND"))
+        )
+        # The research run in flight for each browser session, cancelled when no longer wanted
+        self.session_runs = SessionRuns()
+        # Query and run ID of each session's last failed run, resumed when the same query is submitted again
+        self.failed_runs: dict[str, tuple[str, str]] = {}
+        # Caps the pipelines running in this process and queues the rest fairly across sessions
+        self.admission = AdmissionController(
+            max_running=int(os.environ.get("RESEARCH_MAX_RUNS", "8")),
+            max_queued=int(os.environ.get("RESEARCH_MAX_QUEUED", "32")),
+        )
         self.interface = self._create_interface()
 
     def _create_interface(self) -> gr.Blocks:
@@ -53,6 +97,28 @@ class ResearchWebInterface:
                         lines=3,
                         max_lines=5
                     )
+                    follow_up_input = gr.Checkbox(
+                        label="Follow up on my previous research (reuses its findings)",
+                        value=False
+                    )
+                    mode_input = gr.Radio(
+                        choices=[
+                            ("Standard", "standard"),
+                            ("⚡ Fast (under 20 s)", "fast"),
+                            ("🔬 Deep", "deep")
+                        ],
+                        value="standard",
+                        label="Research mode"
+                    )
+                    # Run ID of the last completed research in this browser session
+                    last_run_id = gr.State(None)
+                    # Offer shown when a similar query already has a recent saved report
+                    with gr.Group(visible=False) as reuse_offer:
+                        reuse_notice = gr.Markdown()
+                        with gr.Row():
+                            reuse_button = gr.Button("📚 Use saved report", variant="primary")
+                            rerun_button = gr.Button("🔄 Research again", variant="secondary")
+                    offered_run_id = gr.State(None)
                     
                     # Control buttons
                     with gr.Row():
@@ -73,6 +139,15 @@ class ResearchWebInterface:
                         "Ready to begin research...",
                         elem_classes=["status-box"]
                     )
+                    
+                    # History of saved reports, loaded without running research
+                    gr.Markdown("### 📚 Research History")
+                    history_select = gr.Dropdown(
+                        choices=self._history_choices(),
+                        value=None,
+                        label="Past reports",
+                        interactive=True
+                    )
             
             # Progress section
             with gr.Row():
@@ -87,73 +162,323 @@ class ResearchWebInterface:
                 gr.Markdown("### 📄 Research Report")
                 report_output = gr.Markdown(
                     "Your comprehensive research report will appear here...",
-                    elem_classes=["report-box"]
+                    elem_classes=["report-box"],
+                    header_links=True
                 )
             
             # Event handlers
+            research_inputs = [query_input, follow_up_input, last_run_id, mode_input]
+            research_outputs = [
+                status_display, progress_output, report_output, last_run_id,
+                reuse_offer, reuse_notice, offered_run_id, history_select
+            ]
+            # Research runs of different sessions run side by side; the orchestrator bounds their agent calls
             start_button.click(
-                fn=self._execute_research,
-                inputs=[query_input],
-                outputs=[status_display, progress_output, report_output]
+                fn=self._research_or_offer_saved,
+                inputs=research_inputs,
+                outputs=research_outputs,
+                concurrency_limit=None
             )
             
             query_input.submit(
-                fn=self._execute_research,
-                inputs=[query_input],
-                outputs=[status_display, progress_output, report_output]
+                fn=self._research_or_offer_saved,
+                inputs=research_inputs,
+                outputs=research_outputs,
+                concurrency_limit=None
+            )
+            
+            rerun_button.click(
+                fn=self._research_and_refresh_history,
+                inputs=research_inputs,
+                outputs=research_outputs,
+                concurrency_limit=None
+            )
+            
+            reuse_button.click(
+                fn=self._load_saved_report,
+                inputs=[offered_run_id],
+                outputs=[status_display, progress_output, report_output, last_run_id, reuse_offer]
+            )
+            
+            history_select.input(
+                fn=self._load_saved_report,
+                inputs=[history_select],
+                outputs=[status_display, progress_output, report_output, last_run_id, reuse_offer]
             )
             
             clear_button.click(
                 fn=self._clear_interface,
                 inputs=[],
-                outputs=[query_input, status_display, progress_output, report_output]
+                outputs=[
+                    query_input, status_display, progress_output, report_output, follow_up_input, last_run_id,
+                    reuse_offer, offered_run_id
+                ]
             )
+            
+            # Reports saved by other sessions since the app started
+            interface.load(fn=self._refresh_history, inputs=[], outputs=[history_select])
+            
+            # Closing or reloading the tab cancels the session's research
+            interface.unload(self._end_session)
         
         return interface
 
-    async def _execute_research(self, query: str) -> tuple[str, str, str]:
+    def _history_choices(self) -> list[tuple[str, str]]:
+        """Dropdown choices of saved reports, newest first."""
+        return [
+            (f"{time.strftime('%b %d %H:%M', time.localtime(entry.created_at))} · {entry.query[:80]}", entry.run_id)
+            for entry in self.orchestrator.report_store.history()
+        ]
+
+    def _refresh_history(self) -> dict:
+        return gr.update(choices=self._history_choices())
+
+    async def _research_or_offer_saved(
+        self,
+        query: str,
+        follow_up: bool = False,
+        previous_run_id: str | None = None,
+        mode: str = "standard",
+        request: gr.Request | None = None,
+    ) -> AsyncGenerator[tuple, None]:
+        """
+        Offer a recent saved report for a similar query, or start the research.
+        
+        Yields:
+            Tuples of (status, progress, report, run ID to remember, offer
+            visibility, offer text, offered run ID, history choices)
+        """
+        match = None
+        if query.strip() and not follow_up:
+            match = self.orchestrator.report_store.find_similar(query, max_age_seconds=REUSE_MAX_AGE_SECONDS)
+        if match is None:
+            async for update in self._research_and_refresh_history(query, follow_up, previous_run_id, mode, request):
+                yield update
+            return
+        
+        age = _format_age(time.time() - match.created_at)
+        notice = f"💡 **\"{match.query}\"** was researched {age} ago. Use the saved report, or research again?"
+        preview = f"## Saved report: {match.query}\n\n### Executive Summary\n\n"
+        preview += self.orchestrator.report_store.executive_summary(match.run_id) or ""
+        yield (
+            "💡 A similar question was researched recently",
+            "Research not started: choose whether to reuse the saved report",
+            preview,
+            previous_run_id,
+            gr.update(visible=True),
+            notice,
+            match.run_id,
+            gr.update()
+        )
+
+    async def _research_and_refresh_history(
+        self,
+        query: str,
+        follow_up: bool = False,
+        previous_run_id: str | None = None,
+        mode: str = "standard",
+        request: gr.Request | None = None,
+    ) -> AsyncGenerator[tuple, None]:
+        """Run the research, hiding any reuse offer, and refresh the history once a report was saved."""
+        update = None
+        async for update in self._execute_research(query, follow_up, previous_run_id, mode, request):
+            yield (*update, gr.update(visible=False), "", None, gr.update())
+        # A completed run remembers its new run ID; a cancelled run must not touch the outputs again
+        if update is not None and update[3] != previous_run_id:
+            yield (*update, gr.update(visible=False), "", None, self._refresh_history())
+
+    def _load_saved_report(self, run_id: str | None) -> tuple[str, str, str, str | None, dict]:
         """
-        Execute the research process and return status updates.
+        Show a saved report without running research.
         
         Args:
-            query: The research question to investigate
+            run_id: Run ID of the saved report
             
         Returns:
-            Tuple of (status, progress, report)
+            Tuple of (status, progress, report, run ID to remember, offer visibility)
         """
-        if not query.strip():
+        saved = self.orchestrator.report_store.load(run_id) if run_id else None
+        if saved is None:
             return (
+                "❌ That saved report is no longer available",
+                "No research started",
+                "Start a new research to get a fresh report",
+                None,
+                gr.update(visible=False)
+            )
+        WEB_REQUESTS.inc(outcome="reused")
+        saved_at = time.strftime("%b %d %H:%M", time.localtime(saved.created_at))
+        return (
+            f"📚 Loaded saved report from {saved_at}\n🆔 Run ID: {saved.run_id}",
+            f"Saved research for: {saved.query}",
+            saved.formatted,
+            saved.run_id,
+            gr.update(visible=False)
+        )
+
+    async def _execute_research(
+        self,
+        query: str,
+        follow_up: bool = False,
+        previous_run_id: str | None = None,
+        mode: str = "standard",
+        request: gr.Request | None = None,
+    ) -> AsyncGenerator[tuple[str, str, str, str | None], None]:
+        """
+        Execute the research process, streaming status updates and the report.
+        
+        The run is registered under the browser session: a new query, Clear
+        or closing the tab cancels it, and the updates simply stop. It waits
+        for admission first, showing its live queue position. Admission is
+        checked before the session's previous run is superseded: a query
+        submitted while another one of the session is still waiting, or
+        while the queue is full, is turned away and leaves that run alone.
+        Resubmitting the query of the session's failed run resumes that run
+        from its checkpoint instead of planning and searching again.
+        
+        Args:
+            query: The research question to investigate
+            follow_up: Whether to build on the previous research of this session
+            previous_run_id: Run ID of the previous completed research, if any
+            mode: "standard" for the default agents, or a budget preset name
+            request: The Gradio request identifying the browser session
+            
+        Yields:
+            Tuples of (status, progress, report, run ID to remember) as the
+            research progresses
+        """
+        if not query.strip():
+            WEB_REQUESTS.inc(outcome="rejected")
+            yield (
                 "❌ Please enter a research query",
                 "No research started",
-                "Enter a query to begin research"
+                "Enter a query to begin research",
+                previous_run_id
             )
+            return
         
-        status_messages = []
+        status_messages = ["⏳ Research in progress..."]
+        follow_up_of = previous_run_id if follow_up else None
+        if follow_up and previous_run_id is None:
+            status_messages.append("ℹ️ No earlier research in this session, starting fresh")
         progress_messages = []
-        final_report = ""
+        report = ""
+        run_id = None
+        last_report_push = 0.0
+        waiting = True
+        handle = None
+        ticket = None
+        REQUESTS_QUEUED.inc()
         
         try:
-            async for update in self.orchestrator.execute_research(query):
-                if "🔍 Research Trace:" in update:
-                    status_messages.append(update)
-                elif "✅" in update or "📋" in update or "🌐" in update or "📝" in update or "📄" in update:
-                    progress_messages.append(update)
+            session_id = request.session_hash if request is not None else None
+            ticket = self.admission.enqueue(session_id or "anonymous", cost=ADMISSION_COSTS.get(mode, 1.0))
+            failed_query, failed_run_id = self.failed_runs.pop(session_id or "anonymous", (None, None))
+            resume_run_id = failed_run_id if failed_query == query.strip() else None
+            if resume_run_id is not None:
+                status_messages.append(f"♻️ Retrying failed run {resume_run_id}")
+            handle = self.session_runs.start(
+                session_id, self._admitted_research(ticket, query, follow_up_of, mode, resume_run_id)
+            )
+            async for event in handle.events():
+                if event.kind == EventKind.QUEUE:
+                    status_messages[0] = event.message
+                    yield "\n".join(status_messages), "Waiting for a free research slot...", report, previous_run_id
+                    continue
+                if waiting:
+                    REQUESTS_QUEUED.dec()
+                    waiting = False
+                    status_messages[0] = "⏳ Research in progress..."
+                if event.kind == EventKind.RUN:
+                    run_id = event.message
+                    status_messages.append(f"🆔 Run ID: {event.message}")
+                elif event.kind == EventKind.TRACE:
+                    status_messages.append(event.message)
+                elif event.kind == EventKind.PROGRESS:
+                    progress_messages.append(event.message)
+                elif event.kind == EventKind.REPORT_DELTA:
+                    report = event.message
+                    # Throttle token-level updates to keep the browser responsive
+                    now = time.monotonic()
+                    if now - last_report_push < REPORT_REFRESH_INTERVAL:
+                        continue
+                    last_report_push = now
                 else:
-                    final_report = update
-            
-            # Combine messages
-            status = "\n".join(status_messages) if status_messages else "✅ Research completed successfully"
-            progress = "\n".join(progress_messages) if progress_messages else "Research process completed"
+                    report = event.message
+                    status_messages[0] = "✅ Research completed successfully"
+                    previous_run_id = run_id
+                
+                yield "\n".join(status_messages), "\n".join(progress_messages), report, previous_run_id
             
-            return status, progress, final_report
+            if handle.cancelled:
+                logger.info("Research cancelled (%s) for query: %s", handle.cancel_reason, query)
+                WEB_REQUESTS.inc(outcome="cancelled")
+                return
+            WEB_REQUESTS.inc(outcome="success")
             
+        except AdmissionRejected as e:
+            WEB_REQUESTS.inc(outcome="throttled")
+            yield f"❌ {e}, please try again shortly", "No research started", report, previous_run_id
         except Exception as e:
+            logger.exception("Research failed for query: %s", query)
+            WEB_REQUESTS.inc(outcome="error")
+            if run_id is not None:
+                self.failed_runs[session_id or "anonymous"] = (query.strip(), run_id)
             error_msg = f"❌ Research failed: {str(e)}"
-            return error_msg, "Research process encountered an error", ""
+            yield error_msg, "Research process encountered an error", report, previous_run_id
+        finally:
+            if waiting:
+                REQUESTS_QUEUED.dec()
+            # Gradio closes this generator when the browser goes away mid-run
+            if handle is not None:
+                handle.cancel(DISCONNECTED)
+            # A run cancelled before it started never reaches its own release
+            if ticket is not None:
+                ticket.release()
+
+    async def _admitted_research(
+        self,
+        ticket: AdmissionTicket,
+        query: str,
+        follow_up_of: str | None,
+        mode: str,
+        run_id: str | None = None,
+    ) -> AsyncGenerator[ResearchEvent, None]:
+        """
+        Wait for the ticket's admission, then stream the research run, resuming run_id if given.
+        
+        Yields:
+            QUEUE events whenever the request's queue position changes, then
+            the events of the run
+        """
+        try:
+            async for position, queued in ticket.positions():
+                yield ResearchEvent(
+                    EventKind.QUEUE, f"⏳ Waiting for a free research slot: position {position} of {queued}"
+                )
+            budget = None if mode == "standard" else mode
+            async with contextlib.aclosing(
+                self.orchestrator.stream_research(query, run_id=run_id, follow_up_of=follow_up_of, budget=budget)
+            ) as events:
+                async for event in events:
+                    yield event
+        finally:
+            ticket.release()
+
+    def _clear_interface(self, request: gr.Request | None = None) -> tuple[str, str, str, str, bool, None, dict, None]:
+        """Cancel the session's research in flight, clear all interface elements and forget the previous research."""
+        if request is not None:
+            self.session_runs.cancel(request.session_hash, CLEARED)
+            self.failed_runs.pop(request.session_hash, None)
+        return (
+            "", "Ready to begin research...", "", "Your comprehensive research report will appear here...", False, None,
+            gr.update(visible=False), None
+        )
 
-    def _clear_interface(self) -> tuple[str, str, str, str]:
-        """Clear all interface elements."""
-        return "", "Ready to begin research...", "", "Your comprehensive research report will appear here..."
+    def _end_session(self, request: gr.Request) -> None:
+        """Cancel the research of a browser session that was closed."""
+        self.session_runs.cancel(request.session_hash, DISCONNECTED)
+        self.failed_runs.pop(request.session_hash, None)
 
     def launch(self, **kwargs):
         """Launch the web interface."""
@@ -166,6 +491,10 @@ class ResearchWebInterface:
 
 def main():
     """Main entry point for the web interface."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    metrics_port = os.environ.get("METRICS_PORT")
+    if metrics_port:
+        start_metrics_server(int(metrics_port))
     interface = ResearchWebInterface()
     interface.launch()
 
@@ -0,0 +1,69 @@
+"""
+Queue Worker - Headless worker that drains the shared SQLite task queue
+
+Usage:
+    python worker.py --queue .research_cache/task_queue.sqlite3 --concurrency 8
+
+Start one or more workers on any node that can open the queue database, and
+point the web interface or batch runner at the same file with
+RESEARCH_TASK_BACKEND=sqlite:<path> (or --task-backend). Web searches and
+report writing then run on the workers and stream back to the process that
+started the research.
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+
+from ..core.research_orchestrator import ResearchOrchestrator
+from ..core.sqlite_queue import DEFAULT_QUEUE_PATH, SQLiteQueueWorker, SQLiteTaskQueue
+
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run search and report tasks from the shared task queue")
+    parser.add_argument("--queue", default=DEFAULT_QUEUE_PATH, help="Task queue database shared with submitters")
+    parser.add_argument("--concurrency", type=int, default=8, help="Tasks run at once by this worker")
+    parser.add_argument(
+        "--agent-calls", type=int, default=None, help="Most agent calls in flight at once (default: 64)"
+    )
+    parser.add_argument("--lease", type=float, default=60.0, help="Seconds before a silent worker's task is retried")
+    return parser.parse_args(argv)
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """Drain the queue until interrupted, finishing running tasks first."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    queue = SQLiteTaskQueue(args.queue)
+    worker = SQLiteQueueWorker(
+        queue,
+        ResearchOrchestrator(agent_call_limit=args.agent_calls),
+        concurrency=args.concurrency,
+        lease_seconds=args.lease,
+    )
+    print(f"Worker {worker.worker_id} draining {args.queue} ({args.concurrency} tasks at once)")
+    try:
+        await worker.run(stop)
+    finally:
+        queue.close()
+    print(f"Worker {worker.worker_id} stopped after {worker.tasks_completed} tasks")
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run a queue worker."""
+    from dotenv import load_dotenv
+
+    args = parse_args(argv)
+    load_dotenv(override=True)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(serve(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+"""
+Task queue worker entry point for the Deep Research System
+"""
+
+from research_system.interface.worker import main
+
+if __name__ == "__main__":
+    main()